@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from . import filters, histogram, table, feature_groups, activation_examples, similarity_sort, cluster_candidates, umap
+from . import filters, histogram, table, feature_groups, activation_examples, similarity_sort, cluster_candidates, umap, diagnostics, reload
 
 router = APIRouter()
 
@@ -10,4 +10,6 @@ router.include_router(feature_groups.router, tags=["feature-groups"])
 router.include_router(activation_examples.router, tags=["activation-examples"])
 router.include_router(similarity_sort.router, tags=["similarity-sort"])
 router.include_router(cluster_candidates.router, tags=["cluster-candidates"])
-router.include_router(umap.router, tags=["umap"])
\ No newline at end of file
+router.include_router(umap.router, tags=["umap"])
+router.include_router(diagnostics.router, tags=["diagnostics"])
+router.include_router(reload.router, tags=["reload"])
\ No newline at end of file
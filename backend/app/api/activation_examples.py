@@ -3,17 +3,20 @@ API endpoint for activation examples with token highlighting metadata.
 Updated for dual n-gram architecture (character + word patterns).
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request
 from fastapi.responses import Response
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional, Union
 import logging
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
 from ..services.data_service import DataService
 from ..services.activation_cache_service import activation_cache_service
-from ..models.responses import ActivationExamplesResponse
+from ..services.compression import negotiate
+from ..services.single_flight import single_flight
+from ..models.fast_json import FastJSONResponse
+from ..models.responses import ActivationExamplesResponse, ActivationManifestResponse
 
 # Thread pool for running blocking I/O operations without blocking the event loop
 # This enables true parallel processing of multiple activation example requests
@@ -30,6 +33,23 @@ def get_data_service() -> DataService:
     return data_service
 
 
+class BufferResponse(Response):
+    """Response whose content is sent as is, so a memory-mapped blob is not copied."""
+
+    def render(self, content: Union[bytes, memoryview]) -> Union[bytes, memoryview]:
+        return content
+
+
+def cache_not_ready() -> HTTPException:
+    """503 for the cached endpoints while the activation cache is (re)built, with a Retry-After estimate."""
+    detail = "Activation cache is being built" if activation_cache_service.is_building() else "Activation cache not ready"
+    return HTTPException(
+        status_code=503,
+        detail=detail,
+        headers={"Retry-After": str(activation_cache_service.retry_after())}
+    )
+
+
 class ActivationExamplesRequest(BaseModel):
     """Request model for fetching activation examples."""
     feature_ids: List[int]  # Batch request for multiple features
@@ -82,17 +102,24 @@ async def get_activation_examples(
         logger.info(f"Fetching activation examples for {len(request.feature_ids)} features")
 
         # Run blocking I/O in thread pool to enable parallel request handling
-        # This allows multiple activation example requests to be processed concurrently
+        # This allows multiple activation example requests to be processed concurrently;
+        # identical requests in flight at the same time share one computation
         loop = asyncio.get_event_loop()
-        examples = await loop.run_in_executor(
-            _executor,
-            service.get_activation_examples,
-            request.feature_ids
+        examples = await single_flight.run(
+            "activation-examples",
+            request,
+            lambda: loop.run_in_executor(
+                _executor,
+                service.get_activation_examples,
+                request.feature_ids
+            )
         )
 
         logger.info(f"Successfully fetched activation examples for {len(examples)} features")
 
-        return ActivationExamplesResponse(examples=examples)
+        # Examples are read from parquet, so they are validated here; only
+        # FastAPI's second validation pass is skipped
+        return FastJSONResponse(ActivationExamplesResponse(examples=examples))
 
     except HTTPException:
         raise
@@ -105,7 +132,14 @@ async def get_activation_examples(
 
 
 @router.get("/activation-examples-cached")
-async def get_all_activation_examples_cached():
+async def get_all_activation_examples_cached(
+    accept_encoding: Optional[str] = Header(default=None),
+    encoding: Optional[str] = Query(
+        None,
+        description="Content encoding (zstd, br, gzip, identity, or auto to negotiate from Accept-Encoding); "
+                    "omit for the legacy gzip body decompressed by the client"
+    )
+):
     """
     Return ALL activation examples as pre-computed MessagePack + gzip blob.
 
@@ -119,17 +153,22 @@ async def get_all_activation_examples_cached():
     2. Decompress with pako (gzip)
     3. Decode with msgpack-lite
 
+    With the encoding query parameter the blob is instead sent as
+    application/x-msgpack with a real Content-Encoding (decoded by the browser):
+    the named precompressed variant, or with encoding=auto the best one the
+    client accepts.
+
     Returns:
-        Binary response (application/x-msgpack with Content-Encoding: gzip)
+        Binary response (gzip+msgpack, or msgpack with Content-Encoding)
 
     Raises:
-        HTTPException 503: If cache not ready
+        HTTPException 503: If cache not ready (with Retry-After)
     """
     if not activation_cache_service.is_ready():
-        raise HTTPException(
-            status_code=503,
-            detail="Activation cache not ready"
-        )
+        raise cache_not_ready()
+
+    if encoding is not None:
+        return encoded_activation_response(accept_encoding, encoding)
 
     blob = activation_cache_service.get_cached_blob()
     if blob is None:
@@ -143,7 +182,7 @@ async def get_all_activation_examples_cached():
 
     # Note: Do NOT set Content-Encoding: gzip - that would cause browser to auto-decompress
     # Frontend will manually decompress with pako
-    return Response(
+    return BufferResponse(
         content=blob,
         media_type="application/octet-stream",
         headers={
@@ -152,3 +191,109 @@ async def get_all_activation_examples_cached():
             "X-Content-Encoding": "gzip+msgpack"  # Custom header for documentation
         }
     )
+
+
+def encoded_activation_response(accept_encoding: Optional[str], encoding: str) -> Response:
+    """Serve a precompressed variant of the activation blob with its Content-Encoding."""
+    try:
+        if encoding.lower() == "auto":
+            chosen = negotiate(accept_encoding, activation_cache_service.encodings())
+        else:
+            chosen = negotiate(None, activation_cache_service.encodings(), encoding)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    body = activation_cache_service.get_encoded_blob(chosen)
+    if body is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Activation cache is empty"
+        )
+
+    headers = {
+        "X-Feature-Count": str(activation_cache_service.get_stats()['feature_count']),
+        "Vary": "Accept-Encoding"
+    }
+    if chosen:
+        headers["Content-Encoding"] = chosen
+    return BufferResponse(content=body, media_type="application/x-msgpack", headers=headers)
+
+
+@router.get("/activation-examples/manifest", response_model=ActivationManifestResponse)
+async def get_activation_manifest(
+    request: Request,
+    if_none_match: Optional[str] = Header(default=None)
+):
+    """
+    Manifest of the chunked activation store.
+
+    Lists the chunks (about 256 features each, in feature_id order) with their
+    feature_id range and immutable URL, so the frontend fetches only the chunks
+    of the features it is about to display. The manifest is revalidated with
+    If-None-Match; chunks never change under their URL.
+
+    Returns:
+        JSON body of ActivationManifestResponse, or 304
+
+    Raises:
+        HTTPException 503: If cache not ready (with Retry-After)
+    """
+    manifest = activation_cache_service.get_manifest()
+    if manifest is None:
+        raise cache_not_ready()
+
+    headers = {"ETag": f'"{manifest["version"]}"', "Cache-Control": "no-cache"}
+    if if_none_match and headers["ETag"] in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    chunks = [
+        {**chunk, "url": request.app.url_path_for("get_activation_chunk", chunk_id=chunk["chunk_id"])}
+        for chunk in manifest["chunks"]
+    ]
+    return FastJSONResponse({**manifest, "chunks": chunks}, headers=headers)
+
+
+@router.get("/activation-examples/chunks/{chunk_id}")
+async def get_activation_chunk(
+    chunk_id: str,
+    if_none_match: Optional[str] = Header(default=None)
+):
+    """
+    One chunk of the chunked activation store.
+
+    The body has the same format as /activation-examples-cached (gzip-compressed
+    MessagePack of ActivationExamplesResponse) restricted to the chunk's
+    features. The chunk ID is a hash of the content, so the response is cached
+    as immutable; revalidation with If-None-Match gets a 304.
+
+    Returns:
+        Binary response (application/octet-stream, X-Content-Encoding: gzip+msgpack), or 304
+
+    Raises:
+        HTTPException 404: If the chunk is not part of the current cache generation
+        HTTPException 503: If cache not ready (with Retry-After)
+    """
+    if not activation_cache_service.is_ready():
+        raise cache_not_ready()
+
+    chunk = activation_cache_service.get_chunk(chunk_id)
+    if chunk is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Activation chunk not found: {chunk_id}"
+        )
+
+    headers = {"ETag": f'"{chunk.chunk_id}"', "Cache-Control": "public, max-age=31536000, immutable"}
+    if if_none_match and headers["ETag"] in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    # Like the monolithic blob, Content-Encoding is not set: the frontend decompresses with pako
+    return BufferResponse(
+        content=chunk.body,  # may be a view of the memory-mapped snapshot
+        media_type="application/octet-stream",
+        headers={
+            **headers,
+            "X-Feature-Count": str(chunk.feature_count),
+            "X-Content-Encoding": "gzip+msgpack"
+        }
+    )
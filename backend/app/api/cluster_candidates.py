@@ -5,11 +5,12 @@ Provides endpoints to select candidate features using pre-computed agglomerative
 clustering, returning both candidates and cluster membership information.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from typing import TYPE_CHECKING
+from fastapi import APIRouter, Depends, Header, HTTPException
+from typing import Optional, TYPE_CHECKING
 
 from app.models.requests import ClusterCandidatesRequest, SegmentClusterPairsRequest
 from app.models.responses import ClusterCandidatesResponse, SegmentClusterPairsResponse
+from app.models.id_encoding import FEATURE_ID_CONTENT, feature_id_response
 
 if TYPE_CHECKING:
     from app.services.hierarchical_cluster_candidate_service import HierarchicalClusterCandidateService
@@ -33,10 +34,11 @@ def get_cluster_candidate_service() -> "HierarchicalClusterCandidateService":
     return _cluster_candidate_service
 
 
-@router.post("/cluster-candidates", response_model=ClusterCandidatesResponse)
+@router.post("/cluster-candidates", response_model=ClusterCandidatesResponse, responses={200: {"content": FEATURE_ID_CONTENT}})
 async def get_cluster_candidates(
     request: ClusterCandidatesRequest,
-    service: "HierarchicalClusterCandidateService" = Depends(get_cluster_candidate_service)
+    service: "HierarchicalClusterCandidateService" = Depends(get_cluster_candidate_service),
+    accept: Optional[str] = Header(default=None)
 ) -> ClusterCandidatesResponse:
     """
     Get n clusters (each with 2+ features) using hierarchical clustering.
@@ -52,6 +54,7 @@ async def get_cluster_candidates(
 
     Args:
         request: Request containing feature_ids, n (number of clusters), and threshold
+        accept: Accept header (binary-encoded feature IDs, see app.models.id_encoding)
 
     Returns:
         ClusterCandidatesResponse with cluster groups and cluster information
@@ -65,7 +68,7 @@ async def get_cluster_candidates(
             n=request.n,
             threshold=request.threshold or 0.5
         )
-        return ClusterCandidatesResponse(**result)
+        return feature_id_response(ClusterCandidatesResponse(**result), accept)
 
     except ValueError as e:
         # Client error - invalid inputs
@@ -79,10 +82,11 @@ async def get_cluster_candidates(
         )
 
 
-@router.post("/segment-cluster-pairs", response_model=SegmentClusterPairsResponse)
+@router.post("/segment-cluster-pairs", response_model=SegmentClusterPairsResponse, responses={200: {"content": FEATURE_ID_CONTENT}})
 async def get_segment_cluster_pairs(
     request: SegmentClusterPairsRequest,
-    service: "HierarchicalClusterCandidateService" = Depends(get_cluster_candidate_service)
+    service: "HierarchicalClusterCandidateService" = Depends(get_cluster_candidate_service),
+    accept: Optional[str] = Header(default=None)
 ) -> SegmentClusterPairsResponse:
     """
     Get ALL cluster-based pair keys for a segment of features.
@@ -99,6 +103,7 @@ async def get_segment_cluster_pairs(
 
     Args:
         request: Request containing feature_ids and threshold
+        accept: Accept header (binary-encoded feature IDs, see app.models.id_encoding)
 
     Returns:
         SegmentClusterPairsResponse with all pair keys and cluster statistics
@@ -111,7 +116,7 @@ async def get_segment_cluster_pairs(
             feature_ids=request.feature_ids,
             threshold=request.threshold or 0.5
         )
-        return SegmentClusterPairsResponse(**result)
+        return feature_id_response(SegmentClusterPairsResponse.model_construct(**result), accept)
 
     except ValueError as e:
         # Client error - invalid inputs
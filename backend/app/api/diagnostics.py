@@ -0,0 +1,90 @@
+from fastapi import APIRouter, HTTPException, Depends
+import logging
+from typing import Any, Dict
+from ..services.activation_cache_service import activation_cache_service
+from ..services.data_service import DataService
+from ..services.single_flight import single_flight
+from ..services.snapshot_service import snapshot_store
+from ..services.lazy_imports import get_import_report
+from ..services.table_cache_service import table_cache_service
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+def get_data_service():
+    """Dependency to get data service instance"""
+    from ..main import data_service
+    if not data_service or not data_service.is_ready():
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": {
+                    "code": "SERVICE_UNAVAILABLE",
+                    "message": "Data service is not available",
+                    "details": {}
+                }
+            }
+        )
+    return data_service
+
+@router.get(
+    "/diagnostics/cache-stats",
+    summary="Get Cache Statistics",
+    description="Returns hit/miss counters of the backend's in-memory caches."
+)
+async def get_cache_stats(data_service: DataService = Depends(get_data_service)) -> Dict[str, Any]:
+    """
+    Get statistics for the backend's in-memory caches.
+
+    Returns:
+        Dict with one entry per cache (entries, hits, misses, evictions, hit_rate)
+        and the request coalescing counters
+    """
+    return {
+        "filter_cache": data_service.get_filter_cache_stats(),
+        "metric_index": data_service.get_metric_index().get_stats(),
+        "table_cache": table_cache_service.get_stats(),
+        "activation_cache": activation_cache_service.get_stats(),
+        "snapshots": snapshot_store.get_stats(),
+        "single_flight": single_flight.get_stats()
+    }
+
+@router.get(
+    "/diagnostics/startup",
+    summary="Get Startup Timing",
+    description="Returns the per-service initialization timing breakdown and critical path of the last startup."
+)
+async def get_startup_report() -> Dict[str, Any]:
+    """
+    Get the startup timing report.
+
+    Returns:
+        Dict with total/sequential seconds, the critical path and per-stage timings
+    """
+    from ..main import startup_report
+    if startup_report is None:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": {
+                    "code": "SERVICE_UNAVAILABLE",
+                    "message": "Startup has not completed",
+                    "details": {}
+                }
+            }
+        )
+    return startup_report
+
+@router.get(
+    "/diagnostics/imports",
+    summary="Get Lazy Import Report",
+    description="Returns which heavy scientific modules are loaded and how long each lazy import took."
+)
+async def get_imports_report() -> Dict[str, Any]:
+    """
+    Get the lazy import report.
+
+    Returns:
+        Dict with the load state of each heavy module and per-module load timings
+    """
+    return get_import_report()
@@ -7,10 +7,13 @@ local intersections for fast updates.
 """
 
 import logging
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException
 
 from ..models.requests import FeatureGroupRequest
 from ..models.responses import FeatureGroupResponse
+from ..models.id_encoding import FEATURE_ID_CONTENT, feature_id_response
+from ..services.data_service import DataService
 from ..services.feature_group_service import FeatureGroupService
 
 router = APIRouter()
@@ -20,11 +23,11 @@ logger = logging.getLogger(__name__)
 _service: FeatureGroupService | None = None
 
 
-def initialize_service():
-    """Initialize the feature group service"""
+def initialize_service(data_service: DataService):
+    """Initialize the feature group service on top of the shared data service"""
     global _service
     if _service is None:
-        _service = FeatureGroupService()
+        _service = FeatureGroupService(data_service)
         logger.info("FeatureGroupService initialized")
 
 
@@ -35,8 +38,11 @@ def get_service() -> FeatureGroupService:
     return _service
 
 
-@router.post("/feature-groups", response_model=FeatureGroupResponse)
-async def get_feature_groups(request: FeatureGroupRequest) -> FeatureGroupResponse:
+@router.post("/feature-groups", response_model=FeatureGroupResponse, responses={200: {"content": FEATURE_ID_CONTENT}})
+async def get_feature_groups(
+    request: FeatureGroupRequest,
+    accept: Optional[str] = Header(default=None)
+) -> FeatureGroupResponse:
     """
     Get feature IDs grouped by threshold ranges for a single metric.
 
@@ -49,6 +55,8 @@ async def get_feature_groups(request: FeatureGroupRequest) -> FeatureGroupRespon
 
     Args:
         request: FeatureGroupRequest with filters, metric, and thresholds
+        accept: Accept header; application/vnd.feature-ids+json or
+                application/x-msgpack return the feature IDs binary-encoded
 
     Returns:
         FeatureGroupResponse with groups containing feature IDs
@@ -64,7 +72,7 @@ async def get_feature_groups(request: FeatureGroupRequest) -> FeatureGroupRespon
             metric=request.metric,
             thresholds=request.thresholds
         )
-        return response
+        return feature_id_response(response, accept)
 
     except ValueError as e:
         logger.error(f"Validation error in feature groups: {e}")
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends
+import asyncio
 import logging
+from functools import partial
 from ..services.data_service import DataService
 from ..services.histogram_service import HistogramService
-from ..models.requests import HistogramRequest
-from ..models.responses import HistogramResponse
+from ..services.single_flight import single_flight
+from ..models.requests import HistogramRequest, BatchHistogramRequest
+from ..models.responses import HistogramResponse, BatchHistogramResponse
 from ..models.common import ErrorResponse
 
 logger = logging.getLogger(__name__)
@@ -73,13 +76,21 @@ async def get_histogram_data(
                 for constraint in request.thresholdPath
             ]
 
-        return await histogram_service.get_histogram_data(
-            filters=request.filters,
-            metric=request.metric,
-            bins=request.bins,
-            node_id=request.nodeId,
-            fixed_domain=request.fixedDomain,
-            threshold_path=threshold_path
+        # Identical concurrent requests share one computation. It is CPU-bound,
+        # so it runs in a worker thread instead of blocking the server's event loop.
+        loop = asyncio.get_event_loop()
+        return await single_flight.run(
+            "histogram-data",
+            request,
+            lambda: loop.run_in_executor(None, partial(
+                histogram_service.compute_histogram,
+                filters=request.filters,
+                metric=request.metric,
+                bins=request.bins,
+                node_id=request.nodeId,
+                fixed_domain=request.fixedDomain,
+                threshold_path=threshold_path
+            ))
         )
 
     except ValueError as e:
@@ -129,4 +140,60 @@ async def get_histogram_data(
                     "details": {"error": str(e)}
                 }
             }
-        )
\ No newline at end of file
+        )
+
+@router.post(
+    "/histogram-data/batch",
+    response_model=BatchHistogramResponse,
+    responses={
+        200: {"description": "Histogram data generated successfully"},
+        400: {"model": ErrorResponse, "description": "Invalid request parameters"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Get Multiple Histograms",
+    description="Returns histogram data for several (metric, bins, thresholdPath) specs over the same filters in one response."
+)
+async def get_histogram_batch(
+    request: BatchHistogramRequest,
+    histogram_service: HistogramService = Depends(get_histogram_service)
+):
+    """
+    Generate several histograms in a single pass.
+
+    Replaces one /histogram-data round trip per metric: the filter selection,
+    threshold path masks and per-feature averaging are shared across specs.
+    A spec with no data gets an error entry; the other histograms are still returned.
+
+    Args:
+        request: Shared filters and the list of histogram specs
+        histogram_service: Histogram service dependency
+
+    Returns:
+        BatchHistogramResponse: One result per spec, in request order
+    """
+    try:
+        # Same CPU-bound work as /histogram-data, so it also runs in a worker
+        # thread, shared by identical concurrent requests
+        loop = asyncio.get_event_loop()
+        return await single_flight.run(
+            "histogram-data-batch",
+            request,
+            lambda: loop.run_in_executor(None, partial(
+                histogram_service.compute_histogram_batch,
+                filters=request.filters,
+                specs=request.histograms
+            ))
+        )
+
+    except Exception as e:
+        logger.error(f"Error generating batch histogram data: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": {
+                    "code": "INTERNAL_ERROR",
+                    "message": "Failed to generate histogram data",
+                    "details": {"error": str(e)}
+                }
+            }
+        )
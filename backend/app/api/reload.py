@@ -0,0 +1,68 @@
+"""
+API endpoints for hot reload of master data files.
+"""
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+import logging
+from typing import Any, Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..services.reload_service import ReloadService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Service instance will be injected
+_reload_service: "ReloadService" = None
+
+
+def set_reload_service(service: "ReloadService"):
+    """Set the reload service instance."""
+    global _reload_service
+    _reload_service = service
+
+
+def get_reload_service() -> "ReloadService":
+    """Dependency to get reload service."""
+    if _reload_service is None:
+        raise HTTPException(
+            status_code=500,
+            detail="Reload service not initialized"
+        )
+    return _reload_service
+
+
+@router.get(
+    "/reload/status",
+    summary="Get Reload Status",
+    description="Returns the data generation counter and per-target reload state."
+)
+async def get_reload_status(
+    service: "ReloadService" = Depends(get_reload_service)
+) -> Dict[str, Any]:
+    return service.get_status()
+
+
+@router.post(
+    "/reload",
+    summary="Reload Master Data",
+    description="Reloads every target whose source files changed (or all targets with force=true) and swaps the new data in without a restart."
+)
+async def reload_data(
+    force: bool = Query(False, description="Reload all targets even if their files are unchanged"),
+    service: "ReloadService" = Depends(get_reload_service)
+) -> Dict[str, Any]:
+    """
+    Trigger a reload check immediately instead of waiting for the next poll.
+
+    Returns:
+        Names of reloaded targets and the resulting status
+    """
+    try:
+        # An explicit request skips the debounce for changed targets
+        reloaded = await service.check(force=force, debounce=False)
+        return {"reloaded": reloaded, "status": service.get_status()}
+    except Exception as e:
+        logger.error(f"Reload failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Reload failed: {str(e)}")
@@ -3,9 +3,12 @@ API endpoint for similarity-based feature sorting.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+import asyncio
 import logging
 from typing import TYPE_CHECKING
 
+from ..models.fast_json import FastJSONResponse
+from ..services.single_flight import single_flight
 from ..models.similarity_sort import (
     SimilaritySortRequest, SimilaritySortResponse,
     PairSimilaritySortRequest, PairSimilaritySortResponse,
@@ -113,11 +116,18 @@ async def similarity_sort(
                 detail="At least one of selected_ids or rejected_ids must be provided"
             )
 
-        # Call service to calculate scores
-        response = await service.get_similarity_sorted_features(request)
+        # Call service to calculate scores (shared by identical concurrent requests).
+        # The scoring is CPU-bound, so it runs in a worker thread instead of
+        # blocking the server's event loop.
+        loop = asyncio.get_event_loop()
+        response = await single_flight.run(
+            "similarity-sort",
+            request,
+            lambda: loop.run_in_executor(None, service.sort_features, request)
+        )
 
         logger.info(f"Similarity sort completed: {response.total_features} features scored")
-        return response
+        return FastJSONResponse(response)
 
     except HTTPException:
         raise
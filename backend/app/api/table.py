@@ -4,15 +4,19 @@ Table data endpoint for LLM scoring visualization.
 Provides feature-level score data (824 rows, one per feature) for table visualization.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response
 
 from typing import Optional
 
+from app.models.fast_json import FastJSONResponse
 from app.models.requests import TableDataRequest
-from app.models.responses import FeatureTableDataResponse
+from app.models.responses import ColumnarTableDataResponse, FeatureTableDataResponse, TableWindowResponse
 from app.services.data_service import DataService
 from app.services.table_data_service import TableDataService
 from app.services.alignment_service import AlignmentService
+from app.services.compression import negotiate
+from app.services.table_cache_service import SIMILARITY_SORT_PREFIX, table_cache_service
 
 router = APIRouter()
 
@@ -31,11 +35,133 @@ def get_alignment_service() -> Optional[AlignmentService]:
     return alignment_service  # Can be None if initialization failed
 
 
+# Query parameter that picks the content encoding explicitly (overrides Accept-Encoding)
+ENCODING_QUERY = Query(
+    None,
+    description="Content encoding of the response (zstd, br, gzip or identity); negotiated from Accept-Encoding if omitted"
+)
+
+
+def cached_table_response(
+    if_none_match: Optional[str],
+    accept_encoding: Optional[str],
+    encoding: Optional[str] = None,
+    safe_method: bool = True
+) -> Response:
+    """
+    Serve the pre-computed table blob, or 304 if the client already has it.
+
+    The best precompressed variant the client accepts (or the one named by the
+    encoding query parameter) is sent with its Content-Encoding; each
+    representation has its own strong ETag and must be revalidated (no-cache).
+
+    A matching If-None-Match only yields 304 for GET (safe_method); other
+    methods get 412 Precondition Failed, per RFC 9110.
+    """
+    try:
+        chosen = negotiate(accept_encoding, table_cache_service.encodings(), encoding)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {
+        "ETag": table_cache_service.etag(chosen),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding"
+    }
+
+    if table_cache_service.matches(if_none_match, chosen):
+        if not safe_method:
+            return Response(status_code=412, headers=headers)
+        table_cache_service.not_modified += 1
+        return Response(status_code=304, headers=headers)
+
+    if chosen:
+        headers["Content-Encoding"] = chosen
+    table_cache_service.served += 1
+    table_cache_service.served_by_encoding[chosen or "identity"] += 1
+    return Response(
+        content=table_cache_service.get_body(chosen),
+        media_type="application/json",
+        headers=headers
+    )
+
+
+@router.get("/table-data", response_model=FeatureTableDataResponse)
+async def get_cached_table_data(
+    if_none_match: Optional[str] = Header(default=None),
+    accept_encoding: Optional[str] = Header(default=None),
+    encoding: Optional[str] = ENCODING_QUERY
+):
+    """
+    Get the default-configuration table data from the pre-computed blob.
+
+    Built at startup and on data reload, so serving it costs no table work.
+    Browsers revalidate with If-None-Match and get a 304 while the data is unchanged.
+
+    Returns:
+        JSON body of FeatureTableDataResponse (zstd/br/gzip-encoded if accepted), or 304
+
+    Raises:
+        HTTPException 400: Unsupported encoding
+        HTTPException 503: If the blob is not built yet
+    """
+    if not table_cache_service.is_ready():
+        raise HTTPException(status_code=503, detail="Table data cache not ready")
+    return cached_table_response(if_none_match, accept_encoding, encoding)
+
+
+@router.get("/table-data/window", response_model=TableWindowResponse)
+async def get_table_window(
+    offset: int = Query(0, ge=0, description="Index of the first row in sort order"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of rows to return"),
+    sort_by: str = Query("feature_id", description="feature_id, a score column or similarity:<result_id>"),
+    descending: bool = Query(False, description="Sort descending")
+):
+    """
+    Get one window of the default-configuration table, sorted server-side.
+
+    The sort permutation is computed once per sort key and table version and
+    kept on the server, so scrolling only transfers the visible rows. Score
+    columns sort by the feature's mean over all explainers/scorers; missing
+    values sort last. sort_by='similarity:<result_id>' pages through the result
+    of a /api/similarity-sort call.
+
+    Returns:
+        JSON body of TableWindowResponse
+
+    Raises:
+        HTTPException 400: Unknown sort key
+        HTTPException 404: Unknown or expired similarity result
+        HTTPException 503: If the table blob is not built yet
+    """
+    if not table_cache_service.is_ready():
+        raise HTTPException(status_code=503, detail="Table data cache not ready")
+
+    similarity_scores = None
+    if sort_by.startswith(SIMILARITY_SORT_PREFIX):
+        from app.main import similarity_sort_service
+        result_id = sort_by[len(SIMILARITY_SORT_PREFIX):]
+        if similarity_sort_service is not None:
+            similarity_scores = similarity_sort_service.get_sort_result(result_id)
+        if similarity_scores is None:
+            raise HTTPException(status_code=404, detail=f"Similarity sort result not found: {result_id}")
+
+    try:
+        body = table_cache_service.get_window(offset, limit, sort_by, descending, similarity_scores)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return Response(content=body, media_type="application/json")
+
+
 @router.post("/table-data", response_model=FeatureTableDataResponse)
 async def get_table_data(
     request: TableDataRequest,
     data_service: DataService = Depends(get_data_service),
-    alignment_service: Optional[AlignmentService] = Depends(get_alignment_service)
+    alignment_service: Optional[AlignmentService] = Depends(get_alignment_service),
+    if_none_match: Optional[str] = Header(default=None),
+    accept_encoding: Optional[str] = Header(default=None),
+    encoding: Optional[str] = ENCODING_QUERY
 ) -> FeatureTableDataResponse:
     """
     Get feature-level score data for table visualization.
@@ -44,6 +170,11 @@ async def get_table_data(
     Each explainer has: embedding (1 value) + fuzz (3 scorers) + detection (3 scorers).
     Includes highlighted explanations showing alignment across LLM explainers.
 
+    Requests for the default configuration are answered from the pre-computed
+    blob (always with its body; conditional requests go to GET /table-data,
+    a matching If-None-Match here fails with 412). Any other filters are applied by
+    masking the rows of the pre-computed full table, reusing its lookups.
+
     Process:
     1. Applies filters to master parquet
     2. Computes global statistics for normalization
@@ -63,12 +194,19 @@ async def get_table_data(
         HTTPException: 400 for invalid filters, 500 for server errors
     """
     try:
-        # Create table service instance with alignment service
-        table_service = TableDataService(data_service, alignment_service)
+        if table_cache_service.serves(request.filters):
+            return cached_table_response(if_none_match, accept_encoding, encoding, safe_method=False)
+
+        # Reuse the current generation's table service (full-table lookups already built)
+        table_service = table_cache_service.get_table_service()
+        if table_service is None:
+            table_service = TableDataService(data_service, alignment_service)
 
-        # Delegate to service layer
-        return await table_service.get_table_data(request.filters)
+        # Delegate to service layer (trusted model, sent without re-validation)
+        return FastJSONResponse(await table_service.get_table_data(request.filters))
 
+    except HTTPException:
+        raise
     except ValueError as e:
         # Invalid filter or data errors
         raise HTTPException(status_code=400, detail=str(e))
@@ -78,3 +216,44 @@ async def get_table_data(
             status_code=500,
             detail=f"Failed to fetch table data: {str(e)}"
         )
+
+
+@router.post("/table-data/columnar", response_model=ColumnarTableDataResponse)
+async def get_columnar_table_data(
+    request: TableDataRequest,
+    data_service: DataService = Depends(get_data_service),
+    alignment_service: Optional[AlignmentService] = Depends(get_alignment_service)
+):
+    """
+    Get the feature table in columnar (struct-of-arrays) form.
+
+    Same content and filter support as POST /table-data, but every score,
+    explainer and similarity field is one flat array, with offset arrays for
+    the per-explainer cells and decoder-similar features of each feature.
+
+    Args:
+        request: TableDataRequest with filters
+        data_service: Injected DataService instance
+        alignment_service: Injected AlignmentService instance (optional)
+
+    Returns:
+        JSON body of ColumnarTableDataResponse
+
+    Raises:
+        HTTPException: 400 for invalid filters, 500 for server errors
+    """
+    try:
+        table_service = table_cache_service.get_table_service()
+        if table_service is None:
+            table_service = TableDataService(data_service, alignment_service)
+
+        columns = await table_service.get_columnar_table_data(request.filters)
+        return FastJSONResponse(columns)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch columnar table data: {str(e)}"
+        )
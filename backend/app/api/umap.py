@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException, Depends
 import logging
 from typing import TYPE_CHECKING
 
+from ..models.fast_json import FastJSONResponse
 from ..models.umap import (
     UmapProjectionRequest,
     UmapProjectionResponse
@@ -83,7 +84,7 @@ async def umap_projection(
         response = await service.get_umap_projection(request)
 
         logger.info(f"UMAP projection completed: {response.total_features} features projected")
-        return response
+        return FastJSONResponse(response)
 
     except HTTPException:
         raise
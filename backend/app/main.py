@@ -13,8 +13,13 @@ from .services.similarity_sort_service import SimilaritySortService
 from .services.pair_similarity_service import PairSimilarityService
 from .services.hierarchical_cluster_candidate_service import HierarchicalClusterCandidateService
 from .services.activation_cache_service import activation_cache_service
+from .services.table_cache_service import table_cache_service
 from .services.umap_service import UMAPService
+from .services.reload_service import ReloadService
+from .services.stage_executor import StageExecutor
+from .services.lazy_imports import start_background_warmup
 from .api import feature_groups, similarity_sort, cluster_candidates, umap
+from .api import reload as data_reload
 
 # Configure logging for the application
 log_level = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -45,63 +50,183 @@ similarity_sort_service = None
 pair_similarity_service = None
 cluster_candidate_service = None
 umap_service = None
+reload_service = None
+# Per-service timing breakdown and critical path of the last startup
+startup_report = None
+
+
+def _register_reload_targets(service: ReloadService, project_root):
+    """
+    Register what to rebuild when each group of master files changes.
+
+    Each target lists exactly the caches derived from its files; SVM caches are
+    additionally keyed on DataService.dataset_version, so a model trained on the
+    previous generation can never be reused.
+    """
+    async def clear_svm_caches():
+        similarity_sort_service.clear_svm_cache()
+        pair_similarity_service.clear_svm_cache()
+
+    async def invalidate_explanation_texts():
+        alignment_service.invalidate_text_caches()
+
+    async def clear_umap_cache():
+        umap_service.clear_cache()
+
+    service.register(
+        "features",
+        [data_service.master_file],
+        data_service.reload,
+        invalidate_explanation_texts,
+        clear_svm_caches,
+        table_cache_service.rebuild
+    )
+    service.register(
+        "activation",
+        [
+            data_service.activation_display_file,
+            data_service.activation_examples_file,
+            data_service.activation_similarity_file,
+            data_service.interfeature_similarity_file,
+            data_service.barycentric_file
+        ],
+        data_service.reload_auxiliary,
+        clear_svm_caches,
+        table_cache_service.rebuild
+    )
+    service.register(
+        "activation_cache",
+        [activation_cache_service.activation_display_file],
+        activation_cache_service.reload
+    )
+    service.register(
+        "alignment",
+        [alignment_service.alignment_file],
+        alignment_service.reload,
+        table_cache_service.rebuild
+    )
+    service.register(
+        "barycentric_metadata",
+        [project_root / "data" / "master" / "explanation_barycentric_metadata.json"],
+        clear_umap_cache
+    )
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global data_service, alignment_service, similarity_sort_service, pair_similarity_service, cluster_candidate_service, umap_service
+    global data_service, alignment_service, similarity_sort_service, pair_similarity_service, cluster_candidate_service, umap_service, reload_service, startup_report
     try:
-        data_service = DataService()
-        await data_service.initialize()
-        logger.info("Data service initialized successfully")
+        from pathlib import Path
+        project_root = Path(__file__).parent.parent.parent
 
-        # Initialize alignment service with data_service reference
+        # Constructors are cheap; the expensive initialize() calls run as stages below
+        data_service = DataService()
         alignment_service = AlignmentService(data_service=data_service)
-        success = await alignment_service.initialize()
-        if success:
-            logger.info("Alignment service initialized successfully")
-        else:
-            logger.warning("Alignment service initialization failed - explanations will not be highlighted")
 
-        # Initialize feature groups service
-        feature_groups.initialize_service()
-        logger.info("Feature groups service initialized successfully")
+        # Services are initialized concurrently in threads as soon as the services
+        # they depend on are ready, so cold start takes about as long as the
+        # slowest dependency chain instead of the sum of all services.
+        bootstrap = StageExecutor("startup")
 
-        # Initialize hierarchical cluster candidate service (BEFORE similarity sort service)
-        from pathlib import Path
-        project_root = Path(__file__).parent.parent.parent
-        cluster_candidate_service = HierarchicalClusterCandidateService(project_root=project_root)
-        cluster_candidates.set_cluster_candidate_service(cluster_candidate_service)
-        logger.info("Hierarchical cluster candidate service initialized successfully")
+        async def init_data_service():
+            await data_service.initialize()
+            logger.info("Data service initialized successfully")
+            return data_service
 
-        # Initialize similarity sort service (feature-level sorting)
-        similarity_sort_service = SimilaritySortService(data_service=data_service)
-        logger.info("Similarity sort service initialized successfully")
+        async def init_alignment_service():
+            success = await alignment_service.initialize()
+            if success:
+                logger.info("Alignment service initialized successfully")
+            else:
+                logger.warning("Alignment service initialization failed - explanations will not be highlighted")
+            return alignment_service
 
-        # Initialize pair similarity service (pair-level sorting)
-        pair_similarity_service = PairSimilarityService(
-            data_service=data_service,
-            cluster_service=cluster_candidate_service
-        )
-        logger.info("Pair similarity service initialized successfully")
+        def init_feature_groups(data_service):
+            feature_groups.initialize_service(data_service)
+            logger.info("Feature groups service initialized successfully")
+
+        def init_cluster_candidates():
+            # Initialize hierarchical cluster candidate service (BEFORE pair similarity service)
+            service = HierarchicalClusterCandidateService(project_root=project_root)
+            logger.info("Hierarchical cluster candidate service initialized successfully")
+            return service
+
+        def init_similarity_sort(data_service):
+            # Initialize similarity sort service (feature-level sorting)
+            service = SimilaritySortService(data_service=data_service)
+            logger.info("Similarity sort service initialized successfully")
+            return service
+
+        def init_pair_similarity(data_service, cluster_candidates):
+            # Initialize pair similarity service (pair-level sorting)
+            service = PairSimilarityService(
+                data_service=data_service,
+                cluster_service=cluster_candidates
+            )
+            logger.info("Pair similarity service initialized successfully")
+            return service
+
+        def init_umap(data_service):
+            # Initialize UMAP service for cause view projections
+            service = UMAPService(data_service=data_service)
+            logger.info("UMAP service initialized successfully")
+            return service
+
+        async def init_activation_cache():
+            # Initialize activation cache service (map the snapshot, or build the
+            # msgpack+gzip blob in the background)
+            await activation_cache_service.initialize()
+            logger.info("Activation cache service initialized successfully")
 
-        # Pass both services to API layer
+        async def init_table_cache(data_service, alignment):
+            # Pre-compute the default table-data response (JSON + gzip + ETag)
+            await table_cache_service.initialize(data_service, alignment)
+            logger.info("Table cache service initialized successfully")
+
+        bootstrap.add("data_service", init_data_service)
+        bootstrap.add("alignment", init_alignment_service)
+        bootstrap.add("feature_groups", init_feature_groups, depends_on=["data_service"])
+        bootstrap.add("cluster_candidates", init_cluster_candidates)
+        bootstrap.add("similarity_sort", init_similarity_sort, depends_on=["data_service"])
+        bootstrap.add("pair_similarity", init_pair_similarity, depends_on=["data_service", "cluster_candidates"])
+        bootstrap.add("umap", init_umap, depends_on=["data_service"])
+        bootstrap.add("activation_cache", init_activation_cache)
+        bootstrap.add("table_cache", init_table_cache, depends_on=["data_service", "alignment"])
+
+        try:
+            services = await bootstrap.run()
+        finally:
+            startup_report = bootstrap.get_report()
+        bootstrap.log_report()
+
+        cluster_candidate_service = services["cluster_candidates"]
+        similarity_sort_service = services["similarity_sort"]
+        pair_similarity_service = services["pair_similarity"]
+        umap_service = services["umap"]
+
+        # Pass services to API layer
+        cluster_candidates.set_cluster_candidate_service(cluster_candidate_service)
         similarity_sort.set_similarity_sort_service(similarity_sort_service)
         similarity_sort.set_pair_similarity_service(pair_similarity_service)
-
-        # Initialize UMAP service for cause view projections
-        umap_service = UMAPService(data_service=data_service)
         umap.set_umap_service(umap_service)
-        logger.info("UMAP service initialized successfully")
 
-        # Initialize activation cache service (pre-compute msgpack+gzip blob)
-        await activation_cache_service.initialize()
-        logger.info("Activation cache service initialized successfully")
+        # Hot reload: watch the master files and swap in new data generations
+        reload_service = ReloadService()
+        _register_reload_targets(reload_service, project_root)
+        data_reload.set_reload_service(reload_service)
+        await reload_service.start()
+        logger.info("Reload service initialized successfully")
+
+        # sklearn/scipy are imported lazily; load them now in the background so the
+        # first SVM or dendrogram request does not pay the import cost
+        start_background_warmup()
 
         yield
     except Exception as e:
         logger.error(f"Failed to initialize services: {e}")
         raise
     finally:
+        if reload_service:
+            await reload_service.stop()
         if data_service:
             await data_service.cleanup()
         if alignment_service:
@@ -136,8 +261,9 @@ app.add_middleware(
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     # Check if exc.detail is already a properly formatted error response
+    # Keep headers set on the exception (e.g. Retry-After)
     if isinstance(exc.detail, dict) and "error" in exc.detail:
-        return JSONResponse(status_code=exc.status_code, content=exc.detail)
+        return JSONResponse(status_code=exc.status_code, content=exc.detail, headers=exc.headers)
     else:
         return JSONResponse(
             status_code=exc.status_code,
@@ -147,7 +273,8 @@ async def http_exception_handler(request, exc):
                     "message": str(exc.detail),
                     "details": {}
                 }
-            }
+            },
+            headers=exc.headers
         )
 
 @app.exception_handler(Exception)
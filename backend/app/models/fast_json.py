@@ -0,0 +1,68 @@
+"""
+Fast JSON rendering of large, trusted API responses.
+
+When a route returns a model, FastAPI validates it against the route's
+response_model again, dumps it and serializes the result with the json module.
+For multi-megabyte responses (table data, activation examples, UMAP points,
+similarity sorts, cluster pairs) this costs more than building the data.
+
+Those endpoints build their response models with model_construct (no
+validation: the services already produce data in the response shape) and return
+a FastJSONResponse, which FastAPI sends as is. The response_model of the route
+still documents the schema in OpenAPI.
+
+Models are encoded from their declared fields in declaration order (extra keys
+passed to model_construct are dropped), so the output matches model_dump_json();
+nested dicts and lists are written as they are.
+Integer dict keys become strings, numpy scalars and arrays are supported, and
+NaN/infinity are written as null.
+"""
+
+from typing import Any
+
+import numpy as np
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    """Encode the values orjson does not handle natively."""
+    if isinstance(value, BaseModel):
+        values = value.__dict__
+        return {name: values[name] for name in type(value).model_fields if name in values}
+    if isinstance(value, np.ndarray):
+        # Non-contiguous or object arrays
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize a response model (or any JSON-like structure) to JSON bytes.
+
+    Args:
+        content: Model instance, dict, list or scalar
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return orjson.dumps(content, default=_default, option=OPTIONS)
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON bytes (inverse of dumps)."""
+    return orjson.loads(data)
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with dumps(), without response_model validation."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
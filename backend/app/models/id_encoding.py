@@ -0,0 +1,185 @@
+"""
+Compact binary encoding of feature ID lists in API responses.
+
+Response fields that carry feature ID lists are marked with
+json_schema_extra=FEATURE_IDS (List[int] or Dict[str, List[int]]) or
+FEATURE_ID_MAP (Dict[int, int]). By default they are serialized as plain JSON.
+Clients that send a matching Accept header get them encoded instead:
+
+    Accept: application/vnd.feature-ids+json -> JSON, ID lists as base64 strings
+    Accept: application/x-msgpack            -> MessagePack, ID lists as raw bytes
+
+An encoded list is the zigzag-encoded deltas between consecutive IDs written as
+LEB128 varints, so sorted IDs of a 16k-wide SAE take about one byte each and
+unsorted lists still round-trip. A FEATURE_ID_MAP field becomes
+{"keys": <ids sorted>, "values": <values in key order>}, both encoded.
+"""
+
+import base64
+import json
+from enum import Enum
+from typing import Any, Dict, Iterable, Optional
+
+import msgpack
+import numpy as np
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from ..services.compression import parse_accept_encoding
+from .fast_json import FastJSONResponse
+
+# Field markers (json_schema_extra); also documented in the OpenAPI schema
+FEATURE_IDS = {"x-encoding": "feature-ids"}
+FEATURE_ID_MAP = {"x-encoding": "feature-id-map"}
+
+MEDIA_TYPE_JSON = "application/json"
+MEDIA_TYPE_IDS_JSON = "application/vnd.feature-ids+json"
+MEDIA_TYPE_MSGPACK = "application/x-msgpack"
+
+# OpenAPI "content" entry for endpoints that support the encoded media types
+FEATURE_ID_CONTENT = {MEDIA_TYPE_IDS_JSON: {}, MEDIA_TYPE_MSGPACK: {}}
+
+# Value of the X-Feature-Id-Encoding response header for encoded responses
+ENCODING_NAME = "zigzag-delta-varint"
+
+
+def encode_ids(ids: Iterable[int]) -> bytes:
+    """
+    Encode integers as zigzag deltas in LEB128 varint form.
+
+    Args:
+        ids: Feature IDs (any order)
+
+    Returns:
+        Encoded bytes
+    """
+    values = np.fromiter(ids, dtype=np.int64)
+    if len(values) == 0:
+        return b""
+
+    deltas = np.diff(values, prepend=np.int64(0))
+    zigzag = ((deltas << 1) ^ (deltas >> 63)).view(np.uint64)
+
+    # Bytes per value: 7 payload bits per byte
+    n_bytes = np.ones(len(zigzag), dtype=np.int64)
+    rest = zigzag >> np.uint64(7)
+    while rest.any():
+        n_bytes += rest > 0
+        rest >>= np.uint64(7)
+
+    ends = np.cumsum(n_bytes)
+    starts = ends - n_bytes
+    out = np.empty(int(ends[-1]), dtype=np.uint8)
+    for position in range(int(n_bytes.max())):
+        selected = n_bytes > position
+        payload = (zigzag[selected] >> np.uint64(7 * position)) & np.uint64(0x7F)
+        continuation = (n_bytes[selected] > position + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[selected] + position] = (payload | continuation).astype(np.uint8)
+    return out.tobytes()
+
+
+def decode_ids(data: bytes) -> np.ndarray:
+    """
+    Decode bytes produced by encode_ids.
+
+    Returns:
+        int64 array of the original IDs
+    """
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if len(raw) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    ends = (raw & 0x80) == 0
+    value_index = np.concatenate(([0], np.cumsum(ends)[:-1]))
+    starts = np.flatnonzero(np.concatenate(([True], ends[:-1])))
+    shifts = (np.arange(len(raw)) - starts[value_index]) * 7
+    parts = (raw & 0x7F).astype(np.uint64) << shifts.astype(np.uint64)
+    zigzag = np.add.reduceat(parts, starts)
+
+    deltas = (zigzag >> np.uint64(1)).view(np.int64) ^ -(zigzag & np.uint64(1)).view(np.int64)
+    return np.cumsum(deltas)
+
+
+def negotiate_encoding(accept: Optional[str]) -> str:
+    """
+    Pick the response media type from an Accept header (plain JSON by default).
+
+    The encoded media types are only chosen when listed explicitly with q > 0
+    and at least the q-value of plain JSON (given directly or by a wildcard);
+    on a tie the encoded type wins.
+    """
+    accepted = parse_accept_encoding(accept)
+    if not accepted:
+        return MEDIA_TYPE_JSON
+
+    best_type = MEDIA_TYPE_JSON
+    best_quality = accepted.get(MEDIA_TYPE_JSON, accepted.get("application/*", accepted.get("*/*", 0.0)))
+    for media_type in (MEDIA_TYPE_IDS_JSON, MEDIA_TYPE_MSGPACK):
+        quality = accepted.get(media_type, 0.0)
+        if quality > 0 and quality >= best_quality:
+            best_type, best_quality = media_type, quality
+    return best_type
+
+
+def encode_model(model: BaseModel, as_bytes: bool) -> Dict[str, Any]:
+    """
+    Dump a response model with its marked feature ID fields encoded.
+
+    Args:
+        model: Response model instance
+        as_bytes: Keep encoded lists as bytes (MessagePack) instead of base64 strings
+
+    Returns:
+        JSON/MessagePack-ready dict
+    """
+    def pack(ids: Iterable[int]):
+        data = encode_ids(ids)
+        return data if as_bytes else base64.b64encode(data).decode("ascii")
+
+    def dump(value: Any) -> Any:
+        if isinstance(value, BaseModel):
+            return encode_model(value, as_bytes)
+        if isinstance(value, list):
+            return [dump(item) for item in value]
+        if isinstance(value, dict):
+            return {key: dump(item) for key, item in value.items()}
+        if isinstance(value, Enum):
+            return value.value
+        return value
+
+    result = {}
+    for name, field in type(model).model_fields.items():
+        value = getattr(model, name)
+        marker = field.json_schema_extra
+        if value is None or marker not in (FEATURE_IDS, FEATURE_ID_MAP):
+            result[name] = dump(value)
+        elif marker == FEATURE_ID_MAP:
+            keys = sorted(value)
+            result[name] = {"keys": pack(keys), "values": pack(value[key] for key in keys)}
+        elif isinstance(value, dict):
+            result[name] = {key: pack(ids) for key, ids in value.items()}
+        else:
+            result[name] = pack(value)
+    return result
+
+
+def feature_id_response(model: BaseModel, accept: Optional[str]) -> Any:
+    """
+    Render a response model according to the client's Accept header.
+
+    Every variant carries Vary: Accept, so caches keep them apart.
+
+    Returns:
+        A FastJSONResponse for plain JSON, or a Response with the encoded body
+    """
+    media_type = negotiate_encoding(accept)
+    if media_type == MEDIA_TYPE_JSON:
+        return FastJSONResponse(model, headers={"Vary": "Accept"})
+
+    headers = {"X-Feature-Id-Encoding": ENCODING_NAME, "Vary": "Accept"}
+    if media_type == MEDIA_TYPE_MSGPACK:
+        body = msgpack.packb(encode_model(model, as_bytes=True), use_bin_type=True)
+        return Response(content=body, media_type=MEDIA_TYPE_MSGPACK, headers=headers)
+
+    body = json.dumps(encode_model(model, as_bytes=False), separators=(",", ":"))
+    return Response(content=body, media_type=MEDIA_TYPE_IDS_JSON, headers=headers)
@@ -31,6 +31,43 @@ class  HistogramRequest(BaseModel):
         description="Optional threshold path constraints from root to node for filtering features by parent ranges"
     )
 
+class HistogramSpec(BaseModel):
+    """One histogram of a batch histogram request"""
+    metric: MetricType = Field(
+        ...,
+        description="Metric name to analyze for histogram"
+    )
+    bins: Optional[int] = Field(
+        default=None,
+        ge=5,
+        le=100,
+        description="Number of histogram bins (auto-calculated if not provided)"
+    )
+    nodeId: Optional[str] = Field(
+        default=None,
+        description="Optional node ID for reference, echoed back in the result"
+    )
+    fixedDomain: Optional[tuple[float, float]] = Field(
+        default=None,
+        description="Optional fixed domain [min, max] for histogram bins"
+    )
+    thresholdPath: Optional[List[ThresholdPathConstraint]] = Field(
+        default=None,
+        description="Optional threshold path constraints from root to node"
+    )
+
+class BatchHistogramRequest(BaseModel):
+    """Request model for several histograms over the same filters"""
+    filters: Filters = Field(
+        ...,
+        description="Filter criteria shared by every histogram"
+    )
+    histograms: List[HistogramSpec] = Field(
+        ...,
+        min_items=1,
+        description="Histogram specifications; results are returned in the same order"
+    )
+
 class TableDataRequest(BaseModel):
     """Request model for table visualization data endpoint"""
     filters: Filters = Field(
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 from .common import CategoryType
+from .id_encoding import FEATURE_IDS, FEATURE_ID_MAP
 
 class FilterOptionsResponse(BaseModel):
     """Response model for filter options endpoint"""
@@ -86,6 +87,32 @@ class HistogramResponse(BaseModel):
         description="Grouped histogram data when groupBy is specified"
     )
 
+class BatchHistogramResult(BaseModel):
+    """One histogram of a batch response (data on success, error otherwise)"""
+    metric: str = Field(
+        ...,
+        description="The metric analyzed"
+    )
+    nodeId: Optional[str] = Field(
+        default=None,
+        description="Node ID from the request spec"
+    )
+    data: Optional[HistogramResponse] = Field(
+        default=None,
+        description="Histogram data for this spec"
+    )
+    error: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Error information (code, message, details) if this spec failed"
+    )
+
+class BatchHistogramResponse(BaseModel):
+    """Response model for batch histogram data endpoint"""
+    histograms: List[BatchHistogramResult] = Field(
+        ...,
+        description="One result per requested histogram, in request order"
+    )
+
 class SankeyNode(BaseModel):
     """Individual node in Sankey diagram"""
     id: str = Field(
@@ -310,17 +337,61 @@ class FeatureTableDataResponse(BaseModel):
     scorer_ids: List[str] = Field(..., description="List of scorer IDs present in data (for S1, S2, S3 labels)")
     global_stats: Dict[str, MetricNormalizationStats] = Field(..., description="Global normalization statistics for each metric (embedding, fuzz, detection)")
 
+class ColumnarTableDataResponse(BaseModel):
+    """
+    Feature table in columnar (struct-of-arrays) form.
+
+    Per-feature arrays have total_features entries. Per-cell arrays have one entry
+    per (feature, explainer) pair; the cells of feature i are
+    explainer_offsets[i]:explainer_offsets[i+1]. Decoder arrays are delimited the
+    same way by decoder_offsets.
+    """
+    total_features: int = Field(..., ge=0, description="Total number of features")
+    explainer_ids: List[str] = Field(..., description="List of explainer IDs present in data")
+    scorer_ids: List[str] = Field(..., description="List of scorer IDs present in data (for S1, S2, S3 labels)")
+    global_stats: Dict[str, MetricNormalizationStats] = Field(..., description="Global normalization statistics for each metric (embedding, fuzz, detection)")
+    feature_id: List[int] = Field(..., description="Feature IDs (ascending)")
+    decoder_similarity_merge_threshold: List[Optional[float]] = Field(..., description="Merge threshold per feature")
+    explainer_offsets: List[int] = Field(..., description="Cell offsets per feature (length total_features + 1)")
+    explainer: List[int] = Field(..., description="Per cell: index into explainer_ids")
+    embedding: List[Optional[float]] = Field(..., description="Per cell: embedding score")
+    quality_score: List[Optional[float]] = Field(..., description="Per cell: quality score")
+    fuzz: Dict[str, List[Optional[float]]] = Field(..., description="Per cell: fuzz score per scorer slot (s1, s2, s3)")
+    detection: Dict[str, List[Optional[float]]] = Field(..., description="Per cell: detection score per scorer slot (s1, s2, s3)")
+    explanation_text: List[Optional[str]] = Field(..., description="Per cell: explanation text")
+    highlighted_explanation: List[Optional[HighlightedExplanation]] = Field(..., description="Per cell: highlighted explanation")
+    semantic_similarity: Dict[str, List[Optional[float]]] = Field(..., description="Per cell: cosine similarity to each other explainer (key: explainer name)")
+    decoder_offsets: List[int] = Field(..., description="Decoder entry offsets per feature (length total_features + 1)")
+    decoder_feature_id: List[int] = Field(..., description="Per decoder entry: similar feature ID")
+    decoder_cosine_similarity: List[float] = Field(..., description="Per decoder entry: decoder cosine similarity")
+    decoder_inter_feature: Dict[str, List[Any]] = Field(..., description="Per decoder entry: InterFeatureSimilarityInfo fields")
+
+class TableWindowResponse(BaseModel):
+    """Response model for one window of the server-side sorted table"""
+    features: List[FeatureTableRow] = Field(..., description="Visible rows, in sort order")
+    offset: int = Field(..., ge=0, description="Index of the first row in sort order")
+    limit: int = Field(..., ge=1, description="Requested number of rows")
+    total_features: int = Field(..., ge=0, description="Total number of features in the table")
+    sort_by: str = Field(..., description="Sort key (feature_id, a score column, or similarity:<result_id>)")
+    descending: bool = Field(..., description="Whether the sort is descending")
+    version: str = Field(..., description="Table version (ETag of /api/table-data); changes on data reload")
+    explainer_ids: List[str] = Field(..., description="List of explainer IDs present in data")
+    scorer_ids: List[str] = Field(..., description="List of scorer IDs present in data (for S1, S2, S3 labels)")
+    global_stats: Dict[str, MetricNormalizationStats] = Field(..., description="Global normalization statistics for each metric (embedding, fuzz, detection)")
+
 class FeatureGroup(BaseModel):
     """Single group of features within a threshold range"""
     group_index: int = Field(..., ge=0, description="Group index (0, 1, 2, ...)")
     range_label: str = Field(..., description="Human-readable range label (e.g., '< 0.50', '0.50 - 0.80')")
     feature_ids: Optional[List[int]] = Field(
         default=None,
-        description="Feature IDs in this group (used for standard metrics)"
+        description="Feature IDs in this group (used for standard metrics)",
+        json_schema_extra=FEATURE_IDS
     )
     feature_ids_by_source: Optional[Dict[str, List[int]]] = Field(
         default=None,
-        description="Feature IDs grouped by source_min (used for consistency metrics). Key is explainer name or metric name."
+        description="Feature IDs grouped by source_min (used for consistency metrics). Key is explainer name or metric name.",
+        json_schema_extra=FEATURE_IDS
     )
     feature_count: int = Field(..., ge=0, description="Total number of unique features in this group")
 
@@ -401,6 +472,23 @@ class ActivationExamplesResponse(BaseModel):
         description="Dictionary mapping feature_id to activation example data"
     )
 
+class ActivationChunkInfo(BaseModel):
+    """One chunk of the chunked activation store"""
+    chunk_id: str = Field(..., description="Content hash of the chunk (part of its immutable URL)")
+    first_feature_id: int = Field(..., description="Smallest feature ID in the chunk")
+    last_feature_id: int = Field(..., description="Largest feature ID in the chunk")
+    feature_count: int = Field(..., ge=0, description="Number of features in the chunk")
+    size_bytes: int = Field(..., ge=0, description="Size of the compressed chunk body")
+    url: str = Field(..., description="Chunk URL (cacheable forever)")
+
+class ActivationManifestResponse(BaseModel):
+    """Manifest of the chunked activation store"""
+    version: str = Field(..., description="Hash of all chunk IDs (changes when any chunk changes)")
+    chunk_size: int = Field(..., description="Maximum number of features per chunk")
+    feature_count: int = Field(..., ge=0, description="Total number of features")
+    encoding: str = Field(..., description="Chunk body encoding (gzip-compressed MessagePack of ActivationExamplesResponse)")
+    chunks: List[ActivationChunkInfo] = Field(..., description="Chunks in feature_id order")
+
 class ClusterGroup(BaseModel):
     """Single cluster with its member features"""
     cluster_id: int = Field(
@@ -409,7 +497,8 @@ class ClusterGroup(BaseModel):
     )
     feature_ids: List[int] = Field(
         ...,
-        description="Feature IDs belonging to this cluster (sorted)"
+        description="Feature IDs belonging to this cluster (sorted)",
+        json_schema_extra=FEATURE_IDS
     )
 
 
@@ -421,7 +510,8 @@ class ClusterCandidatesResponse(BaseModel):
     )
     feature_to_cluster: Dict[int, int] = Field(
         ...,
-        description="Mapping of ALL feature IDs (0-16383) to their cluster IDs at this threshold"
+        description="Mapping of ALL feature IDs (0-16383) to their cluster IDs at this threshold",
+        json_schema_extra=FEATURE_ID_MAP
     )
     total_clusters: int = Field(
         ...,
@@ -446,7 +536,7 @@ class ClusterPair(BaseModel):
 class ClusterInfo(BaseModel):
     """Cluster information"""
     cluster_id: int = Field(..., description="Cluster ID")
-    feature_ids: List[int] = Field(..., description="Feature IDs in this cluster")
+    feature_ids: List[int] = Field(..., description="Feature IDs in this cluster", json_schema_extra=FEATURE_IDS)
     pair_count: int = Field(..., description="Number of pairs in this cluster")
 
 class SegmentClusterPairsResponse(BaseModel):
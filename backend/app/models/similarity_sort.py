@@ -45,6 +45,10 @@ class SimilaritySortResponse(BaseModel):
         default=[],
         description="Normalized weights used for each metric"
     )
+    result_id: Optional[str] = Field(
+        default=None,
+        description="ID of this result, usable as sort_by='similarity:<result_id>' in /api/table-data/window"
+    )
 
 
 class PairSimilaritySortRequest(BaseModel):
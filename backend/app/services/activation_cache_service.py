@@ -2,45 +2,155 @@
 Activation Cache Service - Pre-computed MessagePack cache for fast activation data loading.
 
 This service pre-computes all activation data at startup, serializes it to MessagePack,
-and compresses with gzip. This reduces loading time from ~100s to ~15-25s.
+and compresses it with gzip (plus zstd and brotli variants, see compression.py).
+This reduces loading time from ~100s to ~15-25s.
+The compressed blob and chunks are also written to the snapshot store, keyed by
+the content hash of activation_display.parquet and CACHE_SCHEMA_VERSION, and are
+memory-mapped back on the next start, so only a real data change rebuilds them.
+A rebuild runs in a worker thread; until a first cache is published the
+endpoints answer 503 with Retry-After.
+
+Besides the monolithic blob, the features (in feature_id order) are split into
+chunks of CHUNK_SIZE features, each compressed on its own and addressed by the
+hash of its content. A manifest lists the feature_id range of every chunk, so a
+client fetches only the chunks it is about to display, and since a chunk ID
+names its exact bytes, chunk URLs can be cached forever.
 """
 
+import asyncio
 import gzip
+import hashlib
 import logging
+import math
+import threading
 import time
+from collections import Counter
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Union
 
 import msgpack
 import polars as pl
 
+from .compression import Variant, precompress, variant_stats
+from .snapshot_service import fingerprint_sources, snapshot_store
+
 logger = logging.getLogger(__name__)
 
+# Snapshot section holding the compressed activation blob
+SNAPSHOT_SECTION = "activation_cache"
+
+# Bump when the blob or chunk layout changes (older snapshots are then rebuilt)
+CACHE_SCHEMA_VERSION = 3
+
+# Retry-After while the first build is running and its duration is unknown
+RETRY_AFTER_SECONDS = 5
+
+# Compressed bodies are bytes when built, memory-mapped views when restored from a snapshot
+Buffer = Union[bytes, memoryview]
+
+# Features per chunk of the chunked store
+CHUNK_SIZE = 256
+
+
+@dataclass
+class ActivationBlob:
+    """One generation of the cache: the blob in every encoding plus the chunks."""
+    variants: Dict[str, Variant]
+    msgpack_size: int
+    feature_count: int
+    chunks: List["ActivationChunk"]
+    # Uncompressed MessagePack, decompressed from the gzip variant on first use
+    identity: Optional[bytes] = None
+
+
+@dataclass
+class ActivationChunk:
+    """One content-addressed chunk: gzip-compressed MessagePack of a feature_id range."""
+    chunk_id: str
+    first_feature_id: int
+    last_feature_id: int
+    feature_count: int
+    body: Buffer
+
+    def info(self) -> Dict:
+        """Manifest entry (everything but the body)."""
+        return {
+            "chunk_id": self.chunk_id,
+            "first_feature_id": self.first_feature_id,
+            "last_feature_id": self.last_feature_id,
+            "feature_count": self.feature_count,
+            "size_bytes": len(self.body)
+        }
+
+
+def pack_examples(examples: Dict[int, Dict]) -> bytes:
+    """Serialize examples in the ActivationExamplesResponse layout to MessagePack."""
+    return msgpack.packb({"examples": examples}, use_bin_type=True)
+
+
+def build_chunks(examples: Dict[int, Dict], chunk_size: int = CHUNK_SIZE) -> List[ActivationChunk]:
+    """
+    Split examples (keyed by feature_id, in feature_id order) into compressed chunks.
+
+    The chunk ID is derived from the uncompressed MessagePack payload, so it only
+    changes when the examples of the chunk change.
+    """
+    feature_ids = list(examples)
+    chunks = []
+    for start in range(0, len(feature_ids), chunk_size):
+        chunk_ids = feature_ids[start:start + chunk_size]
+        payload = pack_examples({feature_id: examples[feature_id] for feature_id in chunk_ids})
+        chunks.append(ActivationChunk(
+            chunk_id=hashlib.sha256(payload).hexdigest()[:24],
+            first_feature_id=chunk_ids[0],
+            last_feature_id=chunk_ids[-1],
+            feature_count=len(chunk_ids),
+            body=gzip.compress(payload, compresslevel=6, mtime=0)
+        ))
+    return chunks
+
 
 class ActivationCacheService:
     """
     Pre-computed cache for all activation examples.
 
-    At startup, loads all features from activation_display.parquet,
-    serializes to MessagePack, compresses with gzip, and stores in memory.
+    At startup, maps the snapshot of the current activation_display.parquet,
+    or loads all features from it, serializes to MessagePack, compresses with
+    gzip, and stores the result in memory (in the background).
     """
 
     def __init__(self, data_path: str = "../data"):
         self.data_path = Path(data_path)
         self.activation_display_file = self.data_path / "master" / "activation_display.parquet"
 
-        # Pre-computed cache (msgpack + gzip compressed)
-        self._cache: Optional[bytes] = None
+        # Pre-computed cache (msgpack + gzip compressed; all encodings in _blob)
+        self._blob: Optional[ActivationBlob] = None
+        self._cache: Optional[Buffer] = None
         self._feature_count: int = 0
         self._cache_size_bytes: int = 0
         self._ready = False
 
+        # Chunked store: chunk_id -> chunk, plus the manifest listing them in feature_id order
+        self._chunks: Dict[str, ActivationChunk] = {}
+        self._manifest: Optional[Dict] = None
+
+        # Blob requests per content encoding (encoded endpoint variant)
+        self.served_by_encoding: Counter = Counter()
+
+        # Background build state (for Retry-After); builds run one at a time
+        self._build_lock = threading.Lock()
+        self._build_thread: Optional[threading.Thread] = None
+        self._build_started_at: Optional[float] = None
+        self._last_build_seconds: Optional[float] = None
+
     async def initialize(self):
         """
-        Initialize cache by loading all activation data from parquet,
-        serializing to MessagePack, and compressing with gzip.
+        Initialize the cache at application startup.
 
-        Called at application startup.
+        A matching snapshot is memory-mapped right away. Otherwise the cache is
+        built in a daemon thread and startup does not wait for it; the endpoints
+        answer 503 with Retry-After until it is published.
         """
         start_time = time.time()
 
@@ -49,94 +159,324 @@ class ActivationCacheService:
             return
 
         try:
-            logger.info(f"[ActivationCacheService] Loading activation data from {self.activation_display_file}")
-
-            # Load all features from parquet
-            df = pl.read_parquet(
-                self.activation_display_file,
-                columns=[
-                    "feature_id",
-                    "quantile_examples",
-                    "semantic_similarity",
-                    "char_ngram_max_jaccard",
-                    "word_ngram_max_jaccard",
-                    "top_word_ngram_text",
-                    "pattern_type"
-                ]
-            )
-
-            load_time = time.time() - start_time
-            logger.info(f"[ActivationCacheService] Loaded {len(df)} features in {load_time:.2f}s")
-
-            # Convert to dictionary format expected by frontend
-            serialize_start = time.time()
-            examples_dict = {}
-
-            for row in df.iter_rows(named=True):
-                feature_id = row["feature_id"]
-                examples_dict[feature_id] = {
-                    "quantile_examples": row["quantile_examples"],
-                    "semantic_similarity": row["semantic_similarity"],
-                    "char_ngram_max_jaccard": row["char_ngram_max_jaccard"],
-                    "word_ngram_max_jaccard": row["word_ngram_max_jaccard"],
-                    "top_char_ngram_text": None,  # Skip null column
-                    "top_word_ngram_text": row["top_word_ngram_text"],
-                    "pattern_type": row["pattern_type"]
-                }
+            restored = await asyncio.to_thread(self._restore_snapshot)
+        except Exception as e:
+            logger.warning(f"[ActivationCacheService] Snapshot restore failed, rebuilding: {e}")
+            restored = None
 
-            self._feature_count = len(examples_dict)
+        if restored is not None:
+            self._publish(restored)
+            total_time = time.time() - start_time
+            logger.info(f"[ActivationCacheService] ✅ Cache ready: {self._feature_count} features, {self._cache_size_bytes / 1024 / 1024:.2f} MB in {total_time:.2f}s")
+            return
 
-            # Wrap in response format
-            data = {"examples": examples_dict}
+        # Startup stages run on short-lived event loops, so the build gets its own thread
+        logger.info("[ActivationCacheService] No snapshot for the current data, building in the background")
+        self._build_thread = threading.Thread(target=self._run_background_build, name="activation-cache-build", daemon=True)
+        self._build_thread.start()
 
-            serialize_time = time.time() - serialize_start
-            logger.info(f"[ActivationCacheService] Converted to dict in {serialize_time:.2f}s")
+    async def reload(self) -> bool:
+        """
+        Rebuild the blob from activation_display.parquet in a worker thread and
+        swap it in. The previous blob keeps being served until the swap, and is
+        kept if the rebuild fails. A build already running (e.g. the initial
+        background build, started from the previous file) is waited for first.
 
-            # Serialize to MessagePack
-            msgpack_start = time.time()
-            msgpack_data = msgpack.packb(data, use_bin_type=True)
-            msgpack_size = len(msgpack_data)
-            msgpack_time = time.time() - msgpack_start
-            logger.info(f"[ActivationCacheService] MessagePack serialized: {msgpack_size / 1024 / 1024:.2f} MB in {msgpack_time:.2f}s")
+        Returns:
+            True once the new blob is published
 
-            # Compress with gzip
-            gzip_start = time.time()
-            self._cache = gzip.compress(msgpack_data, compresslevel=6)
-            self._cache_size_bytes = len(self._cache)
-            gzip_time = time.time() - gzip_start
+        Raises:
+            FileNotFoundError: If activation_display.parquet is missing
+            Exception: If the build fails
+        """
+        if not self.activation_display_file.exists():
+            raise FileNotFoundError(f"Activation display file not found: {self.activation_display_file}")
 
-            compression_ratio = (1 - self._cache_size_bytes / msgpack_size) * 100
-            logger.info(f"[ActivationCacheService] Gzip compressed: {self._cache_size_bytes / 1024 / 1024:.2f} MB in {gzip_time:.2f}s ({compression_ratio:.1f}% reduction)")
+        if self.is_building():
+            logger.info("[ActivationCacheService] Waiting for the running build before rebuilding")
+        await asyncio.to_thread(self._run_build)
+        return True
 
-            self._ready = True
-            total_time = time.time() - start_time
-            logger.info(f"[ActivationCacheService] ✅ Cache ready: {self._feature_count} features, {self._cache_size_bytes / 1024 / 1024:.2f} MB in {total_time:.2f}s")
+    def _run_background_build(self):
+        """Thread target of the initial build; a failure leaves the cache not ready."""
+        try:
+            self._run_build()
+        except Exception as e:
+            logger.error(f"[ActivationCacheService] Background build failed, cache not ready: {e}", exc_info=True)
+
+    def _run_build(self):
+        """
+        Build the cache and publish it; the current cache is kept if this fails.
+
+        Builds are serialized, so two builds never publish concurrently.
+
+        Raises:
+            Exception: If the build fails
+        """
+        with self._build_lock:
+            self._build_started_at = time.time()
+            try:
+                blob = self._build_blob()
+            finally:
+                self._last_build_seconds = time.time() - self._build_started_at
+                self._build_started_at = None
+
+            self._publish(blob)
+        logger.info(f"[ActivationCacheService] ✅ Cache ready: {blob.feature_count} features, {self._cache_size_bytes / 1024 / 1024:.2f} MB in {self._last_build_seconds:.2f}s")
+
+    def _publish(self, blob: ActivationBlob):
+        """Swap in a new blob and chunk set (no await between assignments)."""
+        chunks = blob.chunks
+        version = hashlib.sha256("".join(chunk.chunk_id for chunk in chunks).encode("ascii")).hexdigest()[:24]
+        manifest = {
+            "version": version,
+            "chunk_size": CHUNK_SIZE,
+            "feature_count": blob.feature_count,
+            "encoding": "gzip+msgpack",
+            "chunks": [chunk.info() for chunk in chunks]
+        }
+
+        self._blob = blob
+        self._cache = blob.variants["gzip"].body
+        self._feature_count = blob.feature_count
+        self._cache_size_bytes = len(self._cache)
+        self._chunks = {chunk.chunk_id: chunk for chunk in chunks}
+        self._manifest = manifest
+        self._ready = True
+
+    def _restore_snapshot(self) -> Optional[ActivationBlob]:
+        """
+        Memory-map the blob variants and chunks of a snapshot matching the parquet content.
+
+        Returns:
+            ActivationBlob, or None on a miss
+        """
+        start_time = time.time()
+
+        snapshot = snapshot_store.load(SNAPSHOT_SECTION, [self.activation_display_file], by_content=True)
+        if snapshot is None or snapshot.metadata.get("schema_version") != CACHE_SCHEMA_VERSION:
+            return None
+
+        variants = {
+            encoding: Variant(body=snapshot.map_bytes(f"blob_{encoding}"), build_seconds=build_seconds)
+            for encoding, build_seconds in snapshot.metadata.get("encodings", {}).items()
+        }
+        chunks = self._read_chunks(snapshot.map_bytes("chunk_data"), snapshot.metadata.get("chunks", []))
+        logger.info(f"[ActivationCacheService] Blob restored from snapshot in {time.time() - start_time:.2f}s")
+        return ActivationBlob(
+            variants=variants,
+            msgpack_size=snapshot.metadata.get("msgpack_size", 0),
+            feature_count=snapshot.metadata.get("feature_count", 0),
+            chunks=chunks
+        )
+
+    def _build_blob(self) -> ActivationBlob:
+        """
+        Build (or restore from snapshot) the compressed blob variants and chunks.
+
+        Returns:
+            ActivationBlob
+        """
+        start_time = time.time()
 
+        # Taken before reading, so a file replaced mid-build is not snapshotted under its new key
+        fingerprint = fingerprint_sources([self.activation_display_file], by_content=True)
+        restored = self._restore_snapshot()
+        if restored is not None:
+            # Unchanged content (e.g. the file was only touched or copied again)
+            return restored
+
+        logger.info(f"[ActivationCacheService] Loading activation data from {self.activation_display_file}")
+
+        # Load all features from parquet (feature_id order, so chunks are contiguous ranges)
+        df = pl.read_parquet(
+            self.activation_display_file,
+            columns=[
+                "feature_id",
+                "quantile_examples",
+                "semantic_similarity",
+                "char_ngram_max_jaccard",
+                "word_ngram_max_jaccard",
+                "top_word_ngram_text",
+                "pattern_type"
+            ]
+        ).sort("feature_id")
+
+        load_time = time.time() - start_time
+        logger.info(f"[ActivationCacheService] Loaded {len(df)} features in {load_time:.2f}s")
+
+        # Convert to dictionary format expected by frontend
+        serialize_start = time.time()
+        examples_dict = {}
+
+        for row in df.iter_rows(named=True):
+            feature_id = row["feature_id"]
+            examples_dict[feature_id] = {
+                "quantile_examples": row["quantile_examples"],
+                "semantic_similarity": row["semantic_similarity"],
+                "char_ngram_max_jaccard": row["char_ngram_max_jaccard"],
+                "word_ngram_max_jaccard": row["word_ngram_max_jaccard"],
+                "top_char_ngram_text": None,  # Skip null column
+                "top_word_ngram_text": row["top_word_ngram_text"],
+                "pattern_type": row["pattern_type"]
+            }
+
+        serialize_time = time.time() - serialize_start
+        logger.info(f"[ActivationCacheService] Converted to dict in {serialize_time:.2f}s")
+
+        # Serialize to MessagePack (wrapped in response format)
+        msgpack_start = time.time()
+        msgpack_data = pack_examples(examples_dict)
+        msgpack_size = len(msgpack_data)
+        msgpack_time = time.time() - msgpack_start
+        logger.info(f"[ActivationCacheService] MessagePack serialized: {msgpack_size / 1024 / 1024:.2f} MB in {msgpack_time:.2f}s")
+
+        # Compress with every available encoding (gzip is the legacy blob)
+        variants = precompress(msgpack_data)
+        for encoding, variant in variants.items():
+            compression_ratio = (1 - len(variant.body) / msgpack_size) * 100
+            logger.info(f"[ActivationCacheService] {encoding} compressed: {len(variant.body) / 1024 / 1024:.2f} MB in {variant.build_seconds:.2f}s ({compression_ratio:.1f}% reduction)")
+
+        # Chunked store
+        chunk_start = time.time()
+        chunks = build_chunks(examples_dict)
+        logger.info(
+            f"[ActivationCacheService] Built {len(chunks)} chunks of up to {CHUNK_SIZE} features "
+            f"({sum(len(chunk.body) for chunk in chunks) / 1024 / 1024:.2f} MB) in {time.time() - chunk_start:.2f}s"
+        )
+
+        blob = ActivationBlob(
+            variants=variants,
+            msgpack_size=msgpack_size,
+            feature_count=len(examples_dict),
+            chunks=chunks
+        )
+        self._write_snapshot(blob, fingerprint)
+        return blob
+
+    def _write_snapshot(self, blob: ActivationBlob, fingerprint: List[Dict]):
+        """Persist the compressed blob variants and chunks for the next boot (best effort)."""
+        writer = snapshot_store.writer(SNAPSHOT_SECTION, [self.activation_display_file], fingerprint, by_content=True)
+        if writer is None:
+            return
+        try:
+            with writer:
+                for encoding, variant in blob.variants.items():
+                    writer.write_bytes(f"blob_{encoding}", variant.body)
+                writer.write_bytes("chunk_data", b"".join(chunk.body for chunk in blob.chunks))
+                writer.metadata["schema_version"] = CACHE_SCHEMA_VERSION
+                writer.metadata["encodings"] = {
+                    encoding: round(variant.build_seconds, 3) for encoding, variant in blob.variants.items()
+                }
+                writer.metadata["msgpack_size"] = blob.msgpack_size
+                writer.metadata["feature_count"] = blob.feature_count
+                writer.metadata["chunks"] = [chunk.info() for chunk in blob.chunks]
         except Exception as e:
-            logger.error(f"[ActivationCacheService] Failed to initialize cache: {e}", exc_info=True)
-            self._ready = False
+            logger.warning(f"[ActivationCacheService] Failed to write snapshot: {e}")
+
+    @staticmethod
+    def _read_chunks(data: Buffer, infos: List[Dict]) -> List[ActivationChunk]:
+        """Split the concatenated chunk bodies of a snapshot using their manifest entries."""
+        chunks = []
+        offset = 0
+        for info in infos:
+            size = info["size_bytes"]
+            chunks.append(ActivationChunk(
+                chunk_id=info["chunk_id"],
+                first_feature_id=info["first_feature_id"],
+                last_feature_id=info["last_feature_id"],
+                feature_count=info["feature_count"],
+                body=data[offset:offset + size]
+            ))
+            offset += size
+        return chunks
 
     def is_ready(self) -> bool:
         """Check if cache is ready."""
         return self._ready and self._cache is not None
 
-    def get_cached_blob(self) -> Optional[bytes]:
+    def is_building(self) -> bool:
+        """Check if a build is running in the background."""
+        return self._build_started_at is not None
+
+    def retry_after(self) -> int:
+        """
+        Seconds a client should wait before retrying while the cache is not ready.
+
+        Estimated from the duration of the previous build when known.
+        """
+        if self._build_started_at is None or self._last_build_seconds is None:
+            return RETRY_AFTER_SECONDS
+        remaining = self._last_build_seconds - (time.time() - self._build_started_at)
+        return max(1, math.ceil(remaining))
+
+    def get_cached_blob(self) -> Optional[Buffer]:
         """
         Get the pre-computed compressed blob.
 
         Returns:
-            Gzip-compressed MessagePack data, or None if not ready.
+            Gzip-compressed MessagePack data (a read-only view of the memory-mapped
+            snapshot when restored from one), or None if not ready.
         """
         if not self.is_ready():
             return None
         return self._cache
 
+    def encodings(self) -> List[str]:
+        """Content encodings the blob is precompressed in."""
+        blob = self._blob
+        return list(blob.variants) if blob is not None else []
+
+    def get_encoded_blob(self, encoding: Optional[str]) -> Optional[Buffer]:
+        """
+        Get the MessagePack blob in one encoding.
+
+        Args:
+            encoding: One of encodings(), or None for the uncompressed MessagePack
+                (decompressed from the gzip variant once per generation)
+
+        Returns:
+            Encoded body (possibly a view of the memory-mapped snapshot), or None if not ready
+        """
+        blob = self._blob
+        if blob is None:
+            return None
+        self.served_by_encoding[encoding or "identity"] += 1
+        if encoding is None:
+            if blob.identity is None:
+                blob.identity = gzip.decompress(blob.variants["gzip"].body)
+            return blob.identity
+        return blob.variants[encoding].body
+
+    def get_manifest(self) -> Optional[Dict]:
+        """
+        Get the manifest of the chunked store.
+
+        Returns:
+            Dict with version, chunk_size, feature_count, encoding and the chunk
+            entries in feature_id order, or None if not ready.
+        """
+        if not self.is_ready():
+            return None
+        return self._manifest
+
+    def get_chunk(self, chunk_id: str) -> Optional[ActivationChunk]:
+        """Get a chunk of the current generation by its content ID (None if unknown)."""
+        return self._chunks.get(chunk_id)
+
     def get_stats(self) -> dict:
         """Get cache statistics."""
+        chunks = self._chunks
         return {
             "ready": self._ready,
             "feature_count": self._feature_count,
-            "cache_size_mb": self._cache_size_bytes / 1024 / 1024 if self._cache_size_bytes else 0
+            "cache_size_mb": self._cache_size_bytes / 1024 / 1024 if self._cache_size_bytes else 0,
+            "building": self.is_building(),
+            "last_build_seconds": round(self._last_build_seconds, 3) if self._last_build_seconds is not None else None,
+            "encodings": variant_stats(self._blob.variants, self._blob.msgpack_size) if self._blob else {},
+            "served_by_encoding": dict(self.served_by_encoding),
+            "chunk_count": len(chunks),
+            "chunks_size_mb": sum(len(chunk.body) for chunk in chunks.values()) / 1024 / 1024
         }
 
 
@@ -5,19 +5,26 @@ Loads and caches alignment data from explanation_alignment.parquet.
 Returns semantically aligned phrases with similarity >= 0.7.
 """
 
+import asyncio
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 from collections import defaultdict
 
 import polars as pl
 
+from .snapshot_service import snapshot_store, fingerprint_sources
+
 if TYPE_CHECKING:
     from .data_service import DataService
+    from .snapshot_service import Snapshot
 
 logger = logging.getLogger(__name__)
 
+# Snapshot section holding the processed semantic segment map
+SNAPSHOT_SECTION = "alignment"
+
 
 class HighlightSegment:
     """
@@ -105,13 +112,7 @@ class AlignmentService:
             True if initialization successful, False otherwise
         """
         try:
-            logger.info("Loading semantic alignment data from parquet...")
-
-            # Load semantic alignment from parquet
-            alignment_df = self._load_alignment_file(self.alignment_file)
-
-            # Process semantic highlights (filter to similarity >= 0.7)
-            self._process_semantic_alignment(alignment_df)
+            self._load_semantic_state()
 
             self.is_ready = True
             logger.info(
@@ -125,6 +126,58 @@ class AlignmentService:
             self.is_ready = False
             return False
 
+    async def reload(self) -> bool:
+        """
+        Rebuild the segment map from the alignment parquet and swap it in.
+
+        The new map is built in a worker thread on a fresh instance; the current
+        one keeps serving until the swap and is kept if the rebuild fails.
+
+        Returns:
+            True once the new segment map is published
+
+        Raises:
+            Exception: If the rebuild fails (the current segments are kept)
+        """
+        fresh = AlignmentService(data_path=str(self.data_path), data_service=self.data_service)
+        try:
+            await asyncio.to_thread(fresh._load_semantic_state)
+        except Exception as e:
+            logger.error(f"Failed to reload alignment data, keeping current segments: {e}")
+            raise
+
+        self._semantic_cache = fresh._semantic_cache
+        self.semantic_stats = fresh.semantic_stats
+        # Reconstructed segments were derived from the old segment map
+        self._reconstructed_cache = {}
+        self.is_ready = True
+        logger.info(f"Alignment service reloaded: {len(self._semantic_cache)} feature-explainer combinations cached")
+        return True
+
+    def invalidate_text_caches(self):
+        """Drop caches derived from explanation texts (call after features.parquet reloads)."""
+        self._text_cache = {}
+        self._reconstructed_cache = {}
+
+    def _load_semantic_state(self):
+        """Fill the segment map from the snapshot store, or from parquet on a miss."""
+        # Taken before reading, so a file replaced mid-build is not snapshotted under its new key
+        fingerprint = fingerprint_sources([self.alignment_file])
+        snapshot = snapshot_store.load(SNAPSHOT_SECTION, [self.alignment_file])
+        if snapshot is not None:
+            # Restore the processed segment map from the on-disk snapshot
+            self._load_segment_snapshot(snapshot)
+            return
+
+        logger.info("Loading semantic alignment data from parquet...")
+
+        # Load semantic alignment from parquet
+        alignment_df = self._load_alignment_file(self.alignment_file)
+
+        # Process semantic highlights (filter to similarity >= 0.7)
+        self._process_semantic_alignment(alignment_df)
+        self._write_segment_snapshot(fingerprint)
+
     def _load_alignment_file(self, file_path: Path) -> pl.DataFrame:
         """
         Load alignment data from parquet file.
@@ -274,6 +327,59 @@ class AlignmentService:
 
         return segment_map
 
+    def _write_segment_snapshot(self, fingerprint: List[Dict[str, Any]]):
+        """
+        Persist the processed segment map as a flat Arrow frame (best effort).
+
+        One row per aligned phrase, in segment order, so the map can be restored
+        without re-walking the nested aligned_groups structure.
+        """
+        writer = snapshot_store.writer(SNAPSHOT_SECTION, [self.alignment_file], fingerprint)
+        if writer is None:
+            return
+
+        columns = {
+            "feature_id": [], "explainer_name": [], "text": [],
+            "similarity": [], "group_id": [], "chunk_index": []
+        }
+        for (feature_id, explainer_name), segments in self._semantic_cache.items():
+            for segment in segments:
+                columns["feature_id"].append(feature_id)
+                columns["explainer_name"].append(explainer_name)
+                columns["text"].append(segment.text)
+                columns["similarity"].append(segment.metadata.get("similarity"))
+                columns["group_id"].append(segment.metadata.get("group_id"))
+                columns["chunk_index"].append(segment.metadata.get("chunk_index"))
+
+        try:
+            with writer:
+                writer.write_frame("segments", pl.DataFrame(columns, schema={
+                    "feature_id": pl.Int64, "explainer_name": pl.Utf8, "text": pl.Utf8,
+                    "similarity": pl.Float64, "group_id": pl.Int64, "chunk_index": pl.Int64
+                }))
+                writer.metadata["semantic_stats"] = self.semantic_stats
+        except Exception as e:
+            logger.warning(f"Failed to write alignment snapshot: {e}")
+
+    def _load_segment_snapshot(self, snapshot: "Snapshot"):
+        """Restore _semantic_cache and semantic_stats from a snapshot."""
+        segments_df = snapshot.read_frame("segments")
+        for feature_id, explainer_name, text, similarity, group_id, chunk_index in segments_df.iter_rows():
+            self._semantic_cache.setdefault((feature_id, explainer_name), []).append(HighlightSegment(
+                text=text,
+                highlight=True,
+                color=None,
+                style="bold",
+                metadata={
+                    "match_type": "semantic",
+                    "similarity": similarity,
+                    "group_id": group_id,
+                    "chunk_index": chunk_index
+                }
+            ))
+        self.semantic_stats = snapshot.metadata.get("semantic_stats", {})
+        logger.info(f"Restored {len(self._semantic_cache)} feature-explainer combinations from snapshot")
+
     def _reconstruct_full_segments(
         self,
         full_text: str,
@@ -385,6 +491,17 @@ class AlignmentService:
         if not feature_ids or not explainer_names:
             return
 
+        # Explanation texts are served from the feature store's primary-key index in O(1),
+        # so Level 2 misses are already cheap; only fetch pairs not seen before instead of
+        # rebuilding the full text dict on every table request.
+        feature_ids = [
+            fid for fid in feature_ids
+            if any((fid, name) not in self._text_cache for name in explainer_names)
+        ]
+        if not feature_ids:
+            logger.debug("All explanation texts already cached, skipping preload")
+            return
+
         try:
             # Batch fetch all explanation texts in single query
             batch_texts = self.data_service.get_explanation_texts_batch(
@@ -6,6 +6,8 @@ from typing import Tuple
 from dataclasses import dataclass
 import logging
 
+from .lazy_imports import GaussianMixture
+
 logger = logging.getLogger(__name__)
 
 
@@ -90,7 +92,6 @@ class BimodalityService:
             Tuple of (bic_k1, bic_k2, components) where components are sorted by mean (ascending)
         """
         try:
-            from sklearn.mixture import GaussianMixture
             X = values.reshape(-1, 1)
             gmm1 = GaussianMixture(n_components=1, random_state=42).fit(X)
             gmm2 = GaussianMixture(n_components=2, random_state=42).fit(X)
@@ -0,0 +1,167 @@
+"""
+Precompressed variants of cached response bodies (gzip, zstd, brotli).
+
+Cached artifacts (the table blob, the activation blob) are compressed once per
+encoding when they are built, and each request gets the best variant the client
+accepts: either named explicitly (encoding query parameter) or negotiated from
+the Accept-Encoding header. Among encodings the client accepts equally, zstd is
+preferred (fastest to decode), then brotli, then gzip.
+
+zstd and brotli need the zstandard and brotli packages. An encoding whose
+package is not installed is skipped, and gzip is always available.
+"""
+
+import gzip
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+IDENTITY = "identity"
+
+# Compression levels (build-time cost vs size; decoding speed barely depends on them)
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 15
+BROTLI_QUALITY = 9
+
+# Server preference among encodings the client accepts with the same q-value
+PREFERENCE = ("zstd", "br", "gzip")
+
+
+def _compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    """Compressor per encoding name, for the packages that are installed."""
+    compressors = {"gzip": lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)}
+    if zstandard is not None:
+        compressors["zstd"] = lambda data: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if brotli is not None:
+        compressors["br"] = lambda data: brotli.compress(data, quality=BROTLI_QUALITY)
+    return compressors
+
+
+COMPRESSORS = _compressors()
+
+# Encodings precomputed for every cached artifact, in preference order
+AVAILABLE_ENCODINGS = tuple(encoding for encoding in PREFERENCE if encoding in COMPRESSORS)
+
+# Short names used in entity tags of the variants
+ETAG_SUFFIXES = {"gzip": "gz", "zstd": "zst", "br": "br"}
+
+
+@dataclass
+class Variant:
+    """One compressed representation of a cached body."""
+    body: Union[bytes, memoryview]  # a read-only view when memory-mapped
+    build_seconds: float
+
+
+def precompress(data: bytes, encodings: Iterable[str] = AVAILABLE_ENCODINGS) -> Dict[str, Variant]:
+    """
+    Compress a body with every available encoding.
+
+    Args:
+        data: Uncompressed body
+        encodings: Encodings to build (unavailable ones are skipped)
+
+    Returns:
+        Mapping of encoding name -> Variant, in preference order
+    """
+    variants = {}
+    for encoding in encodings:
+        compress = COMPRESSORS.get(encoding)
+        if compress is None:
+            continue
+        start_time = time.perf_counter()
+        body = compress(data)
+        variants[encoding] = Variant(body=body, build_seconds=time.perf_counter() - start_time)
+    return variants
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """
+    Parse an Accept-Encoding header into encoding -> q-value.
+
+    Returns:
+        Lower-cased codings with their q-value (1.0 if not given)
+    """
+    accepted = {}
+    for item in (header or "").split(","):
+        parts = [part.strip() for part in item.split(";")]
+        if not parts[0]:
+            continue
+        quality = 1.0
+        for parameter in parts[1:]:
+            if parameter.lower().startswith("q="):
+                try:
+                    quality = float(parameter[2:])
+                except ValueError:
+                    quality = 0.0
+        accepted[parts[0].lower()] = quality
+    return accepted
+
+
+def negotiate(
+    accept_encoding: Optional[str],
+    available: Iterable[str],
+    requested: Optional[str] = None
+) -> Optional[str]:
+    """
+    Pick the encoding of a response.
+
+    Args:
+        accept_encoding: Accept-Encoding request header
+        available: Encodings the artifact has variants for
+        requested: Explicit encoding (query parameter); overrides the header
+
+    Returns:
+        Encoding name, or None for the uncompressed body
+
+    Raises:
+        ValueError: If requested names an encoding that is not available
+    """
+    available = list(available)
+    if requested is not None:
+        requested = requested.lower()
+        if requested == IDENTITY:
+            return None
+        if requested not in available:
+            raise ValueError(
+                f"Unsupported encoding '{requested}'. Available: {', '.join(available + [IDENTITY])}"
+            )
+        return requested
+
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in PREFERENCE:
+        if encoding not in available:
+            continue
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def variant_stats(variants: Dict[str, Variant], identity_size: Optional[int] = None) -> Dict[str, Dict]:
+    """Size and build time of each variant (and its ratio to the uncompressed size)."""
+    stats = {}
+    for encoding, variant in variants.items():
+        entry = {
+            "size_mb": len(variant.body) / 1024 / 1024,
+            "build_seconds": round(variant.build_seconds, 3)
+        }
+        if identity_size:
+            entry["ratio"] = round(len(variant.body) / identity_size, 4)
+        stats[encoding] = entry
+    return stats
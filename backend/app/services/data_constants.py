@@ -30,6 +30,7 @@ COL_EXPLANATION_TEXT = "explanation_text"
 COL_FEATURE_SPLITTING = "feature_splitting"  # Legacy - removed from new parquet
 COL_DECODER_SIMILARITY = "decoder_similarity"
 COL_DECODER_SIMILARITY_MERGE_THRESHOLD = "decoder_similarity_merge_threshold"
+COL_DECODER_SIMILARITY_MAX = "decoder_similarity_max"  # Precomputed max cosine_similarity of the decoder_similarity list
 COL_SEMSIM_MEAN = "semsim_mean"
 COL_SEMSIM_MAX = "semsim_max"
 COL_SCORE_FUZZ = "score_fuzz"
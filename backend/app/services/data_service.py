@@ -6,8 +6,9 @@ filtering, and visualization data generation for the SAE feature analysis projec
 """
 
 import polars as pl
+import asyncio
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 
 # Enable Polars string cache for categorical operations
@@ -18,9 +19,15 @@ from ..models.responses import (
 )
 from ..models.common import Filters
 from .data_constants import *
+from .feature_store import FeatureStore
+from .metric_index import MetricIndex
+from .snapshot_service import snapshot_store, fingerprint_sources, snapshot_key
 
 logger = logging.getLogger(__name__)
 
+# Snapshot section holding the flat feature table and filter options
+SNAPSHOT_SECTION = "feature_store"
+
 
 class DataService:
     """High-performance data service using Polars for Parquet operations."""
@@ -39,7 +46,13 @@ class DataService:
 
         # Cache for frequently accessed data
         self._filter_options_cache: Optional[Dict[str, List[str]]] = None
+        # Token identifying the current data generation (changes on every reload
+        # of features.parquet); caches derived from the table key on it
+        self.dataset_version: Optional[str] = None
+        # Materialized flat feature table; _df_lazy is a lazy view over it
+        self._store: Optional[FeatureStore] = None
         self._df_lazy: Optional[pl.LazyFrame] = None
+        self._metric_index: Optional[MetricIndex] = None
         self._activation_examples_lazy: Optional[pl.LazyFrame] = None
         self._activation_similarity_lazy: Optional[pl.LazyFrame] = None
         self._activation_display_lazy: Optional[pl.LazyFrame] = None
@@ -48,62 +61,173 @@ class DataService:
         self._ready = False
 
     async def initialize(self):
-        """Initialize the data service with lazy loading."""
+        """Initialize the data service (materialized feature table + lazy auxiliary files)."""
         try:
             if not self.master_file.exists():
                 raise FileNotFoundError(
                     f"Master parquet file not found: {self.master_file}"
                 )
 
-            self._df_lazy = pl.scan_parquet(self.master_file)
+            # Materialized mode: decode, explode and flatten features.parquet ONCE.
+            # Every consumer of _df_lazy then plans over in-memory columns instead of
+            # re-reading the parquet file and re-running the schema transformation.
+            self._swap_generation(*self._load_generation())
 
-            # Transform nested schema to flat schema expected by backend
-            self._df_lazy = self._transform_to_flat_schema(self._df_lazy)
+            self._scan_auxiliary_files()
 
-            # NEW: Load activation data files (lazy scan for performance)
-            # Prioritize optimized activation_display file if it exists
-            if self.activation_display_file.exists():
-                self._activation_display_lazy = pl.scan_parquet(self.activation_display_file)
-                logger.info(f"Optimized activation display loaded: {self.activation_display_file}")
-            else:
-                logger.warning(f"Optimized activation display file not found, will use legacy files: {self.activation_display_file}")
-                # Fallback to legacy files
-                if self.activation_examples_file.exists():
-                    self._activation_examples_lazy = pl.scan_parquet(self.activation_examples_file)
-                    logger.info(f"Activation examples loaded: {self.activation_examples_file}")
-                else:
-                    logger.warning(f"Activation examples file not found: {self.activation_examples_file}")
-
-                if self.activation_similarity_file.exists():
-                    self._activation_similarity_lazy = pl.scan_parquet(self.activation_similarity_file)
-                    logger.info(f"Activation similarity loaded: {self.activation_similarity_file}")
-                else:
-                    logger.warning(f"Activation similarity file not found: {self.activation_similarity_file}")
-
-            # NEW: Load inter-feature activation similarity
-            if self.interfeature_similarity_file.exists():
-                self._interfeature_similarity_lazy = pl.scan_parquet(self.interfeature_similarity_file)
-                logger.info(f"Inter-feature similarity loaded: {self.interfeature_similarity_file}")
+            self._ready = True
+            logger.info(f"DataService initialized with {self.master_file}")
+
+        except Exception as e:
+            logger.error(f"Failed to initialize DataService: {e}")
+            raise
+
+    def _scan_auxiliary_files(self):
+        """Open lazy scans over the auxiliary parquet files (activation, inter-feature, barycentric)."""
+        self._activation_examples_lazy = None
+        self._activation_similarity_lazy = None
+        self._activation_display_lazy = None
+        self._interfeature_similarity_lazy = None
+        self._barycentric_lazy = None
+
+        # NEW: Load activation data files (lazy scan for performance)
+        # Prioritize optimized activation_display file if it exists
+        if self.activation_display_file.exists():
+            self._activation_display_lazy = pl.scan_parquet(self.activation_display_file)
+            logger.info(f"Optimized activation display loaded: {self.activation_display_file}")
+        else:
+            logger.warning(f"Optimized activation display file not found, will use legacy files: {self.activation_display_file}")
+            # Fallback to legacy files
+            if self.activation_examples_file.exists():
+                self._activation_examples_lazy = pl.scan_parquet(self.activation_examples_file)
+                logger.info(f"Activation examples loaded: {self.activation_examples_file}")
             else:
-                logger.warning(f"Inter-feature similarity file not found: {self.interfeature_similarity_file}")
+                logger.warning(f"Activation examples file not found: {self.activation_examples_file}")
 
-            # Load barycentric positions (pre-computed 2D projections)
-            if self.barycentric_file.exists():
-                self._barycentric_lazy = pl.scan_parquet(self.barycentric_file)
-                logger.info(f"Barycentric positions loaded: {self.barycentric_file}")
+            if self.activation_similarity_file.exists():
+                self._activation_similarity_lazy = pl.scan_parquet(self.activation_similarity_file)
+                logger.info(f"Activation similarity loaded: {self.activation_similarity_file}")
             else:
-                logger.warning(f"Barycentric positions file not found: {self.barycentric_file}")
+                logger.warning(f"Activation similarity file not found: {self.activation_similarity_file}")
 
-            await self._cache_filter_options()
-            self._ready = True
-            logger.info(f"DataService initialized with {self.master_file}")
+        # NEW: Load inter-feature activation similarity
+        if self.interfeature_similarity_file.exists():
+            self._interfeature_similarity_lazy = pl.scan_parquet(self.interfeature_similarity_file)
+            logger.info(f"Inter-feature similarity loaded: {self.interfeature_similarity_file}")
+        else:
+            logger.warning(f"Inter-feature similarity file not found: {self.interfeature_similarity_file}")
 
+        # Load barycentric positions (pre-computed 2D projections)
+        if self.barycentric_file.exists():
+            self._barycentric_lazy = pl.scan_parquet(self.barycentric_file)
+            logger.info(f"Barycentric positions loaded: {self.barycentric_file}")
+        else:
+            logger.warning(f"Barycentric positions file not found: {self.barycentric_file}")
+
+    def source_files(self) -> List[Path]:
+        """Parquet files the data generation (and its version token) is derived from."""
+        return [
+            self.master_file,
+            self.activation_display_file,
+            self.activation_examples_file,
+            self.activation_similarity_file,
+            self.interfeature_similarity_file,
+            self.barycentric_file
+        ]
+
+    def _compute_dataset_version(self) -> str:
+        return snapshot_key(fingerprint_sources(self.source_files()))
+
+    async def reload_auxiliary(self):
+        """
+        Re-open the auxiliary scans and bump the dataset version token.
+
+        The auxiliary files are scanned lazily, so queries already read the new
+        file contents; this picks up files that appeared or disappeared and makes
+        caches keyed on the version token miss.
+        """
+        self._scan_auxiliary_files()
+        previous_version = self.dataset_version
+        self.dataset_version = self._compute_dataset_version()
+        logger.info(f"DataService auxiliary files reloaded: dataset version {previous_version} -> {self.dataset_version}")
+
+    def _load_generation(self) -> Tuple[FeatureStore, Dict[str, List[str]], str]:
+        """
+        Build one data generation: feature store, filter options and version token.
+
+        The flat table and filter options are snapshotted as Arrow IPC and
+        memory-mapped back while features.parquet is unchanged. Runs synchronously
+        (no shared state is touched), so reloads can call it from a worker thread.
+
+        Returns:
+            Tuple of (store, filter_options, dataset_version)
+        """
+        dataset_version = self._compute_dataset_version()
+
+        # Taken before reading, so a file replaced mid-build is not snapshotted under its new key
+        fingerprint = fingerprint_sources([self.master_file])
+        snapshot = snapshot_store.load(SNAPSHOT_SECTION, [self.master_file])
+        if snapshot is not None:
+            store = FeatureStore(snapshot.read_frame("features"), presorted=True)
+            return store, snapshot.read_json("filter_options"), dataset_version
+
+        store = FeatureStore.from_lazy(
+            self._transform_to_flat_schema(pl.scan_parquet(self.master_file))
+        )
+        filter_options = self._compute_filter_options(store)
+        self._write_snapshot(store, filter_options, fingerprint)
+        return store, filter_options, dataset_version
+
+    def _swap_generation(self, store: FeatureStore, filter_options: Dict[str, List[str]], dataset_version: str):
+        """
+        Publish a generation. Plain attribute assignments with no await in between,
+        so requests see either the old or the new generation, never a mix; requests
+        that already hold the old store finish on it.
+        """
+        self._store = store
+        self._df_lazy = store.lazy()
+        self._filter_options_cache = filter_options
+        self.dataset_version = dataset_version
+
+    async def reload(self) -> bool:
+        """
+        Rebuild the feature table from features.parquet and swap it in atomically.
+
+        The new generation is built in a worker thread while the current one keeps
+        serving requests.
+
+        Returns:
+            True once the new generation is published
+
+        Raises:
+            Exception: If the rebuild fails (the current generation is kept)
+        """
+        try:
+            generation = await asyncio.to_thread(self._load_generation)
         except Exception as e:
-            logger.error(f"Failed to initialize DataService: {e}")
+            logger.error(f"Failed to reload DataService, keeping current generation: {e}")
             raise
 
+        previous_version = self.dataset_version
+        self._swap_generation(*generation)
+        logger.info(f"DataService reloaded: dataset version {previous_version} -> {self.dataset_version}")
+        return True
+
+    def _write_snapshot(self, store: FeatureStore, filter_options: Dict[str, List[str]], fingerprint: List[Dict[str, Any]]):
+        """Persist the flat feature table and filter options (best effort)."""
+        writer = snapshot_store.writer(SNAPSHOT_SECTION, [self.master_file], fingerprint)
+        if writer is None:
+            return
+        try:
+            with writer:
+                writer.write_frame("features", store.df)
+                writer.write_json("filter_options", filter_options)
+        except Exception as e:
+            logger.warning(f"Failed to write feature store snapshot: {e}")
+
     async def cleanup(self):
         """Clean up resources."""
+        self._store = None
         self._df_lazy = None
         self._filter_options_cache = None
         self._ready = False
@@ -112,6 +236,77 @@ class DataService:
         """Check if the service is ready for queries."""
         return self._ready and self._df_lazy is not None
 
+    def get_feature_store(self) -> FeatureStore:
+        """Return the materialized feature store (raises if not initialized)."""
+        if self._store is None:
+            raise RuntimeError("DataService not initialized")
+        return self._store
+
+    def get_metric_index(self) -> MetricIndex:
+        """
+        Presorted metric index of the current feature store (built once per generation).
+
+        Returns:
+            MetricIndex bound to the current store
+        """
+        store = self.get_feature_store()
+        index = self._metric_index
+        if index is None or index.store is not store:
+            index = MetricIndex(store)
+            self._metric_index = index
+        return index
+
+    def resolve_aggregation_column(self, column: str) -> str:
+        """
+        Map an aggregation-view column name to the store column holding its values.
+
+        The aggregation view exposes decoder_similarity_max under the
+        decoder_similarity name; every other column maps to itself.
+        """
+        if column == COL_DECODER_SIMILARITY and COL_DECODER_SIMILARITY_MAX in self.get_feature_store().columns:
+            return COL_DECODER_SIMILARITY_MAX
+        return column
+
+    def get_filtered_lazy(self, filters: Optional[Filters] = None) -> pl.LazyFrame:
+        """
+        Lazy view of the feature store restricted to the rows matching filters.
+
+        The row selection comes from the store's filter cache, so repeated requests
+        with the same Filters skip predicate evaluation entirely.
+
+        Args:
+            filters: Filter criteria (None selects every row)
+
+        Returns:
+            LazyFrame over the selected rows
+        """
+        return self.get_feature_store().filtered(filters).lazy()
+
+    def get_aggregation_lazy(self, filters: Optional[Filters] = None) -> pl.LazyFrame:
+        """
+        Lazy view of the feature store for numeric aggregation (histograms, grouping).
+
+        Shares the materialized columns with _df_lazy; drops explanation_text and,
+        when decoder_similarity is the aggregation metric, exposes the precomputed
+        decoder_similarity_max float under the decoder_similarity name.
+
+        Args:
+            filters: Optional filter criteria, resolved through the filter cache
+
+        Returns:
+            LazyFrame over the shared feature store
+        """
+        store = self.get_feature_store()
+        columns = [col for col in store.columns if col != COL_EXPLANATION_TEXT]
+        df_lazy = store.filtered(filters, columns).lazy()
+
+        if DECODER_METRIC_FOR_AGGREGATION == COL_DECODER_SIMILARITY and COL_DECODER_SIMILARITY_MAX in df_lazy.columns:
+            df_lazy = df_lazy.with_columns(
+                pl.col(COL_DECODER_SIMILARITY_MAX).alias(COL_DECODER_SIMILARITY)
+            )
+
+        return df_lazy
+
     def _transform_to_flat_schema(self, df_lazy: pl.LazyFrame) -> pl.LazyFrame:
         """
         Transform nested features.parquet schema to flat schema expected by backend.
@@ -124,9 +319,10 @@ class DataService:
         Output schema:
             - llm_scorer: extracted from scores.scorer
             - score_fuzz, score_simulation, score_detection, score_embedding: extracted from scores
-            - decoder_similarity: kept as List(Struct) for table display (transformed to float in histogram/grouping services)
-            - semsim_mean: mean cosine_similarity from semantic_similarity (calculated on-the-fly)
-            - semsim_max: max cosine_similarity from semantic_similarity (calculated on-the-fly)
+            - decoder_similarity: kept as List(Struct) for table display
+            - decoder_similarity_max: max cosine_similarity from decoder_similarity (numeric form for histogram/grouping)
+            - semsim_mean: mean cosine_similarity from semantic_similarity (computed once at materialization)
+            - semsim_max: max cosine_similarity from semantic_similarity (computed once at materialization)
             - details_path: null (not in new parquet)
         """
         logger.info("Transforming nested schema to flat schema...")
@@ -149,8 +345,15 @@ class DataService:
             .alias("quality_score")
         ])
 
-        # Keep decoder_similarity as List(Struct) for table display
-        # Individual services (histogram, feature_group) will transform to float as needed
+        # Keep decoder_similarity as List(Struct) for table display, and precompute its
+        # max cosine_similarity once so histogram/grouping services can use it as a float
+        if COL_DECODER_SIMILARITY in df_lazy.columns:
+            df_lazy = df_lazy.with_columns([
+                pl.col(COL_DECODER_SIMILARITY)
+                  .list.eval(pl.element().struct.field("cosine_similarity"))
+                  .list.max()
+                  .alias(COL_DECODER_SIMILARITY_MAX)
+            ])
 
         # Calculate semsim_mean and semsim_max from nested semantic_similarity
         # semantic_similarity is List(Struct([explainer, cosine_similarity]))
@@ -167,7 +370,7 @@ class DataService:
 
         # Add details_path column as null (not in new parquet)
         df_lazy = df_lazy.with_columns([
-            pl.lit(None).alias(COL_DETAILS_PATH)
+            pl.lit(None, dtype=pl.Utf8).alias(COL_DETAILS_PATH)
         ])
 
         # Drop only scores, keep explanation_text and decoder_similarity
@@ -176,28 +379,44 @@ class DataService:
         logger.info("Schema transformation complete")
         return df_lazy
 
-    async def _cache_filter_options(self):
-        """Pre-compute and cache filter options for performance."""
-        if self._df_lazy is None:
-            raise RuntimeError("DataService not initialized")
-
+    def _compute_filter_options(self, store: FeatureStore) -> Dict[str, List[str]]:
+        """Pre-compute filter options (unique values of each filter column)."""
         try:
+            # Columns are already in memory, so each unique() is a single native pass
             unique_values = {}
             for col in FILTER_COLUMNS:
-                values = (
-                    self._df_lazy.select(pl.col(col).unique().sort())
-                    .collect()
-                    .get_column(col)
-                    .to_list()
-                )
+                values = store.df.get_column(col).unique().sort().to_list()
                 unique_values[col] = [v for v in values if v is not None]
-
-            self._filter_options_cache = unique_values
+            return unique_values
 
         except Exception as e:
             logger.error(f"Failed to cache filter options: {e}")
             raise
 
+    def get_features_lazy(self, feature_ids: List[int]) -> Optional[pl.LazyFrame]:
+        """
+        Lazy view of every row of the given features, gathered through the feature index.
+
+        Used by the sort services, whose requests carry explicit feature IDs instead
+        of Filters, so no is_in scan over the whole table is needed.
+
+        Args:
+            feature_ids: Feature IDs to select
+
+        Returns:
+            LazyFrame over the selected rows, or None if the store is not initialized
+        """
+        store = self._store
+        if store is None:
+            return None
+        return store.rows_for_features(feature_ids).lazy()
+
+    def get_filter_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the filtered-selection cache."""
+        if self._store is None:
+            return {}
+        return self._store.filter_cache.get_stats()
+
     def apply_filters(self, lazy_df: pl.LazyFrame, filters: Filters) -> pl.LazyFrame:
         """Apply filters to lazy DataFrame efficiently."""
         filter_mapping = [
@@ -225,7 +444,7 @@ class DataService:
     async def get_filter_options(self) -> FilterOptionsResponse:
         """Get all available filter options."""
         if not self._filter_options_cache:
-            await self._cache_filter_options()
+            self._filter_options_cache = self._compute_filter_options(self.get_feature_store())
         return FilterOptionsResponse(**self._filter_options_cache)
 
     def get_explanation_text(self, feature_id: int, llm_explainer: str) -> Optional[str]:
@@ -244,17 +463,14 @@ class DataService:
             return None
 
         try:
-            # Filter for specific feature and explainer
-            result = self._df_lazy.filter(
-                (pl.col(COL_FEATURE_ID) == feature_id) &
-                (pl.col(COL_LLM_EXPLAINER) == llm_explainer)
-            ).select(COL_EXPLANATION_TEXT).first().collect()
-
-            if result is None or len(result) == 0:
+            # O(1) primary-key index lookup instead of a filtered scan
+            # (offset and value read from the same generation)
+            store = self._store
+            offset = store.explainer_offset(feature_id, llm_explainer)
+            if offset is None:
                 return None
 
-            # Extract text from result
-            text = result[COL_EXPLANATION_TEXT][0]
+            text = store.get_value(offset, COL_EXPLANATION_TEXT)
             return text if text else None
 
         except Exception as e:
@@ -269,8 +485,8 @@ class DataService:
         """
         Fetch all explanation texts for given features and explainers in a single batch query.
 
-        This replaces N+1 individual queries with a single efficient Polars query,
-        providing 10-100x performance improvement for table rendering.
+        Resolves row offsets through the feature store's primary-key index and
+        gathers the text column in one vectorized take (no table scan).
 
         Args:
             feature_ids: List of feature IDs to fetch
@@ -287,23 +503,11 @@ class DataService:
             return {}
 
         try:
-            # Single batch query using Polars
-            result = self._df_lazy.filter(
-                pl.col(COL_FEATURE_ID).is_in(feature_ids) &
-                pl.col(COL_LLM_EXPLAINER).is_in(llm_explainers)
-            ).select([
-                COL_FEATURE_ID,
-                COL_LLM_EXPLAINER,
-                COL_EXPLANATION_TEXT
-            ]).collect()
+            store = self._store
+            keys, offsets = store.explainer_offsets(feature_ids, llm_explainers)
+            texts = store.take(offsets, [COL_EXPLANATION_TEXT])[COL_EXPLANATION_TEXT].to_list()
 
-            # Build lookup dictionary
-            batch_dict = {}
-            for row in result.iter_rows(named=True):
-                key = (row[COL_FEATURE_ID], row[COL_LLM_EXPLAINER])
-                text = row[COL_EXPLANATION_TEXT]
-                if text:
-                    batch_dict[key] = text
+            batch_dict = {key: text for key, text in zip(keys, texts) if text}
 
             logger.info(f"Batch loaded {len(batch_dict)} explanation texts for {len(feature_ids)} features × {len(llm_explainers)} explainers")
             return batch_dict
@@ -312,23 +516,26 @@ class DataService:
             logger.error(f"Error batch fetching explanation texts: {e}")
             return {}
 
-    def _compute_pattern_type(self, semantic_sim: float, max_jaccard: float) -> str:
+    def _compute_pattern_type(self, semantic_sim: float, char_jaccard: float, word_jaccard: float) -> str:
         """
-        Categorize activation pattern based on 0.3 threshold.
+        Categorize activation pattern based on 0.3 thresholds.
+
+        Same rule as the preprocessing that writes activation_display.parquet:
+        the pattern is lexical if either n-gram Jaccard passes the threshold.
 
         Args:
             semantic_sim: Average pairwise semantic similarity (0-1)
-            max_jaccard: Maximum Jaccard similarity across n-grams (0-1)
+            char_jaccard: Character n-gram Jaccard similarity (0-1)
+            word_jaccard: Word n-gram Jaccard similarity (0-1)
 
         Returns:
-            Pattern type: "Semantic", "Lexical", or "None"
+            Pattern type: "Semantic", "Lexical", "Both", or "None"
         """
         has_semantic = semantic_sim > 0.3
-        has_lexical = max_jaccard > 0.3
+        has_lexical = char_jaccard > 0.3 or word_jaccard > 0.3
 
         if has_semantic and has_lexical:
-            # Use higher value to determine type
-            return "Semantic" if semantic_sim > max_jaccard else "Lexical"
+            return "Both"
         elif has_semantic:
             return "Semantic"
         elif has_lexical:
@@ -336,71 +543,47 @@ class DataService:
         else:
             return "None"
 
-    def _organize_by_quantile(
-        self,
-        examples_df: pl.DataFrame,
-        quantile_boundaries: List[float]
-    ) -> List[Dict]:
+    def _organize_by_quantile(self, examples_df: pl.DataFrame) -> pl.DataFrame:
         """
-        Organize activation examples into 4 quantiles and return first from each.
+        Assign activation examples to 4 quantiles and keep the first from each.
 
-        Uses vectorized Polars operations for performance (10x faster than loops).
+        Works on the whole batch at once: every example carries the boundaries
+        of its feature (q1, q2, q3 columns), so the quantile is one right-closed
+        when/then expression, the same intervals cut() would produce.
 
         Args:
-            examples_df: DataFrame with activation examples for a feature
-            quantile_boundaries: [q1, q2, q3] boundaries for quantile splits
+            examples_df: Activation examples of many features, joined with their
+                feature's q1/q2/q3 boundaries
 
         Returns:
-            List of 4 quantile examples (one per quantile)
-        """
-        if len(examples_df) == 0:
-            return []
-
-        # Validate quantile_boundaries has 3 elements
-        if not quantile_boundaries or len(quantile_boundaries) != 3:
-            logger.warning(f"[_organize_by_quantile] Invalid quantile_boundaries: {quantile_boundaries}, expected 3 elements")
-            return []
-
-        # Add quantile label using when().then() expressions (vectorized)
-        df = examples_df.with_columns([
-            pl.when(pl.col("max_activation") <= quantile_boundaries[0])
-              .then(pl.lit(0))
-              .when(pl.col("max_activation") <= quantile_boundaries[1])
-              .then(pl.lit(1))
-              .when(pl.col("max_activation") <= quantile_boundaries[2])
-              .then(pl.lit(2))
+            One row per (feature_id, quantile_index) with max_activation_position
+            and cleaned prompt_tokens, sorted by feature_id and quantile_index
+        """
+        max_activation = pl.col("max_activation")
+        quantile = (
+            pl.when(max_activation <= pl.col("q1")).then(pl.lit(0))
+              .when(max_activation <= pl.col("q2")).then(pl.lit(1))
+              .when(max_activation <= pl.col("q3")).then(pl.lit(2))
               .otherwise(pl.lit(3))
-              .alias("quantile")
-        ])
-
-        # Take first example from each quantile
-        result = []
-        for q in range(4):
-            quantile_df = df.filter(pl.col("quantile") == q).head(1)
-            if len(quantile_df) > 0:
-                row = quantile_df.to_dicts()[0]
-                # Find max activation value and position
-                max_act = row["max_activation"]
-                max_pos = 0
-
-                # Skip if no activation data
-                if max_act is None or not row["activation_pairs"] or len(row["activation_pairs"]) == 0:
-                    continue
-
-                # Find the position with maximum activation value from pairs
-                max_pair = max(row["activation_pairs"], key=lambda p: p["activation_value"])
-                max_pos = max_pair["token_position"]
-
-                result.append({
-                    "quantile_index": q,
-                    "prompt_id": row["prompt_id"],
-                    "prompt_tokens": row["prompt_tokens"],
-                    "activation_pairs": row["activation_pairs"],
-                    "max_activation": float(max_act),
-                    "max_activation_position": int(max_pos)
-                })
-
-        return result
+        )
+        activation_values = pl.col("activation_pairs").list.eval(pl.element().struct.field("activation_value"))
+        token_positions = pl.col("activation_pairs").list.eval(pl.element().struct.field("token_position"))
+
+        return (
+            examples_df
+            .with_columns(quantile.alias("quantile_index"))
+            # First example of each quantile; skipped below if it has no activation data
+            .unique(subset=["feature_id", "quantile_index"], keep="first", maintain_order=True)
+            .filter(max_activation.is_not_null() & (pl.col("activation_pairs").list.len() > 0))
+            .with_columns([
+                # Position of the (first) largest activation value
+                token_positions.list.get(activation_values.list.arg_max()).alias("max_activation_position"),
+                max_activation.cast(pl.Float64),
+                # Strip the '▁' / '_' word-start markers like the display preprocessing
+                pl.col("prompt_tokens").list.eval(pl.element().str.strip_chars_start("_▁").str.strip_chars())
+            ])
+            .sort(["feature_id", "quantile_index"])
+        )
 
     def get_activation_examples(self, feature_ids: List[int]) -> Dict[int, Dict]:
         """
@@ -418,7 +601,10 @@ class DataService:
                 feature_id: {
                     "quantile_examples": [...],  # Pre-organized quantiles
                     "semantic_similarity": float,
-                    "max_jaccard": float,
+                    "char_ngram_max_jaccard": float,
+                    "word_ngram_max_jaccard": float,
+                    "top_char_ngram_text": str | None,
+                    "top_word_ngram_text": str | None,
                     "pattern_type": str
                 }
             }
@@ -482,90 +668,98 @@ class DataService:
             return {}
 
     def _get_activation_examples_legacy(self, feature_ids: List[int]) -> Dict[int, Dict]:
-        """Legacy path using activation_examples + activation_similarity join."""
-        logger.warning("[get_activation_examples] Using legacy path (slower, ~5 seconds)")
+        """
+        Legacy path using activation_examples + activation_similarity join.
+
+        The batch is processed in a few passes instead of one filter per feature:
+        a semi-join on the (feature_id, prompt_id) pairs sampled for display
+        selects the examples, _organize_by_quantile assigns all quantiles at once,
+        and a single group_by collects each feature's quantile examples.
+        """
+        logger.warning("[get_activation_examples] Using legacy path (slower)")
 
         if self._activation_similarity_lazy is None or self._activation_examples_lazy is None:
             logger.warning(f"[get_activation_examples] Legacy activation data not loaded")
             return {}
 
         try:
-            # Load similarity metrics (2.2 MB file, 16K rows - small and fast)
-            similarity_df = self._activation_similarity_lazy.filter(
-                pl.col("feature_id").is_in(feature_ids)
-            ).collect()
+            similarity_df = self._load_legacy_similarity(feature_ids)
 
             logger.info(f"[get_activation_examples] Requested {len(feature_ids)} features, found similarity data for {len(similarity_df)} features")
             if len(similarity_df) == 0:
                 logger.warning(f"[get_activation_examples] No similarity data found for any of the requested feature IDs: {feature_ids[:20]}")
                 return {}
 
-            # Extract sampled prompt_ids per feature (8 per feature, 2 per quantile)
-            prompt_ids_by_feature = {}
-            for row in similarity_df.iter_rows(named=True):
-                fid = row["feature_id"]
-                prompt_ids_by_feature[fid] = {
-                    "prompt_ids": row["prompt_ids_analyzed"],  # List[8]
-                    "semantic_sim": row["avg_pairwise_semantic_similarity"],
-                    "jaccard_sims": row["ngram_jaccard_similarity"],  # [2g, 3g, 4g]
-                    "quantile_boundaries": row["quantile_boundaries"]  # [q1, q2, q3]
-                }
-
-            # Batch fetch activation examples (avoids N individual queries)
-            all_prompt_ids = set()
-            for data in prompt_ids_by_feature.values():
-                all_prompt_ids.update(data["prompt_ids"])
+            # Features need [q1, q2, q3] quantile boundaries
+            similarity_df = similarity_df.filter(pl.col("quantile_boundaries").list.len() == 3)
+            if len(similarity_df) == 0:
+                logger.debug("[get_activation_examples] No features with valid quantile_boundaries")
+                return {}
 
-            logger.info(f"Fetching {len(all_prompt_ids)} activation examples")
+            # Sampled prompts per feature (8 per feature, 2 per quantile)
+            pairs = similarity_df.select(["feature_id", "prompt_ids"]).explode("prompt_ids").rename(
+                {"prompt_ids": "prompt_id"}
+            ).with_columns(pl.col("prompt_id").cast(pl.Int64))
 
             examples_df = self._activation_examples_lazy.filter(
-                pl.col("prompt_id").is_in(list(all_prompt_ids))
-            ).collect()
+                pl.col("feature_id").is_in(similarity_df["feature_id"].to_list()) &
+                pl.col("prompt_id").is_in(pairs["prompt_id"].unique().to_list())
+            ).with_columns([
+                pl.col("feature_id").cast(pl.Int64),
+                pl.col("prompt_id").cast(pl.Int64)
+            ]).join(pairs.lazy(), on=["feature_id", "prompt_id"], how="semi").collect()
 
             logger.info(f"Loaded {len(examples_df)} activation examples")
 
-            # Organize by feature_id → quantile → example
+            boundaries = similarity_df.select([
+                "feature_id",
+                pl.col("quantile_boundaries").list.get(0).alias("q1"),
+                pl.col("quantile_boundaries").list.get(1).alias("q2"),
+                pl.col("quantile_boundaries").list.get(2).alias("q3")
+            ])
+            selected = self._organize_by_quantile(examples_df.join(boundaries, on="feature_id", how="left"))
+
+            # Highlight positions of the top n-grams in each selected prompt
+            for positions in self._legacy_ngram_positions(similarity_df):
+                selected = selected.join(positions, on=["feature_id", "prompt_id"], how="left")
+            for column in ("char_ngram_positions", "word_ngram_positions"):
+                if column not in selected.columns:
+                    selected = selected.with_columns(pl.lit(None).alias(column))
+
+            quantile_examples = selected.group_by("feature_id", maintain_order=True).agg(
+                pl.struct([
+                    "quantile_index",
+                    "prompt_id",
+                    "prompt_tokens",
+                    "activation_pairs",
+                    "max_activation",
+                    "max_activation_position",
+                    "char_ngram_positions",
+                    "word_ngram_positions"
+                ]).alias("quantile_examples")
+            )
+
+            # Features without (valid) examples drop out of the inner join
             result = {}
-            for feature_id, data in prompt_ids_by_feature.items():
-                # Validate quantile_boundaries before processing
-                quantile_boundaries = data["quantile_boundaries"]
-                if not quantile_boundaries or len(quantile_boundaries) != 3:
-                    logger.debug(f"[get_activation_examples] Skipping feature {feature_id}: invalid quantile_boundaries {quantile_boundaries}")
-                    continue
-
-                # Filter examples for this feature
-                feature_examples = examples_df.filter(
-                    pl.col("feature_id") == feature_id
-                )
-
-                # Skip if no examples found
-                if len(feature_examples) == 0:
-                    logger.debug(f"[get_activation_examples] Skipping feature {feature_id}: no examples found")
-                    continue
-
-                # Group 8 prompts into 4 quantiles (2 per quantile)
-                quantile_examples = self._organize_by_quantile(
-                    feature_examples,
-                    quantile_boundaries
-                )
-
-                # Skip if no quantile examples generated
-                if not quantile_examples:
-                    logger.debug(f"[get_activation_examples] Skipping feature {feature_id}: no quantile examples generated")
-                    continue
-
-                # Compute pattern type
-                max_jaccard = max(data["jaccard_sims"]) if data["jaccard_sims"] else 0.0
-                pattern_type = self._compute_pattern_type(
-                    data["semantic_sim"],
-                    max_jaccard
-                )
-
-                result[feature_id] = {
-                    "quantile_examples": quantile_examples,
-                    "semantic_similarity": float(data["semantic_sim"]),
-                    "max_jaccard": float(max_jaccard),
-                    "pattern_type": pattern_type
+            for row in similarity_df.join(quantile_examples, on="feature_id", how="inner").iter_rows(named=True):
+                examples = row["quantile_examples"]
+                for example in examples:
+                    example["char_ngram_positions"] = example["char_ngram_positions"] or []
+                    example["word_ngram_positions"] = example["word_ngram_positions"] or []
+
+                result[row["feature_id"]] = {
+                    "quantile_examples": examples,
+                    "semantic_similarity": row["semantic_similarity"],
+                    # Dual n-gram fields (character + word)
+                    "char_ngram_max_jaccard": row["char_ngram_max_jaccard"],
+                    "word_ngram_max_jaccard": row["word_ngram_max_jaccard"],
+                    "top_char_ngram_text": row["top_char_ngram_text"],
+                    "top_word_ngram_text": row["top_word_ngram_text"],
+                    "pattern_type": self._compute_pattern_type(
+                        row["semantic_similarity"],
+                        row["char_ngram_max_jaccard"],
+                        row["word_ngram_max_jaccard"]
+                    )
                 }
 
             logger.info(f"[get_activation_examples] Successfully organized activation examples for {len(result)} features (legacy path)")
@@ -574,3 +768,95 @@ class DataService:
         except Exception as e:
             logger.error(f"[get_activation_examples] Error in legacy path: {e}", exc_info=True)
             return {}
+
+    def _load_legacy_similarity(self, feature_ids: List[int]) -> pl.DataFrame:
+        """
+        Load the similarity metrics of the requested features in one layout.
+
+        activation_example_similarity.parquet comes in two layouts: the current
+        one (prompt_ids_for_display, top char/word n-grams with their Jaccard and
+        occurrences) and an older one (prompt_ids_analyzed and a per-size token
+        n-gram Jaccard list). Older files have no character n-grams; their best
+        token n-gram Jaccard is used as the word value.
+
+        Returns:
+            DataFrame with feature_id, prompt_ids, semantic_similarity,
+            char/word_ngram_max_jaccard, top_char/word_ngram_text,
+            quantile_boundaries and, when present, the top n-gram structs
+        """
+        schema = self._activation_similarity_lazy.schema
+        has_struct = {
+            column: isinstance(schema.get(column), pl.Struct)
+            for column in ("top_char_ngram", "top_word_ngram")
+        }
+
+        if "prompt_ids_for_display" in schema:
+            prompt_ids = pl.col("prompt_ids_for_display")
+        else:
+            prompt_ids = pl.col("prompt_ids_analyzed")
+
+        if "top_word_ngram_jaccard" in schema:
+            char_jaccard = pl.col("top_char_ngram_jaccard")
+            word_jaccard = pl.col("top_word_ngram_jaccard")
+        else:
+            char_jaccard = pl.lit(None)
+            word_jaccard = pl.col("ngram_jaccard_similarity").list.max()
+
+        columns = [
+            pl.col("feature_id").cast(pl.Int64),
+            prompt_ids.alias("prompt_ids"),
+            pl.col("avg_pairwise_semantic_similarity").cast(pl.Float64).fill_null(0.0).alias("semantic_similarity"),
+            char_jaccard.cast(pl.Float64).fill_null(0.0).alias("char_ngram_max_jaccard"),
+            word_jaccard.cast(pl.Float64).fill_null(0.0).alias("word_ngram_max_jaccard"),
+            pl.col("quantile_boundaries")
+        ]
+        for column, text_column in (("top_char_ngram", "top_char_ngram_text"), ("top_word_ngram", "top_word_ngram_text")):
+            if has_struct[column]:
+                columns += [pl.col(column), pl.col(column).struct.field("ngram").alias(text_column)]
+            else:
+                columns.append(pl.lit(None, dtype=pl.Utf8).alias(text_column))
+
+        return self._activation_similarity_lazy.filter(
+            pl.col("feature_id").is_in(feature_ids)
+        ).select(columns).collect()
+
+    def _legacy_ngram_positions(self, similarity_df: pl.DataFrame) -> List[pl.DataFrame]:
+        """
+        Positions of each feature's top n-grams, per (feature_id, prompt_id).
+
+        Returns:
+            Frames with char_ngram_positions (list of {token_position, char_offset})
+            and word_ngram_positions (sorted unique start positions), for the
+            n-gram columns the similarity file has
+        """
+        frames = []
+        if "top_char_ngram" in similarity_df.columns:
+            occurrences = similarity_df.select([
+                "feature_id",
+                pl.col("top_char_ngram").struct.field("occurrences")
+            ]).explode("occurrences").unnest("occurrences")
+            frames.append(
+                occurrences.filter(pl.col("prompt_id").is_not_null()).group_by(
+                    [pl.col("feature_id"), pl.col("prompt_id").cast(pl.Int64)], maintain_order=True
+                ).agg(
+                    pl.struct([
+                        pl.col("token_position").cast(pl.Int64),
+                        pl.col("char_offset").fill_null(0).cast(pl.Int64)
+                    ]).alias("char_ngram_positions")
+                )
+            )
+        if "top_word_ngram" in similarity_df.columns:
+            occurrences = similarity_df.select([
+                "feature_id",
+                pl.col("top_word_ngram").struct.field("occurrences")
+            ]).explode("occurrences").unnest("occurrences")
+            frames.append(
+                occurrences.filter(
+                    pl.col("prompt_id").is_not_null() & pl.col("start_position").is_not_null()
+                ).group_by(
+                    [pl.col("feature_id"), pl.col("prompt_id").cast(pl.Int64)], maintain_order=True
+                ).agg(
+                    pl.col("start_position").cast(pl.Int64).unique().sort().alias("word_ngram_positions")
+                )
+            )
+        return frames
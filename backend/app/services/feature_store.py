@@ -0,0 +1,402 @@
+"""
+Materialized feature store for the flattened features.parquet schema.
+
+DataService builds the flat (one row per feature × explainer × scorer) frame
+once at startup and keeps it here as an eager columnar DataFrame. Every service
+that previously re-scanned and re-exploded the parquet file now gets a cheap
+lazy view over these in-memory columns instead.
+
+Rows are kept sorted by feature_id (stable, so the original explainer/scorer
+order within a feature is preserved), which lets the store answer per-feature
+lookups with a binary search over a compact offset index. A primary-key index
+from (feature_id, llm_explainer, llm_scorer) to row offset is built once at load
+time so record lookups never scan the table.
+
+Filtered selections are memoized in a size-bounded LRU keyed by a normalized
+Filters fingerprint, so the (sae_id, explanation_method, llm_explainer,
+llm_scorer) predicate chain is evaluated once per distinct filter combination.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+import polars as pl
+
+from .data_constants import (
+    COL_FEATURE_ID,
+    COL_SAE_ID,
+    COL_EXPLANATION_METHOD,
+    COL_LLM_EXPLAINER,
+    COL_LLM_SCORER,
+    COL_EXPLANATION_TEXT
+)
+
+# Import for type hints only (avoids circular imports)
+if TYPE_CHECKING:
+    from ..models.common import Filters
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of distinct filter selections kept in memory per store
+FILTER_CACHE_SIZE = 64
+
+FilterKey = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+def filters_fingerprint(filters: Optional["Filters"]) -> FilterKey:
+    """
+    Normalize Filters into a hashable fingerprint.
+
+    Empty and missing value lists are equivalent (no constraint), and value
+    order/duplicates do not matter.
+
+    Args:
+        filters: Filter criteria (may be None)
+
+    Returns:
+        Tuple of (column, sorted values) pairs for every active constraint
+    """
+    if filters is None:
+        return ()
+
+    filter_mapping = [
+        (COL_SAE_ID, filters.sae_id),
+        (COL_EXPLANATION_METHOD, filters.explanation_method),
+        (COL_LLM_EXPLAINER, filters.llm_explainer),
+        (COL_LLM_SCORER, filters.llm_scorer)
+    ]
+    return tuple(
+        (column, tuple(sorted(set(values))))
+        for column, values in filter_mapping
+        if values
+    )
+
+
+class FilterSelectionCache:
+    """
+    Size-bounded LRU of materialized row selections keyed by filter fingerprint.
+
+    Each entry is a boolean row mask over the store (None means "all rows").
+    Hit/miss/eviction counters are kept for diagnostics.
+    """
+
+    def __init__(self, max_size: int = FILTER_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[FilterKey, Optional[pl.Series]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: FilterKey):
+        """Return (found, mask) and refresh recency on hit."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: FilterKey, mask: Optional[pl.Series]):
+        """Insert a selection, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = mask
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+class FeatureStore:
+    """
+    Eager, in-memory columnar store for the flattened feature table.
+
+    Attributes:
+        df: The materialized flat DataFrame (sorted by feature_id)
+        feature_ids: Sorted array of unique feature IDs
+    """
+
+    def __init__(self, df: pl.DataFrame, presorted: bool = False):
+        """
+        Build the store and its feature_id index.
+
+        Args:
+            df: Flattened feature DataFrame (output of the schema transformation)
+            presorted: True if df is already a store frame (e.g. loaded from a
+                snapshot), which skips the sort and keeps memory-mapped columns as-is
+        """
+        if presorted:
+            self.df = df
+        else:
+            # Stable sort: row number as tie-breaker keeps the original order within a feature
+            self.df = (
+                df.with_row_count("__row_nr")
+                .sort([COL_FEATURE_ID, "__row_nr"])
+                .drop("__row_nr")
+                .rechunk()
+            )
+
+        # Feature index: unique feature IDs with the offset/length of their row block
+        fid_column = self.df[COL_FEATURE_ID].to_numpy()
+        self.feature_ids, self._feature_starts, self._feature_counts = np.unique(
+            fid_column, return_index=True, return_counts=True
+        )
+
+        # Primary-key index: (feature_id, llm_explainer, llm_scorer) -> row offset,
+        # plus (feature_id, llm_explainer) -> first row offset for explainer-level
+        # columns such as explanation_text (identical across scorers)
+        self._pk_index: Dict[Tuple[int, str, str], int] = {}
+        self._explainer_index: Dict[Tuple[int, str], int] = {}
+        self._build_primary_key_index()
+
+        # Explanation text lookup, built on first use and then reused for every request
+        self._explanation_texts: Optional[Dict[Tuple[int, str], str]] = None
+
+        # LRU of filtered row selections (normalized Filters fingerprint -> row mask)
+        self.filter_cache = FilterSelectionCache()
+
+        logger.info(
+            f"FeatureStore materialized: {len(self.df)} rows, "
+            f"{len(self.feature_ids)} features, "
+            f"{self.df.estimated_size('mb'):.1f} MB"
+        )
+
+    def _build_primary_key_index(self):
+        """Build the primary-key and explainer-level offset indexes in one pass."""
+        feature_ids = self.df[COL_FEATURE_ID].to_list()
+        explainers = (
+            self.df[COL_LLM_EXPLAINER].cast(pl.Utf8).to_list()
+            if COL_LLM_EXPLAINER in self.df.columns else [None] * len(feature_ids)
+        )
+        scorers = (
+            self.df[COL_LLM_SCORER].cast(pl.Utf8).to_list()
+            if COL_LLM_SCORER in self.df.columns else [None] * len(feature_ids)
+        )
+
+        for offset, key in enumerate(zip(feature_ids, explainers, scorers)):
+            self._pk_index.setdefault(key, offset)
+            self._explainer_index.setdefault(key[:2], offset)
+
+        if len(self._pk_index) != len(feature_ids):
+            logger.warning(
+                f"FeatureStore primary key is not unique: {len(feature_ids)} rows, "
+                f"{len(self._pk_index)} distinct (feature_id, llm_explainer, llm_scorer) keys"
+            )
+
+    @classmethod
+    def from_lazy(cls, df_lazy: pl.LazyFrame) -> "FeatureStore":
+        """Collect a lazy plan once and wrap the result in a store."""
+        return cls(df_lazy.collect())
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def lazy(self) -> pl.LazyFrame:
+        """Return a lazy view over the materialized columns (no re-decoding)."""
+        return self.df.lazy()
+
+    @property
+    def columns(self) -> List[str]:
+        return self.df.columns
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.df)
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_ids)
+
+    # ------------------------------------------------------------------
+    # Feature index
+    # ------------------------------------------------------------------
+
+    def feature_slice(self, feature_id: int) -> Optional[Tuple[int, int]]:
+        """
+        Locate the row block of a feature.
+
+        Args:
+            feature_id: Feature ID to look up
+
+        Returns:
+            (offset, length) of the feature's rows, or None if not present
+        """
+        pos = int(np.searchsorted(self.feature_ids, feature_id))
+        if pos >= len(self.feature_ids) or self.feature_ids[pos] != feature_id:
+            return None
+        return int(self._feature_starts[pos]), int(self._feature_counts[pos])
+
+    def get_feature_rows(self, feature_id: int) -> pl.DataFrame:
+        """Return all rows of a single feature as a zero-copy slice."""
+        located = self.feature_slice(feature_id)
+        if located is None:
+            return self.df.clear()
+        offset, length = located
+        return self.df.slice(offset, length)
+
+    # ------------------------------------------------------------------
+    # Primary-key index
+    # ------------------------------------------------------------------
+
+    def row_offset(self, feature_id: int, llm_explainer: str, llm_scorer: str) -> Optional[int]:
+        """O(1) lookup of the row offset for a (feature_id, llm_explainer, llm_scorer) record."""
+        return self._pk_index.get((feature_id, llm_explainer, llm_scorer))
+
+    def explainer_offset(self, feature_id: int, llm_explainer: str) -> Optional[int]:
+        """O(1) lookup of the first row offset for a (feature_id, llm_explainer) pair."""
+        return self._explainer_index.get((feature_id, llm_explainer))
+
+    def explainer_offsets(
+        self,
+        feature_ids: Sequence[int],
+        llm_explainers: Sequence[str]
+    ) -> Tuple[List[Tuple[int, str]], np.ndarray]:
+        """
+        Resolve row offsets for every (feature_id, llm_explainer) combination present.
+
+        Args:
+            feature_ids: Feature IDs to resolve
+            llm_explainers: Explainer names to resolve
+
+        Returns:
+            Tuple of (keys, offsets) for the combinations that exist in the store
+        """
+        keys = []
+        offsets = []
+        index = self._explainer_index
+        for fid in feature_ids:
+            for explainer in llm_explainers:
+                offset = index.get((fid, explainer))
+                if offset is not None:
+                    keys.append((fid, explainer))
+                    offsets.append(offset)
+        return keys, np.asarray(offsets, dtype=np.int64)
+
+    def take(self, offsets: Sequence[int], columns: Optional[List[str]] = None) -> pl.DataFrame:
+        """
+        Vectorized row gather by offset.
+
+        Args:
+            offsets: Row offsets (e.g. from row_offset/explainer_offsets)
+            columns: Optional subset of columns to gather
+
+        Returns:
+            DataFrame with the requested rows in offset order
+        """
+        df = self.df.select(columns) if columns else self.df
+        return df[pl.Series("offset", offsets, dtype=pl.UInt32)] if len(offsets) else df.clear()
+
+    def get_value(self, offset: int, column: str):
+        """Return a single cell by row offset."""
+        return self.df.get_column(column)[offset]
+
+    def explanation_texts(self) -> Dict[Tuple[int, str], str]:
+        """
+        Persistent (feature_id, llm_explainer) -> explanation_text lookup.
+
+        Built once per store from the explainer-level index and reused by every
+        table request instead of being rebuilt from a collected frame each time.
+        """
+        if self._explanation_texts is None:
+            keys = list(self._explainer_index.keys())
+            offsets = list(self._explainer_index.values())
+            texts = self.take(offsets, [COL_EXPLANATION_TEXT])[COL_EXPLANATION_TEXT].to_list()
+            self._explanation_texts = {
+                key: text for key, text in zip(keys, texts) if text is not None
+            }
+            logger.info(f"FeatureStore explanation lookup built: {len(self._explanation_texts)} entries")
+        return self._explanation_texts
+
+    # ------------------------------------------------------------------
+    # Filtered selections
+    # ------------------------------------------------------------------
+
+    def filter_mask(self, filters: Optional["Filters"]) -> Optional[pl.Series]:
+        """
+        Materialized row selection for a Filters object (cached).
+
+        Args:
+            filters: Filter criteria
+
+        Returns:
+            Boolean row mask, or None when the filters select every row
+        """
+        key = filters_fingerprint(filters)
+        if not key:
+            return None
+
+        found, mask = self.filter_cache.get(key)
+        if found:
+            return mask
+
+        condition = None
+        for column, values in key:
+            predicate = pl.col(column).is_in(list(values))
+            condition = predicate if condition is None else condition & predicate
+
+        mask = self.df.select(condition.alias("mask")).to_series()
+        self.filter_cache.put(key, mask)
+        return mask
+
+    def filtered(self, filters: Optional["Filters"], columns: Optional[List[str]] = None) -> pl.DataFrame:
+        """
+        Rows matching the filters (optionally projected to a column subset).
+
+        Args:
+            filters: Filter criteria
+            columns: Optional subset of columns
+
+        Returns:
+            Eager DataFrame with matching rows (feature_id order preserved)
+        """
+        df = self.df.select(columns) if columns else self.df
+        mask = self.filter_mask(filters)
+        return df if mask is None else df.filter(mask)
+
+    def rows_for_features(self, feature_ids: Sequence[int], columns: Optional[List[str]] = None) -> pl.DataFrame:
+        """
+        Gather all rows of the given features through the feature index.
+
+        Args:
+            feature_ids: Feature IDs to select (unknown IDs are ignored)
+            columns: Optional subset of columns
+
+        Returns:
+            DataFrame with the features' rows in ascending feature_id order
+        """
+        requested = np.unique(np.asarray(feature_ids, dtype=np.int64))
+        positions = np.searchsorted(self.feature_ids, requested)
+        in_bounds = positions < len(self.feature_ids)
+        positions, requested = positions[in_bounds], requested[in_bounds]
+        positions = positions[self.feature_ids[positions] == requested]
+
+        starts = self._feature_starts[positions]
+        counts = self._feature_counts[positions]
+        if len(starts) == 0:
+            df = self.df.select(columns) if columns else self.df
+            return df.clear()
+
+        # Expand (start, count) blocks into a flat offset array without a Python loop
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return self.take(offsets, columns)
@@ -6,12 +6,13 @@ weight similarities to intelligently select diverse candidate features.
 """
 
 import numpy as np
-from scipy.cluster.hierarchy import fcluster
 from pathlib import Path
 from typing import List, Dict, Optional
 import random
 import logging
 
+from .lazy_imports import fcluster
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,7 +49,8 @@ class HierarchicalClusterCandidateService:
             )
 
         logger.info(f"Loading linkage matrix from {linkage_path}")
-        self.linkage_matrix = np.load(linkage_path)
+        # Memory-mapped: pages are read on first use instead of at startup
+        self.linkage_matrix = np.load(linkage_path, mmap_mode="r")
 
         # Linkage matrix has n-1 rows for n features
         self.n_features = self.linkage_matrix.shape[0] + 1
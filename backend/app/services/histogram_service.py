@@ -2,32 +2,27 @@
 Histogram service for generating histogram visualizations.
 
 Clean architecture:
-1. Load data from feature_analysis
-2. Apply filters and threshold path constraints
+1. Resolve filters and threshold path constraints to a row mask (MetricIndex)
+2. Reduce the metric to one value per feature
 3. Calculate histogram bins and statistics
 4. Return structured histogram response
 
 All histogram-specific logic is centralized here for maintainability.
 """
 
-import polars as pl
 import numpy as np
 import logging
 import re
-from typing import Dict, List, Optional, Union, Any, TYPE_CHECKING
+from typing import Dict, List, Optional, TYPE_CHECKING
 
 from ..models.common import Filters, MetricType
-from ..models.responses import HistogramResponse, GroupedHistogramData
+from ..models.requests import HistogramSpec
+from ..models.responses import BatchHistogramResponse, BatchHistogramResult, HistogramResponse
 from .data_constants import (
-    COL_FEATURE_ID,
-    COL_SAE_ID,
-    COL_EXPLANATION_METHOD,
-    COL_LLM_EXPLAINER,
-    COL_LLM_SCORER,
     COL_DECODER_SIMILARITY,
-    COL_DECODER_SIMILARITY_MERGE_THRESHOLD,
     DECODER_METRIC_FOR_AGGREGATION
 )
+from .metric_index import MetricIndex, RangeConstraint
 
 # Import for type hints only (avoids circular imports)
 if TYPE_CHECKING:
@@ -97,7 +92,7 @@ class HistogramService:
             return DECODER_METRIC_FOR_AGGREGATION
         return metric_name
 
-    async def get_histogram_data(
+    def compute_histogram(
         self,
         filters: Filters,
         metric: MetricType,
@@ -109,6 +104,8 @@ class HistogramService:
         """
         Generate histogram data for a specific metric with optional threshold path filtering.
 
+        Synchronous and CPU-bound, so the endpoint runs it in a worker thread.
+
         Args:
             filters: Filter criteria to apply
             metric: Metric to analyze
@@ -124,46 +121,124 @@ class HistogramService:
             raise RuntimeError("DataService not ready")
 
         try:
-            # Get filtered data (handles both standard and consistency metrics)
-            filtered_df = self._get_metric_data(filters, metric, threshold_path)
-
-            # Generate histogram
-            values = self._extract_metric_values(filtered_df, metric)
-            bins = self._calculate_bins_if_needed(values, bins)
-
-            # Use fixed domain if provided, otherwise use data range
-            if fixed_domain:
-                bin_range = fixed_domain
-                logger.debug(f"Using fixed domain for histogram: {bin_range}")
-            else:
-                bin_range = (float(np.min(values)), float(np.max(values)))
-
-            counts, bin_edges = np.histogram(values, bins=bins, range=bin_range)
-            bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
-
-            return HistogramResponse(
-                metric=metric.value,
-                histogram={
-                    "bins": bin_centers.tolist(),
-                    "counts": counts.tolist(),
-                    "bin_edges": bin_edges.tolist()
-                },
-                statistics=self._calculate_statistics(values),
-                total_features=len(values)
-            )
+            # Get per-feature values (handles both standard and consistency metrics)
+            values = self._get_metric_data(filters, metric, threshold_path)
+            return self._build_histogram_response(metric, values, bins, fixed_domain)
 
         except Exception as e:
             logger.error(f"Error generating histogram: {e}")
             raise
 
+    def compute_histogram_batch(
+        self,
+        filters: Filters,
+        specs: List[HistogramSpec]
+    ) -> BatchHistogramResponse:
+        """
+        Generate several histograms for the same filters in one pass.
+
+        The filter selection is resolved once, each distinct threshold path is
+        resolved to a row mask once, and each (metric, threshold path) pair is
+        reduced to per-feature values once, however many specs share them.
+        A spec that cannot be answered (e.g. no values left under its path)
+        gets an error entry instead of failing the whole batch. Synchronous,
+        like compute_histogram.
+
+        Args:
+            filters: Filter criteria shared by every histogram
+            specs: Histogram specifications (metric, bins, threshold path, ...)
+
+        Returns:
+            BatchHistogramResponse with one entry per spec, in request order
+        """
+        if not self.data_service.is_ready():
+            raise RuntimeError("DataService not ready")
+
+        index = self.data_service.get_metric_index()
+        row_masks: Dict[tuple, np.ndarray] = {}
+        metric_values: Dict[tuple, np.ndarray] = {}
+        results = []
+
+        for spec in specs:
+            threshold_path = [
+                {"metric": constraint.metric, "rangeLabel": constraint.range_label}
+                for constraint in spec.thresholdPath or []
+            ]
+            try:
+                constraints = self._parse_threshold_path(threshold_path)
+                path_key = tuple(constraints)
+                row_mask = row_masks.get(path_key)
+                if row_mask is None:
+                    row_mask = index.row_mask(filters, constraints)
+                    row_masks[path_key] = row_mask
+
+                values_key = (spec.metric, path_key)
+                values = metric_values.get(values_key)
+                if values is None:
+                    values = self._reduce_metric(index, spec.metric, row_mask)
+                    metric_values[values_key] = values
+
+                histogram = self._build_histogram_response(spec.metric, values, spec.bins, spec.fixedDomain)
+                results.append(BatchHistogramResult(metric=spec.metric.value, nodeId=spec.nodeId, data=histogram))
+
+            except ValueError as e:
+                code = "INVALID_METRIC_DATA" if "No valid values" in str(e) else "INVALID_REQUEST"
+                results.append(BatchHistogramResult(
+                    metric=spec.metric.value,
+                    nodeId=spec.nodeId,
+                    error={"code": code, "message": str(e), "details": {"metric": spec.metric.value}}
+                ))
+
+        logger.info(
+            f"Batch histograms: {len(specs)} specs, {len(row_masks)} threshold paths, "
+            f"{len(metric_values)} metric reductions"
+        )
+        return BatchHistogramResponse(histograms=results)
+
+    def _build_histogram_response(
+        self,
+        metric: MetricType,
+        values: np.ndarray,
+        bins: Optional[int],
+        fixed_domain: Optional[tuple[float, float]]
+    ) -> HistogramResponse:
+        """Bin per-feature values and attach statistics."""
+        bins = self._calculate_bins_if_needed(values, bins)
+
+        # Use fixed domain if provided, otherwise use data range
+        if fixed_domain:
+            bin_range = fixed_domain
+            logger.debug(f"Using fixed domain for histogram: {bin_range}")
+        else:
+            bin_range = (float(np.min(values)), float(np.max(values)))
+
+        counts, bin_edges = np.histogram(values, bins=bins, range=bin_range)
+        bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+
+        return HistogramResponse(
+            metric=metric.value,
+            histogram={
+                "bins": bin_centers.tolist(),
+                "counts": counts.tolist(),
+                "bin_edges": bin_edges.tolist()
+            },
+            statistics=self._calculate_statistics(values),
+            total_features=len(values)
+        )
+
     def _get_metric_data(
         self,
         filters: Filters,
         metric: MetricType,
         threshold_path: Optional[List[Dict[str, str]]]
-    ) -> pl.DataFrame:
+    ) -> np.ndarray:
         """
-        Get data for any metric (standard or consistency) with unified flow.
+        Get per-feature values for any metric with unified flow.
+
+        Answered entirely from the presorted metric index: the Filters selection
+        and every threshold_path constraint become row masks (searchsorted over
+        the sorted column) that are intersected, then the metric is reduced per
+        feature with a bincount. No DataFrame is materialized per request.
 
         Args:
             filters: Filter criteria to apply
@@ -171,143 +246,77 @@ class HistogramService:
             threshold_path: Optional threshold path constraints
 
         Returns:
-            Filtered DataFrame ready for histogram generation
+            Array with one value per feature, ready for histogram generation
         """
-        # Apply filters to get base dataframe
-        filtered_df = self.data_service.apply_filters(
-            self.data_service._df_lazy, filters
-        ).collect()
-
-        # IMPORTANT: Transform decoder_similarity from List(Struct) to float BEFORE threshold filtering
-        # This is needed even when generating histograms for other metrics, because threshold_path
-        # may include decoder_similarity constraints that need to compare scalar values
-        # NOTE: Only transform if using original decoder_similarity for aggregation
-        if DECODER_METRIC_FOR_AGGREGATION == COL_DECODER_SIMILARITY and COL_DECODER_SIMILARITY in filtered_df.columns:
-            logger.info("Transforming decoder_similarity from List(Struct) to max float value")
-            filtered_df = filtered_df.with_columns([
-                pl.col(COL_DECODER_SIMILARITY)
-                  .list.eval(pl.element().struct.field("cosine_similarity"))
-                  .list.max()
-                  .alias(COL_DECODER_SIMILARITY)
-            ])
-        elif DECODER_METRIC_FOR_AGGREGATION == COL_DECODER_SIMILARITY_MERGE_THRESHOLD:
-            logger.info(f"Using {COL_DECODER_SIMILARITY_MERGE_THRESHOLD} for aggregation (no transformation needed)")
-
-        # Apply threshold path constraints if provided
+        index = self.data_service.get_metric_index()
+        constraints = self._parse_threshold_path(threshold_path)
+        row_mask = index.row_mask(filters, constraints)
+
         if threshold_path:
-            logger.info(f"Applying threshold path filtering with {len(threshold_path)} constraints")
-            for constraint in threshold_path:
-                metric_col = constraint.get('metric')
-                range_label = constraint.get('rangeLabel')
-
-                if not metric_col or not range_label:
-                    logger.warning(f"Skipping invalid constraint: {constraint}")
-                    continue
-
-                # Map metric name to actual column based on configuration
-                actual_col = self._get_actual_column_name(metric_col)
-
-                # Parse range and apply filter
-                min_val, max_val = parse_range_label(range_label)
-
-                if min_val is not None:
-                    filtered_df = filtered_df.filter(pl.col(actual_col) >= min_val)
-                    logger.debug(f"Applied constraint: {actual_col} >= {min_val} (requested as {metric_col})")
-
-                if max_val is not None:
-                    filtered_df = filtered_df.filter(pl.col(actual_col) < max_val)
-                    logger.debug(f"Applied constraint: {actual_col} < {max_val} (requested as {metric_col})")
-
-            logger.info(f"After threshold path filtering: {len(filtered_df)} rows")
-
-        # Automatically deduplicate feature-level and score metrics
-        average_by = None
-        if metric in [MetricType.DECODER_SIMILARITY, MetricType.SEMSIM_MEAN,
-                      MetricType.SCORE_FUZZ, MetricType.SCORE_DETECTION,
-                      MetricType.SCORE_EMBEDDING, MetricType.QUALITY_SCORE]:
-            if metric == MetricType.DECODER_SIMILARITY:
-                average_by = ['llm_explainer', 'llm_scorer']
-                logger.info(f"Auto-deduplicating {metric.value} (feature-level metric)")
-            elif metric in [MetricType.SCORE_FUZZ, MetricType.SCORE_DETECTION]:
-                # Scorer-level metrics: vary by scorer, so average by both
-                average_by = ['llm_explainer', 'llm_scorer']
-                logger.info(f"Auto-deduplicating {metric.value} (scorer-level metric)")
-            elif metric in [MetricType.SEMSIM_MEAN, MetricType.SCORE_EMBEDDING, MetricType.QUALITY_SCORE]:
-                # Explainer-level metrics: same value across scorers, so average by explainer only
-                average_by = 'llm_explainer'
-                logger.info(f"Auto-deduplicating {metric.value} (explainer-level metric)")
-
-        # Average if needed
-        if average_by:
-            filtered_df = self._average_by_field(filtered_df, metric, average_by)
-
-        return filtered_df
-
-    def _extract_metric_values(self, df: pl.DataFrame, metric: MetricType) -> np.ndarray:
-        """Extract and validate metric values from DataFrame."""
+            logger.info(f"After threshold path filtering: {int(row_mask.sum())} rows")
+
+        return self._reduce_metric(index, metric, row_mask)
+
+    def _reduce_metric(self, index: MetricIndex, metric: MetricType, row_mask: np.ndarray) -> np.ndarray:
+        """
+        Reduce a metric to one value per feature over the selected rows.
+
+        Raises:
+            ValueError: If no feature has a value for the metric
+        """
         # Map metric name to actual column based on configuration
-        actual_column = self._get_actual_column_name(metric.value)
-        metric_data = df.select([pl.col(actual_column).alias("metric_value")])
-        values = metric_data.get_column("metric_value").drop_nulls().to_numpy()
+        actual_column = self.data_service.resolve_aggregation_column(
+            self._get_actual_column_name(metric.value)
+        )
+
+        # Automatically deduplicate feature-level and score metrics: the decoder metric
+        # is feature-level (one value per feature), scorer/explainer-level metrics are
+        # averaged over the surviving explainer/scorer rows of each feature
+        if metric == MetricType.DECODER_SIMILARITY:
+            _, values = index.feature_firsts(actual_column, row_mask)
+        else:
+            _, values = index.feature_means(actual_column, row_mask)
+
+        logger.info(f"Deduplicated {metric.value}: {int(row_mask.sum())} rows -> {len(values)} features")
 
         if len(values) == 0:
             raise ValueError("No valid values found for the specified metric")
 
         return values
 
-    def _average_by_field(
+    def _parse_threshold_path(
         self,
-        df: pl.DataFrame,
-        metric: MetricType,
-        average_by: Union[str, List[str]]
-    ) -> pl.DataFrame:
+        threshold_path: Optional[List[Dict[str, str]]]
+    ) -> List[RangeConstraint]:
         """
-        Average metric values by collapsing the specified field(s).
+        Convert threshold path constraints to (column, min, max) range constraints.
 
         Args:
-            df: DataFrame with metric values
-            metric: Metric to average
-            average_by: Field(s) to collapse. Can be:
-                - Single field (str): e.g., 'llm_explainer' - collapses that dimension
-                - Multiple fields (List[str]): e.g., ['llm_explainer', 'llm_scorer']
+            threshold_path: Threshold path constraints from root to node
 
         Returns:
-            DataFrame with metric averaged per feature_id
+            List of range constraints on store columns
         """
-        # Normalize average_by to list for consistent handling
-        fields_to_collapse = [average_by] if isinstance(average_by, str) else average_by
-
-        # Group by feature_id and calculate mean of the metric
-        averaged_df = (
-            df.group_by([COL_FEATURE_ID])
-            .agg(pl.col(metric.value).mean().alias(metric.value))
-        )
-
-        # Add back other necessary columns (take first value from each group)
-        # Skip complex types (List, Struct) that can't be aggregated with .first()
-        columns_to_exclude = [COL_FEATURE_ID, metric.value] + fields_to_collapse
-
-        # Filter for simple types only (exclude List and Struct columns)
-        simple_columns = []
-        for col in df.columns:
-            if col not in columns_to_exclude:
-                dtype = df[col].dtype
-                # Check if it's a simple type (not List or Struct)
-                if not isinstance(dtype, (pl.List, pl.Struct)):
-                    simple_columns.append(col)
-
-        if simple_columns:
-            # Get first value for each feature_id for simple columns only
-            first_values = (
-                df.group_by([COL_FEATURE_ID])
-                .agg([pl.col(col).first().alias(col) for col in simple_columns])
+        constraints = []
+        for constraint in threshold_path or []:
+            metric_col = constraint.get('metric')
+            range_label = constraint.get('rangeLabel')
+
+            if not metric_col or not range_label:
+                logger.warning(f"Skipping invalid constraint: {constraint}")
+                continue
+
+            # Map metric name to actual column based on configuration
+            actual_col = self.data_service.resolve_aggregation_column(
+                self._get_actual_column_name(metric_col)
             )
-            averaged_df = averaged_df.join(first_values, on=COL_FEATURE_ID, how="left")
 
-        # Log the averaging operation
-        fields_str = " and ".join(fields_to_collapse)
-        logger.info(f"Averaged {metric.value} by collapsing [{fields_str}]: {len(df)} rows -> {len(averaged_df)} features")
-        return averaged_df
+            # Parse range: min is inclusive, max is exclusive
+            min_val, max_val = parse_range_label(range_label)
+            constraints.append((actual_col, min_val, max_val))
+            logger.debug(f"Constraint: {min_val} <= {actual_col} < {max_val} (requested as {metric_col})")
+
+        return constraints
 
     def _calculate_bins_if_needed(self, values: np.ndarray, bins: Optional[int]) -> int:
         """Calculate optimal bins if not specified."""
@@ -0,0 +1,202 @@
+"""
+Lazy loading of the heavy scientific stack (scikit-learn, SciPy).
+
+Importing sklearn/scipy costs about a second and is only needed once the first
+SVM is trained, a GMM is fitted or the dendrogram is cut. Services import the
+names they need from this module instead; each name is a proxy that imports
+its module on first use, so importing the app stays cheap. After startup a
+background thread can warm the modules up before the first request needs them.
+
+Every load is timed, and get_import_report() lists what was loaded, when and by
+whom. Running this module checks that importing app.main pulls in none of the
+heavy modules:
+
+    python -m app.services.lazy_imports
+"""
+
+import importlib
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Modules that must never be imported eagerly by app.main
+HEAVY_MODULES = (
+    "sklearn.svm",
+    "sklearn.preprocessing",
+    "sklearn.mixture",
+    "scipy.cluster.hierarchy",
+)
+
+# Warm heavy modules up in a background thread after startup (set to 0 to disable)
+WARMUP_ENABLED = os.getenv("LAZY_IMPORT_WARMUP", "1").lower() not in ("0", "false", "no")
+
+_lock = threading.Lock()
+_load_records: Dict[str, Dict[str, Any]] = {}
+_warmup_thread: Optional[threading.Thread] = None
+
+
+def load(module_name: str, trigger: str = "on-demand"):
+    """
+    Import a module (once) and record how long it took.
+
+    Args:
+        module_name: Dotted module name
+        trigger: Who caused the load ("on-demand" or "warmup"), for the report
+
+    Returns:
+        The imported module
+    """
+    module = sys.modules.get(module_name)
+    if module is not None and module_name in _load_records:
+        return module
+
+    with _lock:
+        if module_name in _load_records:
+            return sys.modules[module_name]
+
+        already_loaded = module_name in sys.modules
+        start_time = time.perf_counter()
+        module = importlib.import_module(module_name)
+        elapsed = time.perf_counter() - start_time
+
+        _load_records[module_name] = {
+            "seconds": round(elapsed, 4),
+            "trigger": trigger,
+            "thread": threading.current_thread().name,
+            "already_imported": already_loaded,
+            "loaded_at": time.time()
+        }
+        if not already_loaded:
+            logger.info(f"[lazy_imports] Loaded {module_name} in {elapsed:.2f}s ({trigger})")
+        return module
+
+
+class LazyAttribute:
+    """
+    Stand-in for a class or function of a heavy module.
+
+    Calling it (or reading any attribute) imports the module and forwards to the
+    real object, so call sites such as SVC(kernel="rbf") stay unchanged.
+    """
+
+    def __init__(self, module_name: str, attribute: str):
+        self._module_name = module_name
+        self._attribute = attribute
+        self._target = None
+
+    def resolve(self):
+        if self._target is None:
+            self._target = getattr(load(self._module_name), self._attribute)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        # Dunder probes (e.g. from typing when the proxy is used in an annotation)
+        # must not trigger the import
+        if name.startswith("__") and name.endswith("__"):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._target is not None else "not loaded"
+        return f"<lazy {self._module_name}.{self._attribute} ({state})>"
+
+
+SVC = LazyAttribute("sklearn.svm", "SVC")
+StandardScaler = LazyAttribute("sklearn.preprocessing", "StandardScaler")
+GaussianMixture = LazyAttribute("sklearn.mixture", "GaussianMixture")
+fcluster = LazyAttribute("scipy.cluster.hierarchy", "fcluster")
+
+
+def start_background_warmup(modules: List[str] = HEAVY_MODULES) -> Optional[threading.Thread]:
+    """
+    Import the heavy modules in a daemon thread so the first request does not pay for them.
+
+    Returns:
+        The warm-up thread, or None if warm-up is disabled or already started
+    """
+    global _warmup_thread
+    if not WARMUP_ENABLED or _warmup_thread is not None:
+        return None
+
+    def warm_up():
+        for module_name in modules:
+            try:
+                load(module_name, trigger="warmup")
+            except Exception as e:
+                logger.warning(f"[lazy_imports] Warm-up import of {module_name} failed: {e}")
+
+    _warmup_thread = threading.Thread(target=warm_up, name="lazy-import-warmup", daemon=True)
+    _warmup_thread.start()
+    return _warmup_thread
+
+
+def get_import_report() -> Dict[str, Any]:
+    """Which heavy modules are loaded, and the timing of every lazy load."""
+    with _lock:
+        records = {name: dict(record) for name, record in _load_records.items()}
+    return {
+        "heavy_modules": {
+            module_name: module_name in sys.modules for module_name in HEAVY_MODULES
+        },
+        "loads": records,
+        "total_load_seconds": round(sum(record["seconds"] for record in records.values()), 4),
+        "warmup_enabled": WARMUP_ENABLED
+    }
+
+
+def measure_app_import(target: str = "app.main") -> Dict[str, Any]:
+    """
+    Import target in a fresh interpreter with -X importtime.
+
+    Returns:
+        Dict with the total import time, the slowest top-level imports and any
+        heavy modules that were imported eagerly
+    """
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=backend_dir,
+        capture_output=True,
+        text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{completed.stderr[-2000:]}")
+
+    cumulative: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            continue  # header line
+        cumulative[parts[2].strip()] = cumulative_us
+
+    slowest = sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:15]
+    return {
+        "target": target,
+        "total_seconds": round(cumulative.get(target, 0) / 1e6, 4),
+        "slowest": [{"module": name, "seconds": round(us / 1e6, 4)} for name, us in slowest],
+        "eager_heavy_modules": [name for name in HEAVY_MODULES if name in cumulative]
+    }
+
+
+if __name__ == "__main__":
+    report = measure_app_import()
+    print(f"import {report['target']}: {report['total_seconds']:.2f}s")
+    for entry in report["slowest"]:
+        print(f"  {entry['seconds']:8.4f}s  {entry['module']}")
+    if report["eager_heavy_modules"]:
+        print(f"ERROR: heavy modules imported eagerly: {', '.join(report['eager_heavy_modules'])}")
+        sys.exit(1)
+    print("OK: no heavy modules imported eagerly")
@@ -0,0 +1,350 @@
+"""
+Presorted per-metric column index over the materialized feature store.
+
+For every numeric metric column the index keeps, once per data generation:
+the row values as a float array (nulls as NaN), a stable argsort permutation and
+the sorted values. Any range constraint then resolves to a contiguous slice of
+the permutation via searchsorted, constraints combine by mask intersection, and
+per-feature aggregation is a bincount over the row -> feature code array. No
+DataFrame work happens per request.
+
+Range predicates are answered from packed row bitmaps (one bit per row): for
+every (column, edge) that appears in a constraint the index keeps the bitmap of
+rows with value >= edge, so [min, max) is ge(min) & ~ge(max) and a threshold
+path is a chain of bitwise ANDs. Selections of path prefixes are cached, which
+makes a node deep in the Sankey tree cost one AND over its parent's selection;
+set sizes are popcounts and never materialize rows.
+
+Semantics match the previous Polars pipeline: constraints select rows (nulls
+never match), and the histogram metric is then averaged (or, for feature-level
+columns, taken from the first surviving row) per feature.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+import polars as pl
+
+from .feature_store import FILTER_CACHE_SIZE, FeatureStore, FilterKey, filters_fingerprint
+
+# Import for type hints only (avoids circular imports)
+if TYPE_CHECKING:
+    from ..models.common import Filters
+
+logger = logging.getLogger(__name__)
+
+# (column, min inclusive, max exclusive); None means unbounded
+RangeConstraint = Tuple[str, Optional[float], Optional[float]]
+
+# Edge bitmaps kept per column, and threshold path selections kept per index
+EDGE_BITMAPS_PER_COLUMN = 256
+PATH_CACHE_SIZE = 256
+
+# Number of set bits of every byte value
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(bits: np.ndarray) -> int:
+    """Number of set bits in a packed bitmap."""
+    return int(_POPCOUNT[bits].sum(dtype=np.int64))
+
+
+class MetricColumn:
+    """Sorted view of one numeric column."""
+
+    def __init__(self, name: str, values: np.ndarray):
+        self.name = name
+        self.values = values
+        # Stable argsort; NaN (null) sorts last and is excluded from every range
+        self.order = np.argsort(values, kind="stable")
+        self.sorted_values = values[self.order]
+        self.n_valid = int(np.count_nonzero(~np.isnan(values)))
+        self.valid = ~np.isnan(values)
+        self._valid_bits: Optional[np.ndarray] = None
+        self._edge_bits: Dict[float, np.ndarray] = {}
+
+    def range_bounds(self, min_val: Optional[float], max_val: Optional[float]) -> Tuple[int, int]:
+        """Positions [lo, hi) in the sorted order with min_val <= value < max_val."""
+        valid_sorted = self.sorted_values[:self.n_valid]
+        lo = 0 if min_val is None else int(np.searchsorted(valid_sorted, min_val, side="left"))
+        hi = self.n_valid if max_val is None else int(np.searchsorted(valid_sorted, max_val, side="left"))
+        return lo, max(lo, hi)
+
+    def range_rows(self, min_val: Optional[float], max_val: Optional[float]) -> np.ndarray:
+        """Row offsets with min_val <= value < max_val (in value order)."""
+        lo, hi = self.range_bounds(min_val, max_val)
+        return self.order[lo:hi]
+
+    def range_mask(self, min_val: Optional[float], max_val: Optional[float]) -> np.ndarray:
+        """Boolean row mask with min_val <= value < max_val."""
+        mask = np.zeros(len(self.values), dtype=bool)
+        mask[self.range_rows(min_val, max_val)] = True
+        return mask
+
+    def valid_bits(self) -> np.ndarray:
+        """Packed bitmap of the non-null rows."""
+        if self._valid_bits is None:
+            self._valid_bits = np.packbits(self.valid)
+        return self._valid_bits
+
+    def edge_bits(self, edge: float) -> np.ndarray:
+        """Packed bitmap of the rows with value >= edge (built once per edge)."""
+        bits = self._edge_bits.get(edge)
+        if bits is None:
+            if len(self._edge_bits) >= EDGE_BITMAPS_PER_COLUMN:
+                self._edge_bits.clear()
+            bits = np.packbits(self.range_mask(edge, None))
+            self._edge_bits[edge] = bits
+        return bits
+
+    def range_bits(self, min_val: Optional[float], max_val: Optional[float]) -> np.ndarray:
+        """Packed bitmap of the rows with min_val <= value < max_val."""
+        bits = self.valid_bits() if min_val is None else self.edge_bits(min_val)
+        if max_val is not None:
+            bits = bits & ~self.edge_bits(max_val)
+        return bits
+
+
+class MetricIndex:
+    """
+    Per-generation index of metric columns and per-row feature codes.
+
+    Attributes:
+        feature_ids: Sorted unique feature IDs (feature code -> feature_id)
+        feature_codes: Feature code of every row
+    """
+
+    def __init__(self, store: FeatureStore):
+        self.store = store
+        self.n_rows = store.n_rows
+        self.feature_ids = store.feature_ids
+        # Rows are sorted by feature_id, so codes are a repeat of the block lengths
+        self.feature_codes = np.repeat(
+            np.arange(store.n_features, dtype=np.int64), store._feature_counts
+        )
+        self._columns: Dict[str, MetricColumn] = {}
+        self._filter_masks: Dict[FilterKey, Optional[np.ndarray]] = {}
+        self._path_bits: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._all_bits = np.packbits(np.ones(self.n_rows, dtype=bool))
+        self._lock = threading.Lock()
+        self.path_hits = 0
+        self.path_misses = 0
+
+    def column(self, name: str) -> MetricColumn:
+        """Return (building once) the sorted index of a numeric column."""
+        column = self._columns.get(name)
+        if column is not None:
+            return column
+
+        with self._lock:
+            column = self._columns.get(name)
+            if column is None:
+                series = self.store.df.get_column(name).cast(pl.Float64)
+                values = series.to_numpy().astype(np.float64, copy=True)
+                column = MetricColumn(name, values)
+                self._columns[name] = column
+                logger.info(f"MetricIndex built for {name}: {column.n_valid}/{self.n_rows} non-null rows")
+        return column
+
+    def filter_mask(self, filters: Optional["Filters"]) -> Optional[np.ndarray]:
+        """Numpy row mask for filters (None = all rows), from the store's filter cache."""
+        key = filters_fingerprint(filters)
+        if not key:
+            return None
+        mask = self._filter_masks.get(key)
+        if mask is None:
+            mask = self.store.filter_mask(filters).fill_null(False).to_numpy().astype(bool, copy=False)
+            if len(self._filter_masks) >= FILTER_CACHE_SIZE:
+                self._filter_masks.clear()
+            self._filter_masks[key] = mask
+        return mask
+
+    def path_bits(
+        self,
+        filters: Optional["Filters"],
+        constraints: Sequence[RangeConstraint] = ()
+    ) -> np.ndarray:
+        """
+        Packed bitmap of the rows selected by filters and every range constraint.
+
+        Each prefix of the constraint chain is cached, so extending a cached
+        path by one constraint costs a single AND.
+
+        Args:
+            filters: Filter criteria
+            constraints: (column, min, max) range constraints, root to node
+
+        Returns:
+            Packed row bitmap (np.packbits layout, n_rows bits)
+        """
+        constraints = tuple(
+            (column_name, min_val, max_val) for column_name, min_val, max_val in constraints
+            if min_val is not None or max_val is not None
+        )
+        filter_key = filters_fingerprint(filters)
+
+        # Longest cached prefix
+        depth = len(constraints)
+        bits = None
+        while depth >= 0:
+            bits = self._cached_path((filter_key, constraints[:depth]))
+            if bits is not None:
+                break
+            depth -= 1
+
+        if depth == len(constraints):
+            self.path_hits += 1
+            return bits
+        self.path_misses += 1
+
+        if bits is None:
+            base = self.filter_mask(filters)
+            bits = self._all_bits if base is None else np.packbits(base)
+            self._cache_path((filter_key, ()), bits)
+            depth = 0
+
+        for length in range(depth + 1, len(constraints) + 1):
+            column_name, min_val, max_val = constraints[length - 1]
+            bits = bits & self.column(column_name).range_bits(min_val, max_val)
+            self._cache_path((filter_key, constraints[:length]), bits)
+
+        return bits
+
+    def _cached_path(self, key: tuple) -> Optional[np.ndarray]:
+        with self._lock:
+            bits = self._path_bits.get(key)
+            if bits is not None:
+                self._path_bits.move_to_end(key)
+            return bits
+
+    def _cache_path(self, key: tuple, bits: np.ndarray):
+        with self._lock:
+            self._path_bits[key] = bits
+            self._path_bits.move_to_end(key)
+            while len(self._path_bits) > PATH_CACHE_SIZE:
+                self._path_bits.popitem(last=False)
+
+    def unpack(self, bits: np.ndarray) -> np.ndarray:
+        """Boolean row mask of a packed bitmap."""
+        return np.unpackbits(bits, count=self.n_rows).view(bool)
+
+    def row_mask(
+        self,
+        filters: Optional["Filters"],
+        constraints: Sequence[RangeConstraint] = ()
+    ) -> np.ndarray:
+        """
+        Intersect the filter selection with every range constraint.
+
+        Args:
+            filters: Filter criteria
+            constraints: (column, min, max) range constraints
+
+        Returns:
+            Boolean row mask
+        """
+        return self.unpack(self.path_bits(filters, constraints))
+
+    def count_rows(
+        self,
+        filters: Optional["Filters"],
+        constraints: Sequence[RangeConstraint] = ()
+    ) -> int:
+        """Number of rows selected by filters and constraints (no rows materialized)."""
+        return popcount(self.path_bits(filters, constraints))
+
+    def get_stats(self) -> Dict[str, int]:
+        """Bitmap cache statistics."""
+        with self._lock:
+            cached_paths = len(self._path_bits)
+        return {
+            "columns": len(self._columns),
+            "edge_bitmaps": sum(len(column._edge_bits) for column in self._columns.values()),
+            "cached_paths": cached_paths,
+            "path_hits": self.path_hits,
+            "path_misses": self.path_misses
+        }
+
+    def feature_means(self, column_name: str, row_mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Mean of a column per feature over the selected rows (nulls ignored).
+
+        Returns:
+            Tuple of (feature_ids, means) for features with at least one non-null value
+        """
+        column = self.column(column_name)
+        rows = row_mask & column.valid
+        codes = self.feature_codes[rows]
+        n_features = len(self.feature_ids)
+        counts = np.bincount(codes, minlength=n_features)
+        sums = np.bincount(codes, weights=column.values[rows], minlength=n_features)
+        present = counts > 0
+        return self.feature_ids[present], sums[present] / counts[present]
+
+    def feature_firsts(self, column_name: str, row_mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Value of a feature-level column at each feature's first selected row.
+
+        Returns:
+            Tuple of (feature_ids, values) for features whose first selected row is non-null
+        """
+        column = self.column(column_name)
+        rows = np.flatnonzero(row_mask)
+        codes, first_positions = np.unique(self.feature_codes[rows], return_index=True)
+        values = column.values[rows[first_positions]]
+        present = ~np.isnan(values)
+        return self.feature_ids[codes[present]], values[present]
+
+    def partition_features(
+        self,
+        column_name: str,
+        row_mask: np.ndarray,
+        thresholds: Sequence[float],
+        aggregate: bool
+    ) -> List[np.ndarray]:
+        """
+        Split the selected features into the N+1 ranges of N sorted thresholds.
+
+        Every value gets its range with one vectorized digitize (min inclusive,
+        max exclusive) and the feature IDs are partitioned with one sort, so the
+        cost does not grow with the number of thresholds.
+
+        Args:
+            column_name: Metric column
+            row_mask: Selected rows
+            thresholds: Sorted threshold values
+            aggregate: Average the column per feature first (one range per
+                feature); otherwise a feature belongs to every range one of its
+                rows falls in
+
+        Returns:
+            One sorted feature ID array per range
+        """
+        edges = np.asarray(thresholds, dtype=np.float64)
+        n_groups = len(edges) + 1
+
+        if aggregate:
+            feature_ids, values = self.feature_means(column_name, row_mask)
+            bins = np.searchsorted(edges, values, side="right")
+            # Stable sort keeps the IDs ascending within each range
+            order = np.argsort(bins, kind="stable")
+            sorted_ids = feature_ids[order]
+            counts = np.bincount(bins, minlength=n_groups)
+        else:
+            column = self.column(column_name)
+            rows = row_mask & column.valid
+            bins = np.searchsorted(edges, column.values[rows], side="right")
+            # Unique (range, feature) pairs, sorted by range then feature
+            n_features = len(self.feature_ids)
+            pairs = np.unique(bins * n_features + self.feature_codes[rows])
+            sorted_ids = self.feature_ids[pairs % n_features]
+            counts = np.bincount(pairs // n_features, minlength=n_groups)
+
+        return np.split(sorted_ids, np.cumsum(counts)[:-1])
+
+    def selected_features(self, row_mask: np.ndarray) -> np.ndarray:
+        """Feature IDs with at least one selected row."""
+        return self.feature_ids[np.unique(self.feature_codes[row_mask])]
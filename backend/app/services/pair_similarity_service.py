@@ -16,8 +16,6 @@ import numpy as np
 import logging
 import hashlib
 from typing import List, Dict, Tuple, Optional, TYPE_CHECKING
-from sklearn.svm import SVC
-from sklearn.preprocessing import StandardScaler
 
 from ..models.similarity_sort import (
     PairSimilaritySortRequest, PairSimilaritySortResponse, PairScore,
@@ -25,6 +23,7 @@ from ..models.similarity_sort import (
     HistogramData, HistogramStatistics, BimodalityInfo, GMMComponentInfo
 )
 from .bimodality_service import BimodalityService
+from .lazy_imports import SVC, StandardScaler
 
 if TYPE_CHECKING:
     from .data_service import DataService
@@ -369,15 +368,14 @@ class PairSimilarityService:
         try:
             logger.info(f"[_extract_pair_feature_metrics] Starting extraction for {len(feature_ids)} features")
 
-            # Get the main dataframe for base feature IDs
-            lf = self.data_service._df_lazy
+            # Get the requested features' rows from the main dataframe (feature index lookup)
+            lf = self.data_service.get_features_lazy(feature_ids)
 
             if lf is None:
                 logger.error("Main dataframe not initialized")
                 return None
 
-            # Filter to requested features and get unique feature IDs
-            lf = lf.filter(pl.col("feature_id").is_in(feature_ids))
+            # Get unique feature IDs
             base_df = lf.select("feature_id").unique().collect()
             base_df = base_df.with_columns(pl.col("feature_id").cast(pl.UInt32))
 
@@ -548,20 +546,20 @@ class PairSimilarityService:
         Returns:
             Dictionary mapping pair_key to cosine_similarity
         """
-        # Access the main dataframe through data_service
-        lf = self.data_service._df_lazy
+        # Extract ALL unique feature IDs from pairs (both positions)
+        all_feature_ids = list(set(fid for main_id, similar_id in pair_ids for fid in (main_id, similar_id)))
+
+        # Access the main dataframe rows for those features through data_service
+        lf = self.data_service.get_features_lazy(all_feature_ids)
         if lf is None:
             logger.warning("Main dataframe not available for pair metrics")
             return {}
 
-        # Extract ALL unique feature IDs from pairs (both positions)
-        all_feature_ids = list(set(fid for main_id, similar_id in pair_ids for fid in (main_id, similar_id)))
-
         logger.info(f"Loading decoder_similarity data for {len(all_feature_ids)} unique features from {len(pair_ids)} pairs")
 
         # Load the decoder_similarity data for ALL features (single filter)
         try:
-            df = lf.filter(pl.col("feature_id").is_in(all_feature_ids)).select([
+            df = lf.select([
                 "feature_id",
                 "decoder_similarity"
             ]).collect()
@@ -872,10 +870,13 @@ class PairSimilarityService:
             selected_pair_keys: Pair keys marked as selected (✓) e.g., ["1-2", "3-4"]
             rejected_pair_keys: Pair keys marked as rejected (✗)
 
+        Models trained on a previous data generation never match, since the key
+        includes the dataset version token.
+
         Returns:
-            MD5 hash of sorted pair key lists
+            MD5 hash of the dataset version and sorted pair key lists
         """
-        key_str = f"{sorted(selected_pair_keys)}_{sorted(rejected_pair_keys)}"
+        key_str = f"{self.data_service.dataset_version}_{sorted(selected_pair_keys)}_{sorted(rejected_pair_keys)}"
         return hashlib.md5(key_str.encode()).hexdigest()
 
     def _train_svm_model(
@@ -0,0 +1,183 @@
+"""
+Reload Service - Hot reload of master data files without restarting the server.
+
+Services register the source files their state is derived from together with an
+async reload handler. A background task polls the (size, mtime) fingerprints of
+those files; once a changed fingerprint has been stable for one full poll
+interval (so half-written files are not picked up), the handlers of every
+affected registration run in registration order.
+
+A handler fails by raising (or by returning False). The remaining handlers of
+that target are skipped and its fingerprint is not advanced, so the reload is
+retried on the next poll until it succeeds.
+
+Handlers build the new generation off the event loop and swap it in with plain
+attribute assignments, so in-flight requests finish on the generation they
+started with.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from .snapshot_service import fingerprint_sources
+
+logger = logging.getLogger(__name__)
+
+# Seconds between fingerprint polls (0 disables the background watcher)
+RELOAD_POLL_INTERVAL = float(os.getenv("DATA_RELOAD_INTERVAL", "5"))
+
+ReloadHandler = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class ReloadTarget:
+    """A registered reload: the files watched and the handlers to run on change."""
+    name: str
+    sources: List[Path]
+    handlers: List[ReloadHandler]
+    fingerprint: List[Dict[str, Any]] = field(default_factory=list)
+    pending_fingerprint: Optional[List[Dict[str, Any]]] = None
+    reload_count: int = 0
+    last_reload_at: Optional[float] = None
+    last_error: Optional[str] = None
+
+
+class ReloadService:
+    """
+    Watches source file fingerprints and runs the registered reload handlers.
+    """
+
+    def __init__(self, poll_interval: float = RELOAD_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._targets: Dict[str, ReloadTarget] = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.generation = 0
+
+    def register(self, name: str, sources: Sequence[Path], *handlers: ReloadHandler):
+        """
+        Register a reload target.
+
+        Args:
+            name: Target name (shown in status)
+            sources: Files whose change triggers the reload
+            handlers: Async callables run in order when any source changes
+        """
+        sources = [Path(source) for source in sources]
+        self._targets[name] = ReloadTarget(
+            name=name,
+            sources=sources,
+            handlers=list(handlers),
+            fingerprint=fingerprint_sources(sources)
+        )
+
+    async def start(self):
+        """Start the background watcher (no-op when polling is disabled)."""
+        if self.poll_interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._watch())
+        logger.info(f"[ReloadService] Watching {len(self._targets)} targets every {self.poll_interval:.1f}s")
+
+    async def stop(self):
+        """Stop the background watcher."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"[ReloadService] Reload check failed: {e}", exc_info=True)
+
+    async def check(self, force: bool = False, debounce: bool = True) -> List[str]:
+        """
+        Run the handlers of every target whose sources changed.
+
+        Args:
+            force: Reload every target regardless of fingerprints
+            debounce: Wait until a changed fingerprint is stable for one poll
+
+        Returns:
+            Names of the targets that were reloaded
+        """
+        async with self._lock:
+            reloaded = []
+            for target in self._targets.values():
+                current = fingerprint_sources(target.sources)
+
+                if not force:
+                    if current == target.fingerprint:
+                        target.pending_fingerprint = None
+                        continue
+                    # Debounce: only reload once the new fingerprint is stable
+                    if debounce and current != target.pending_fingerprint:
+                        target.pending_fingerprint = current
+                        logger.info(f"[ReloadService] Change detected for '{target.name}', waiting for it to settle")
+                        continue
+
+                if await self._run_target(target, current):
+                    reloaded.append(target.name)
+
+            if reloaded:
+                self.generation += 1
+                logger.info(f"[ReloadService] Generation {self.generation}: reloaded {reloaded}")
+            return reloaded
+
+    async def _run_target(self, target: ReloadTarget, fingerprint: List[Dict[str, Any]]) -> bool:
+        """
+        Run the handlers of one target, stopping at the first failure.
+
+        Returns:
+            True if every handler succeeded and the new fingerprint was recorded
+        """
+        start_time = time.time()
+        logger.info(f"[ReloadService] Reloading '{target.name}'")
+        try:
+            for handler in target.handlers:
+                if await handler() is False:
+                    raise RuntimeError(f"{getattr(handler, '__qualname__', handler)} reported a failed reload")
+        except Exception as e:
+            target.last_error = str(e)
+            # Keep the old fingerprint; the stable new one is retried on the next poll
+            target.pending_fingerprint = fingerprint
+            logger.error(f"[ReloadService] Reload of '{target.name}' failed, will retry: {e}", exc_info=True)
+            return False
+
+        target.last_error = None
+        target.fingerprint = fingerprint
+        target.pending_fingerprint = None
+        target.reload_count += 1
+        target.last_reload_at = time.time()
+        logger.info(f"[ReloadService] '{target.name}' reloaded in {time.time() - start_time:.2f}s")
+        return True
+
+    def get_status(self) -> dict:
+        """Get reload status for every target."""
+        return {
+            "generation": self.generation,
+            "poll_interval": self.poll_interval,
+            "watching": self._task is not None,
+            "targets": {
+                target.name: {
+                    "sources": [str(source) for source in target.sources],
+                    "reload_count": target.reload_count,
+                    "last_reload_at": target.last_reload_at,
+                    "last_error": target.last_error,
+                    "change_pending": target.pending_fingerprint is not None
+                }
+                for target in self._targets.values()
+            }
+        }
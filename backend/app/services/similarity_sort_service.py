@@ -9,9 +9,8 @@ import polars as pl
 import numpy as np
 import logging
 import hashlib
+from collections import OrderedDict
 from typing import List, Dict, Tuple, Optional, TYPE_CHECKING
-from sklearn.svm import SVC
-from sklearn.preprocessing import StandardScaler
 
 from ..models.similarity_sort import (
     SimilaritySortRequest, SimilaritySortResponse, FeatureScore,
@@ -21,6 +20,7 @@ from ..models.similarity_sort import (
     Stage3QualityScoresRequest
 )
 from .bimodality_service import BimodalityService
+from .lazy_imports import SVC, StandardScaler
 
 if TYPE_CHECKING:
     from .data_service import DataService
@@ -56,13 +56,19 @@ class SimilaritySortService:
         self._svm_cache: Dict[str, Tuple[SVC, StandardScaler]] = {}
         self._max_cache_size = 100  # Prevent unbounded growth
 
-    async def get_similarity_sorted_features(
+        # Recent sort results: result_id -> {feature_id: score} (used by the table window API)
+        self._sort_results: "OrderedDict[str, Dict[int, float]]" = OrderedDict()
+        self._max_sort_results = 32
+
+    def sort_features(
         self,
         request: SimilaritySortRequest
     ) -> SimilaritySortResponse:
         """
         Calculate similarity scores and return sorted features.
 
+        Synchronous and CPU-bound, so the endpoint runs it in a worker thread.
+
         Args:
             request: Request containing selected, rejected, and all feature IDs
 
@@ -82,7 +88,7 @@ class SimilaritySortService:
 
         # Extract metrics for all features
         logger.info(f"Extracting metrics for {len(request.feature_ids)} features")
-        metrics_df = await self._extract_metrics(request.feature_ids)
+        metrics_df = self._extract_metrics(request.feature_ids)
 
         if metrics_df is None or len(metrics_df) == 0:
             logger.warning("No metrics extracted, returning empty result")
@@ -105,11 +111,43 @@ class SimilaritySortService:
 
         logger.info(f"Successfully scored and sorted {len(feature_scores)} features using SVM")
 
-        return SimilaritySortResponse(
+        result_id = self._store_sort_result(request, feature_scores)
+
+        # Scores are plain ints/floats, so the response is constructed without validation
+        return SimilaritySortResponse.model_construct(
             sorted_features=feature_scores,
             total_features=len(feature_scores),
-            weights_used=[]  # SVM doesn't expose interpretable weights
+            weights_used=[],  # SVM doesn't expose interpretable weights
+            result_id=result_id
+        )
+
+    def _store_sort_result(self, request: SimilaritySortRequest, feature_scores: List[FeatureScore]) -> str:
+        """
+        Keep a sort result so the table window API can page through it.
+
+        Returns:
+            Result ID (stable for the same request on the same data generation)
+        """
+        key_str = (
+            f"{self._get_cache_key(request.selected_ids, request.rejected_ids)}_"
+            f"{sorted(request.feature_ids)}"
         )
+        result_id = hashlib.md5(key_str.encode()).hexdigest()[:16]
+
+        self._sort_results[result_id] = {score.feature_id: score.score for score in feature_scores}
+        self._sort_results.move_to_end(result_id)
+        while len(self._sort_results) > self._max_sort_results:
+            self._sort_results.popitem(last=False)
+        return result_id
+
+    def get_sort_result(self, result_id: str) -> Optional[Dict[int, float]]:
+        """
+        Get the scores of a recent similarity sort.
+
+        Returns:
+            Mapping of feature_id -> score, or None if unknown or expired
+        """
+        return self._sort_results.get(result_id)
 
     async def get_similarity_score_histogram(
         self,
@@ -129,7 +167,7 @@ class SimilaritySortService:
 
         # Extract metrics for all features
         logger.info(f"Extracting metrics for {len(request.feature_ids)} features for histogram")
-        metrics_df = await self._extract_metrics(request.feature_ids)
+        metrics_df = self._extract_metrics(request.feature_ids)
 
         if metrics_df is None or len(metrics_df) == 0:
             logger.warning("No metrics extracted, returning empty histogram")
@@ -241,7 +279,7 @@ class SimilaritySortService:
                    f"need_revision={len(request.need_revision_ids)}, "
                    f"to_score={len(request.feature_ids)})")
 
-        metrics_df = await self._extract_metrics(all_feature_ids)
+        metrics_df = self._extract_metrics(all_feature_ids)
 
         if metrics_df is None or len(metrics_df) == 0:
             logger.warning("[Stage3QualityScores] No metrics extracted, returning empty histogram")
@@ -357,7 +395,7 @@ class SimilaritySortService:
 
         # Extract metrics for all features
         logger.info(f"[multi_modality_test] Extracting metrics for {len(feature_ids)} features")
-        metrics_df = await self._extract_metrics(feature_ids)
+        metrics_df = self._extract_metrics(feature_ids)
 
         if metrics_df is None or len(metrics_df) == 0:
             raise ValueError("Failed to extract metrics for features")
@@ -487,7 +525,7 @@ class SimilaritySortService:
     # METRIC EXTRACTION
     # =========================================================================
 
-    async def _extract_metrics(self, feature_ids: List[int]) -> Optional[pl.DataFrame]:
+    def _extract_metrics(self, feature_ids: List[int]) -> Optional[pl.DataFrame]:
         """
         Extract all 6 metrics for the specified features.
 
@@ -504,18 +542,14 @@ class SimilaritySortService:
         try:
             logger.info(f"[_extract_metrics] Starting extraction for {len(feature_ids)} features")
 
-            # Get the main dataframe
-            lf = self.data_service._df_lazy
+            # Get the requested features' rows from the main dataframe (feature index lookup)
+            lf = self.data_service.get_features_lazy(feature_ids)
 
             if lf is None:
                 logger.error("Main dataframe not initialized")
                 return None
 
-            logger.info("[_extract_metrics] Main dataframe loaded")
-
-            # Filter to requested features
-            lf = lf.filter(pl.col("feature_id").is_in(feature_ids))
-            logger.info("[_extract_metrics] Filtered to requested features")
+            logger.info("[_extract_metrics] Selected requested features")
 
             # Extract metrics from main dataframe
             logger.info("[_extract_metrics] Extracting main dataframe metrics")
@@ -542,7 +576,7 @@ class SimilaritySortService:
 
             # Extract activation-level metrics (intra-feature)
             logger.info("[_extract_metrics] Extracting activation metrics")
-            activation_df = await self._extract_activation_metrics(feature_ids)
+            activation_df = self._extract_activation_metrics(feature_ids)
             logger.info(f"[_extract_metrics] Activation metrics: {len(activation_df) if activation_df is not None else 0} rows")
 
             # Join all metrics together
@@ -571,7 +605,7 @@ class SimilaritySortService:
             traceback.print_exc()
             return None
 
-    async def _extract_activation_metrics(self, feature_ids: List[int]) -> Optional[pl.DataFrame]:
+    def _extract_activation_metrics(self, feature_ids: List[int]) -> Optional[pl.DataFrame]:
         """
         Extract intra-feature activation metrics.
 
@@ -704,7 +738,7 @@ class SimilaritySortService:
             feature_vector = metrics_matrix[i:i+1]  # Shape (1, d)
             score = self._score_with_svm(model, scaler, feature_vector)[0]
 
-            feature_scores.append(FeatureScore(feature_id=int(feature_id), score=float(score)))
+            feature_scores.append(FeatureScore.model_construct(feature_id=int(feature_id), score=float(score)))
 
         return feature_scores
 
@@ -785,10 +819,13 @@ class SimilaritySortService:
             selected_ids: Feature IDs marked as selected (✓)
             rejected_ids: Feature IDs marked as rejected (✗)
 
+        Models trained on a previous data generation never match, since the key
+        includes the dataset version token.
+
         Returns:
-            MD5 hash of sorted ID lists
+            MD5 hash of the dataset version and sorted ID lists
         """
-        key_str = f"{sorted(selected_ids)}_{sorted(rejected_ids)}"
+        key_str = f"{self.data_service.dataset_version}_{sorted(selected_ids)}_{sorted(rejected_ids)}"
         return hashlib.md5(key_str.encode()).hexdigest()
 
     def _train_svm_model(
@@ -853,6 +890,7 @@ class SimilaritySortService:
         return scores
 
     def clear_svm_cache(self):
-        """Clear SVM model cache (call on data reload)."""
+        """Clear SVM model cache and stored sort results (call on data reload)."""
         self._svm_cache.clear()
+        self._sort_results.clear()
         logger.info("SVM model cache cleared")
@@ -0,0 +1,133 @@
+"""
+Single-flight coalescing of concurrent identical requests.
+
+Several tabs (or one tab repeating a request quickly) often send the same
+payload to an expensive endpoint at the same moment. Instead of computing the
+same result once per request, the first request (the leader) starts the
+computation and later identical requests arriving while it is still running
+await the same result. Once it finishes the key is released, so nothing is
+cached beyond the in-flight window.
+
+Requests are identified by a namespace (the endpoint) and a canonical hash of
+their payload. The computation runs as its own task: a caller that disconnects
+does not cancel it for the others still waiting. Errors are raised to every
+waiter.
+
+All callers must run on the same event loop (the server's).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def request_key(payload: Any) -> str:
+    """
+    Canonical hash of a request payload.
+
+    Models are dumped in JSON mode and dict keys are sorted, so equal payloads
+    hash the same regardless of field order in the request body.
+
+    Args:
+        payload: Request model, or any JSON-serializable structure
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    if isinstance(payload, BaseModel):
+        payload = payload.model_dump(mode="json")
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class FlightCounters:
+    """Coalescing counters of one namespace."""
+    calls: int = 0
+    executions: int = 0
+    coalesced: int = 0
+    failures: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "coalesce_rate": round(self.coalesced / self.calls, 4) if self.calls else 0.0
+        }
+
+
+class SingleFlight:
+    """Shares one in-flight computation between concurrent identical requests."""
+
+    def __init__(self):
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._counters: Dict[str, FlightCounters] = {}
+
+    async def run(self, namespace: str, payload: Any, compute: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run compute() unless an identical request is already in flight.
+
+        Args:
+            namespace: Endpoint (or computation) name; keys never collide across namespaces
+            payload: Request payload identifying the computation (see request_key)
+            compute: Callable returning an awaitable (coroutine or executor future) of the result
+
+        Returns:
+            The result of the (possibly shared) computation. Shared results are
+            the same object for every waiter and must not be mutated.
+        """
+        key = (namespace, request_key(payload))
+        counters = self._counters.setdefault(namespace, FlightCounters())
+        counters.calls += 1
+
+        task = self._in_flight.get(key)
+        if task is None:
+            counters.executions += 1
+            task = asyncio.ensure_future(compute())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            counters.coalesced += 1
+            logger.debug(f"[single_flight] Coalesced {namespace} request {key[1][:12]}")
+
+        # shield: a cancelled caller must not cancel the computation for the others
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Tuple[str, str], task: asyncio.Future) -> None:
+        """Release the key and count failures once the computation is done."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self._counters[key[0]].failures += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics (per namespace and in total)."""
+        totals = FlightCounters()
+        for counters in self._counters.values():
+            totals.calls += counters.calls
+            totals.executions += counters.executions
+            totals.coalesced += counters.coalesced
+            totals.failures += counters.failures
+        return {
+            "in_flight": len(self._in_flight),
+            "total": totals.to_dict(),
+            "namespaces": {
+                namespace: counters.to_dict()
+                for namespace, counters in sorted(self._counters.items())
+            }
+        }
+
+
+# Global singleton instance
+single_flight = SingleFlight()
@@ -0,0 +1,333 @@
+"""
+Snapshot Service - Versioned on-disk cache of derived backend state.
+
+Startup derives a lot of state from the master parquet files (flattened feature
+table, filter options, alignment segment map, activation blob). This service
+persists that state under a cache directory as Arrow IPC / npy / raw files and,
+on the next boot, memory-maps it back when the fingerprints (size + mtime) of
+the source files still match.
+
+Layout:
+    <snapshot_dir>/<section>/<key>/manifest.json
+    <snapshot_dir>/<section>/<key>/<artifact files>
+
+The key is a hash of SNAPSHOT_FORMAT_VERSION and the source fingerprints, so a
+changed source file (or a format bump) simply misses and a fresh snapshot is
+written next to the stale ones, which are pruned. Sections whose rebuild is
+expensive can fingerprint their sources by content hash instead of mtime, so
+touching or re-copying an unchanged file still hits.
+
+Writers are given the fingerprint taken before the sources were read, and drop
+the snapshot if the sources changed while the state was being built, so data
+derived from an old file is never stored under the new file's key.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout or the meaning of any snapshotted artifact changes
+SNAPSHOT_FORMAT_VERSION = 1
+
+DEFAULT_SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "../data/.snapshots")
+SNAPSHOTS_ENABLED = os.getenv("SNAPSHOTS_ENABLED", "1").lower() not in ("0", "false", "no")
+
+MANIFEST_FILE = "manifest.json"
+
+# Content hashes by (path, size, mtime_ns), so an unchanged file is hashed once per process
+_content_hashes: Dict[Tuple[str, int, int], str] = {}
+
+
+def content_hash(path: Path, size: int, mtime_ns: int) -> str:
+    """SHA-256 of a file's content (memoized while size and mtime are unchanged)."""
+    key = (str(path), size, mtime_ns)
+    digest = _content_hashes.get(key)
+    if digest is None:
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(block)
+        digest = hasher.hexdigest()
+        _content_hashes[key] = digest
+    return digest
+
+
+def fingerprint_sources(sources: Sequence[Path], by_content: bool = False) -> List[Dict[str, Any]]:
+    """
+    Cheap fingerprint of source files (path, size, mtime), or (path, size, sha256).
+
+    Missing files are recorded as such so that a file appearing later also
+    invalidates the snapshot.
+
+    Args:
+        sources: Source file paths the derived state depends on
+        by_content: Identify files by content hash instead of mtime
+
+    Returns:
+        List of {path, size, mtime_ns | sha256} dicts in source order
+    """
+    fingerprint = []
+    for source in sources:
+        path = Path(source)
+        try:
+            stat = path.stat()
+            entry = {"path": str(path.resolve()), "size": stat.st_size}
+            if by_content:
+                entry["sha256"] = content_hash(path, stat.st_size, stat.st_mtime_ns)
+            else:
+                entry["mtime_ns"] = stat.st_mtime_ns
+            fingerprint.append(entry)
+        except FileNotFoundError:
+            fingerprint.append({"path": str(path.resolve()), "size": None, "mtime_ns": None})
+    return fingerprint
+
+
+def snapshot_key(fingerprint: List[Dict[str, Any]]) -> str:
+    """Stable key for a fingerprint under the current snapshot format version."""
+    payload = json.dumps(
+        {"version": SNAPSHOT_FORMAT_VERSION, "sources": fingerprint},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class Snapshot:
+    """
+    Read access to one stored snapshot directory.
+
+    Frames are opened with Arrow IPC memory mapping and arrays with numpy mmap,
+    so loading a snapshot costs little more than the page faults it triggers.
+    """
+
+    def __init__(self, path: Path, manifest: Dict[str, Any]):
+        self.path = path
+        self.manifest = manifest
+
+    def has(self, name: str) -> bool:
+        return name in self.manifest.get("artifacts", {})
+
+    def _artifact_path(self, name: str) -> Path:
+        return self.path / self.manifest["artifacts"][name]
+
+    def read_frame(self, name: str) -> pl.DataFrame:
+        """Memory-map an Arrow IPC artifact."""
+        return pl.read_ipc(self._artifact_path(name), memory_map=True)
+
+    def read_array(self, name: str) -> np.ndarray:
+        """Memory-map an npy artifact (read-only)."""
+        return np.load(self._artifact_path(name), mmap_mode="r")
+
+    def read_bytes(self, name: str) -> bytes:
+        """Read a raw bytes artifact."""
+        return self._artifact_path(name).read_bytes()
+
+    def map_bytes(self, name: str) -> memoryview:
+        """Memory-map a raw bytes artifact (read-only view; pages are loaded on access)."""
+        with open(self._artifact_path(name), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return memoryview(b"")
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def read_json(self, name: str) -> Any:
+        """Read a JSON artifact."""
+        with open(self._artifact_path(name), "r") as f:
+            return json.load(f)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.manifest.get("metadata", {})
+
+
+class SnapshotWriter:
+    """
+    Collects artifacts into a temporary directory and publishes them atomically.
+
+    Use as a context manager; the snapshot only becomes visible (via rename)
+    if the block completes without raising and the sources still match the
+    fingerprint the state was built from.
+    """
+
+    def __init__(
+        self,
+        store: "SnapshotStore",
+        section: str,
+        sources: Sequence[Path],
+        fingerprint: List[Dict[str, Any]],
+        by_content: bool = False
+    ):
+        self.store = store
+        self.section = section
+        self.sources = sources
+        self.fingerprint = fingerprint
+        self.by_content = by_content
+        self.key = snapshot_key(fingerprint)
+        self.artifacts: Dict[str, str] = {}
+        self.metadata: Dict[str, Any] = {}
+        self._tmp_dir: Optional[Path] = None
+
+    def __enter__(self) -> "SnapshotWriter":
+        section_dir = self.store.section_dir(self.section)
+        section_dir.mkdir(parents=True, exist_ok=True)
+        self._tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=section_dir))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            return False
+
+        if fingerprint_sources(self.sources, self.by_content) != self.fingerprint:
+            # The sources were replaced during the build; the state is stale
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            logger.warning(f"[SnapshotStore] Sources of {self.section} changed during the build, snapshot dropped")
+            return False
+
+        manifest = {
+            "version": SNAPSHOT_FORMAT_VERSION,
+            "section": self.section,
+            "sources": self.fingerprint,
+            "artifacts": self.artifacts,
+            "metadata": self.metadata
+        }
+        with open(self._tmp_dir / MANIFEST_FILE, "w") as f:
+            json.dump(manifest, f)
+
+        target = self.store.section_dir(self.section) / self.key
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(self._tmp_dir, target)
+        self.store.prune(self.section, keep=self.key)
+        logger.info(f"[SnapshotStore] Wrote snapshot {self.section}/{self.key} ({len(self.artifacts)} artifacts)")
+        return False
+
+    def write_frame(self, name: str, df: pl.DataFrame):
+        """Store a DataFrame as uncompressed Arrow IPC (required for memory mapping)."""
+        filename = f"{name}.arrow"
+        df.write_ipc(self._tmp_dir / filename, compression="uncompressed")
+        self.artifacts[name] = filename
+
+    def write_array(self, name: str, array: np.ndarray):
+        """Store a numpy array as npy."""
+        filename = f"{name}.npy"
+        np.save(self._tmp_dir / filename, np.ascontiguousarray(array))
+        self.artifacts[name] = filename
+
+    def write_bytes(self, name: str, data: bytes):
+        """Store raw bytes."""
+        filename = f"{name}.bin"
+        (self._tmp_dir / filename).write_bytes(data)
+        self.artifacts[name] = filename
+
+    def write_json(self, name: str, data: Any):
+        """Store a JSON-serializable object."""
+        filename = f"{name}.json"
+        with open(self._tmp_dir / filename, "w") as f:
+            json.dump(data, f)
+        self.artifacts[name] = filename
+
+
+class SnapshotStore:
+    """
+    Versioned on-disk cache of derived state, keyed by source fingerprints.
+
+    Each consumer uses its own section (e.g. "feature_store", "alignment") and
+    declares the source files its state is derived from.
+    """
+
+    def __init__(self, snapshot_dir: str = DEFAULT_SNAPSHOT_DIR, enabled: bool = SNAPSHOTS_ENABLED):
+        self.snapshot_dir = Path(snapshot_dir)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def section_dir(self, section: str) -> Path:
+        return self.snapshot_dir / section
+
+    def load(self, section: str, sources: Sequence[Path], by_content: bool = False) -> Optional[Snapshot]:
+        """
+        Open the snapshot for a section if one matches the current sources.
+
+        Args:
+            section: Snapshot section name
+            sources: Source files the section's state is derived from
+            by_content: Match sources by content hash instead of mtime
+
+        Returns:
+            Snapshot, or None on a miss (or when snapshots are disabled)
+        """
+        if not self.enabled:
+            return None
+
+        fingerprint = fingerprint_sources(sources, by_content)
+        path = self.section_dir(section) / snapshot_key(fingerprint)
+        manifest_path = path / MANIFEST_FILE
+
+        try:
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        if manifest.get("version") != SNAPSHOT_FORMAT_VERSION or manifest.get("sources") != fingerprint:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        logger.info(f"[SnapshotStore] Snapshot hit: {section}/{path.name}")
+        return Snapshot(path, manifest)
+
+    def writer(
+        self,
+        section: str,
+        sources: Sequence[Path],
+        fingerprint: List[Dict[str, Any]],
+        by_content: bool = False
+    ) -> Optional[SnapshotWriter]:
+        """
+        Start writing a snapshot for a section.
+
+        Args:
+            section: Snapshot section name
+            sources: Source files the section's state is derived from
+            fingerprint: fingerprint_sources() of the sources, taken before they were read
+            by_content: Fingerprint sources by content hash (must match load())
+
+        Returns:
+            SnapshotWriter context manager, or None when snapshots are disabled
+        """
+        if not self.enabled:
+            return None
+        return SnapshotWriter(self, section, sources, fingerprint, by_content)
+
+    def prune(self, section: str, keep: str):
+        """Remove every snapshot of a section except the given key."""
+        section_dir = self.section_dir(section)
+        if not section_dir.exists():
+            return
+        for child in section_dir.iterdir():
+            if child.name != keep and not child.name.startswith(".tmp-"):
+                shutil.rmtree(child, ignore_errors=True)
+
+    def get_stats(self) -> dict:
+        """Get snapshot statistics."""
+        return {
+            "enabled": self.enabled,
+            "snapshot_dir": str(self.snapshot_dir),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# Global singleton instance
+snapshot_store = SnapshotStore()
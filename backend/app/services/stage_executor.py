@@ -0,0 +1,267 @@
+"""
+Stage Executor - Dependency-aware concurrent execution of independent work.
+
+A stage is a named callable plus the names of the stages it depends on. Stages
+run on a thread pool as soon as all of their dependencies have finished and
+receive the dependencies' results as keyword arguments. Coroutine functions are
+run to completion on a private event loop inside the worker thread, so async
+initializers that do blocking work do not stall the caller's loop.
+
+Every run records per-stage timings and the critical path (the chain of
+dependencies that determined the total wall time), e.g. for startup and for
+the table-data pipeline.
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    """A unit of work and the stages whose results it needs."""
+    name: str
+    func: Callable[..., Any]
+    depends_on: List[str] = field(default_factory=list)
+
+
+@dataclass
+class StageTiming:
+    """Timing of one stage, relative to the start of the run (seconds)."""
+    name: str
+    depends_on: List[str]
+    start: float = 0.0
+    end: float = 0.0
+    thread: Optional[str] = None
+    status: str = "pending"
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "start": round(self.start, 4),
+            "end": round(self.end, 4),
+            "duration": round(self.duration, 4),
+            "thread": self.thread,
+            "depends_on": self.depends_on,
+            "status": self.status,
+            "error": self.error
+        }
+
+
+class StageExecutionError(RuntimeError):
+    """Raised when a stage fails; dependents of the failed stage are not run."""
+
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class StageExecutor:
+    """
+    Runs a DAG of stages concurrently on a thread pool.
+
+    Usage:
+        executor = StageExecutor("startup")
+        executor.add("data", load_data)
+        executor.add("index", build_index, depends_on=["data"])  # build_index(data=...)
+        results = await executor.run()
+    """
+
+    def __init__(self, name: str, max_workers: Optional[int] = None, thread_pool: Optional[ThreadPoolExecutor] = None):
+        """
+        Args:
+            name: Name used in logs and reports
+            max_workers: Size of the private thread pool (defaults to one per stage)
+            thread_pool: Shared pool to run on instead of a private one
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.thread_pool = thread_pool
+        self._stages: Dict[str, Stage] = {}
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, StageTiming] = {}
+        self.total_seconds = 0.0
+
+    def add(self, name: str, func: Callable[..., Any], depends_on: Sequence[str] = ()) -> "StageExecutor":
+        """
+        Add a stage.
+
+        Args:
+            name: Unique stage name (also the keyword its result is passed as)
+            func: Sync or async callable taking the dependency results as kwargs
+            depends_on: Names of stages that must finish first
+        """
+        if name in self._stages:
+            raise ValueError(f"Duplicate stage name: {name}")
+        self._stages[name] = Stage(name=name, func=func, depends_on=list(depends_on))
+        return self
+
+    def _validate(self):
+        for stage in self._stages.values():
+            for dependency in stage.depends_on:
+                if dependency not in self._stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dependency}'")
+
+        # Kahn's algorithm: every stage must become runnable
+        remaining = {name: set(stage.depends_on) for name, stage in self._stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle among stages: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def _invoke(self, stage: Stage, run_start: float) -> Any:
+        """Run one stage in the current (worker) thread."""
+        timing = self.timings[stage.name]
+        timing.thread = threading.current_thread().name
+        timing.start = time.perf_counter() - run_start
+        timing.status = "running"
+        try:
+            kwargs = {dependency: self.results[dependency] for dependency in stage.depends_on}
+            if inspect.iscoroutinefunction(stage.func):
+                result = asyncio.run(stage.func(**kwargs))
+            else:
+                result = stage.func(**kwargs)
+            timing.status = "done"
+            return result
+        except BaseException as e:
+            timing.status = "failed"
+            timing.error = str(e)
+            raise
+        finally:
+            timing.end = time.perf_counter() - run_start
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Execute every stage, starting each one as soon as its dependencies finish.
+
+        Returns:
+            Mapping of stage name -> result
+
+        Raises:
+            StageExecutionError: If a stage raises (after in-flight stages finish)
+        """
+        self._validate()
+        self.results = {}
+        self.timings = {
+            name: StageTiming(name=name, depends_on=stage.depends_on)
+            for name, stage in self._stages.items()
+        }
+
+        loop = asyncio.get_running_loop()
+        pool = self.thread_pool or ThreadPoolExecutor(
+            max_workers=self.max_workers or max(1, len(self._stages)),
+            thread_name_prefix=f"{self.name}-stage"
+        )
+        run_start = time.perf_counter()
+        pending = dict(self._stages)
+        running: Dict[asyncio.Future, str] = {}
+        failure: Optional[StageExecutionError] = None
+
+        try:
+            while pending or running:
+                if failure is None:
+                    ready = [
+                        stage for stage in pending.values()
+                        if all(dependency in self.results for dependency in stage.depends_on)
+                    ]
+                    for stage in ready:
+                        del pending[stage.name]
+                        future = loop.run_in_executor(pool, self._invoke, stage, run_start)
+                        running[future] = stage.name
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self.results[name] = future.result()
+                    except BaseException as e:
+                        if failure is None:
+                            failure = StageExecutionError(name, e)
+        finally:
+            if self.thread_pool is None:
+                pool.shutdown(wait=False)
+            self.total_seconds = time.perf_counter() - run_start
+
+        for name in pending:
+            self.timings[name].status = "skipped"
+
+        if failure is not None:
+            self.log_report(level=logging.ERROR)
+            raise failure
+
+        return self.results
+
+    def critical_path(self) -> List[str]:
+        """
+        Chain of stages that determined the total wall time.
+
+        Starts at the stage that finished last and repeatedly follows the
+        dependency that finished last (i.e. the one the stage waited for).
+        """
+        finished = [timing for timing in self.timings.values() if timing.status == "done"]
+        if not finished:
+            return []
+
+        current = max(finished, key=lambda timing: timing.end)
+        path = [current.name]
+        while current.depends_on:
+            current = max(
+                (self.timings[dependency] for dependency in current.depends_on),
+                key=lambda timing: timing.end
+            )
+            path.append(current.name)
+        return list(reversed(path))
+
+    def get_report(self) -> Dict[str, Any]:
+        """Structured timing report of the last run."""
+        critical_path = self.critical_path()
+        return {
+            "name": self.name,
+            "total_seconds": round(self.total_seconds, 4),
+            "sequential_seconds": round(sum(timing.duration for timing in self.timings.values()), 4),
+            "critical_path": critical_path,
+            "critical_path_seconds": round(
+                sum(self.timings[name].duration for name in critical_path), 4
+            ),
+            "stages": {name: timing.to_dict() for name, timing in self.timings.items()}
+        }
+
+    def log_report(self, level: int = logging.INFO):
+        """Log a per-stage timing breakdown and the critical path."""
+        report = self.get_report()
+        logger.log(
+            level,
+            f"[{self.name}] {len(self.timings)} stages in {report['total_seconds']:.2f}s "
+            f"(sequential sum {report['sequential_seconds']:.2f}s)"
+        )
+        for name, timing in sorted(self.timings.items(), key=lambda item: item[1].start):
+            logger.log(
+                level,
+                f"[{self.name}]   {name:<24} {timing.status:<8} "
+                f"start={timing.start:7.3f}s duration={timing.duration:7.3f}s"
+                + (f" error={timing.error}" if timing.error else "")
+            )
+        logger.log(
+            level,
+            f"[{self.name}] Critical path: {' -> '.join(report['critical_path']) or '-'} "
+            f"({report['critical_path_seconds']:.2f}s)"
+        )
@@ -0,0 +1,373 @@
+"""
+Table Cache Service - Pre-computed table-data response served with an ETag.
+
+/api/table-data only supports the default configuration, so its response is the
+same for every request until the data changes. This service builds it once at
+startup (and again whenever the master data, auxiliary files or alignments are
+reloaded), serializes it to JSON, precompresses it (gzip, zstd, brotli; see
+compression.py) and keeps every body in memory together with a strong ETag
+(SHA-256 of the JSON). A client that revalidates with If-None-Match gets a 304
+without any table work.
+
+Every row is also kept as its own JSON fragment, so windows of the table
+(offset/limit under a server-side sort order) are answered by joining the
+fragments of the visible rows. Sort permutations are computed once per sort key
+and data generation.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..models import fast_json
+from ..models.common import Filters
+from .compression import ETAG_SUFFIXES, Variant, precompress, variant_stats
+from .data_constants import COL_DECODER_SIMILARITY, COL_DECODER_SIMILARITY_MERGE_THRESHOLD
+from .table_data_service import TableDataService
+
+# Import for type hints only (avoids circular imports)
+if TYPE_CHECKING:
+    from .alignment_service import AlignmentService
+    from .data_service import DataService
+
+logger = logging.getLogger(__name__)
+
+# Feature-level sort keys of the table window API -> store column (averaged per feature)
+TABLE_SORT_COLUMNS = {
+    "quality_score": "quality_score",
+    "score_embedding": "score_embedding",
+    "score_fuzz": "score_fuzz",
+    "score_detection": "score_detection",
+    "semsim_mean": "semsim_mean",
+    COL_DECODER_SIMILARITY: COL_DECODER_SIMILARITY_MERGE_THRESHOLD
+}
+
+# Sort key prefix for paging through a similarity-sort result
+SIMILARITY_SORT_PREFIX = "similarity:"
+
+# Sort permutations kept per table generation
+MAX_CACHED_PERMUTATIONS = 64
+
+
+@dataclass
+class TableBlob:
+    """One generation of the pre-computed table (swapped in as a whole)."""
+    json_body: bytes
+    variants: Dict[str, Variant]
+    etag: str
+    rows_json: List[bytes]
+    metadata: Dict
+    feature_ids: np.ndarray
+    sort_values: Dict[str, np.ndarray]
+    built_at: float
+    build_seconds: float
+    permutations: Dict[Tuple[str, bool], np.ndarray] = field(default_factory=dict)
+
+    @property
+    def feature_count(self) -> int:
+        return len(self.feature_ids)
+
+
+class TableCacheService:
+    """
+    Pre-computed default-configuration table-data response.
+
+    The JSON body, its compressed variants, the ETag and the per-row fragments
+    are published together as one TableBlob, so a request always sees one
+    consistent generation.
+    """
+
+    def __init__(self):
+        self.data_service: Optional["DataService"] = None
+        self.alignment_service: Optional["AlignmentService"] = None
+        self._table_service: Optional[TableDataService] = None
+        self._blob: Optional[TableBlob] = None
+        self._lock = threading.Lock()
+
+        # Serving counters
+        self.served = 0
+        self.served_by_encoding: Counter = Counter()
+        self.not_modified = 0
+        self.windows_served = 0
+
+    async def initialize(self, data_service: "DataService", alignment_service: Optional["AlignmentService"] = None):
+        """
+        Build the table blob for the current data generation.
+
+        Called at application startup once DataService (and AlignmentService) are ready.
+        """
+        self.data_service = data_service
+        self.alignment_service = alignment_service
+        await self.rebuild()
+
+    async def rebuild(self) -> bool:
+        """
+        Rebuild the blob in a worker thread and swap it in. The previous blob
+        keeps being served until the swap, and is kept if the rebuild fails.
+
+        Returns:
+            True if a new blob was published
+        """
+        if self.data_service is None or not self.data_service.is_ready():
+            logger.warning("[TableCacheService] DataService not ready, skipping table build")
+            return False
+
+        try:
+            table_service, blob = await asyncio.to_thread(self._build_blob)
+        except Exception as e:
+            logger.error(f"[TableCacheService] Table build failed, keeping current blob: {e}", exc_info=True)
+            return False
+
+        # Publish (no await between assignments)
+        self._table_service = table_service
+        self._blob = blob
+        return True
+
+    def _build_blob(self) -> Tuple[TableDataService, TableBlob]:
+        """Run the table pipeline once and serialize the result."""
+        start_time = time.time()
+
+        # Fresh service per generation: default explainers/scorers are re-detected
+        table_service = TableDataService(self.data_service, self.alignment_service)
+        response = asyncio.run(table_service.get_table_data(Filters()))
+
+        # Full body = row fragments joined into the response envelope
+        # (rows are constructed without validation, see app.models.fast_json)
+        rows_json = [fast_json.dumps(row) for row in response.features]
+        envelope = {name: value for name, value in response.__dict__.items() if name != "features"}
+        body = b'{"features":[' + b",".join(rows_json) + b"]," + fast_json.dumps(envelope)[1:]
+        variants = precompress(body)
+
+        feature_ids = np.array([row.feature_id for row in response.features], dtype=np.int64)
+        built_at = time.time()
+        blob = TableBlob(
+            json_body=body,
+            variants=variants,
+            etag=hashlib.sha256(body).hexdigest()[:32],
+            rows_json=rows_json,
+            metadata=fast_json.loads(fast_json.dumps(
+                {name: value for name, value in envelope.items() if name != "total_features"}
+            )),
+            feature_ids=feature_ids,
+            sort_values=self._compute_sort_values(feature_ids),
+            built_at=built_at,
+            build_seconds=built_at - start_time
+        )
+
+        sizes = ", ".join(
+            f"{len(variant.body) / 1024 / 1024:.2f} MB {encoding}" for encoding, variant in variants.items()
+        )
+        logger.info(
+            f"[TableCacheService] ✅ Table blob ready: {blob.feature_count} features, "
+            f"{len(body) / 1024 / 1024:.2f} MB JSON, {sizes}, "
+            f"ETag {blob.etag} in {blob.build_seconds:.2f}s"
+        )
+        return table_service, blob
+
+    def _compute_sort_values(self, feature_ids: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Per-feature sort values aligned with the table rows (NaN where missing).
+
+        Scores are averaged over every explainer/scorer row of the feature; the
+        decoder metric is feature-level.
+        """
+        index = self.data_service.get_metric_index()
+        all_rows = index.row_mask(None)
+        columns = self.data_service.get_feature_store().columns
+
+        sort_values = {}
+        for sort_key, column in TABLE_SORT_COLUMNS.items():
+            if column not in columns:
+                continue
+            if column == COL_DECODER_SIMILARITY_MERGE_THRESHOLD:
+                ids, values = index.feature_firsts(column, all_rows)
+            else:
+                ids, values = index.feature_means(column, all_rows)
+            aligned = np.full(len(feature_ids), np.nan)
+            positions = np.searchsorted(ids, feature_ids)
+            found = positions < len(ids)
+            found[found] = ids[positions[found]] == feature_ids[found]
+            aligned[found] = values[positions[found]]
+            sort_values[sort_key] = aligned
+        return sort_values
+
+    def is_ready(self) -> bool:
+        """Check if a blob is available."""
+        return self._blob is not None
+
+    def serves(self, filters: Filters) -> bool:
+        """Whether a request with these filters is answered by the cached blob."""
+        table_service = self._table_service
+        return self.is_ready() and table_service is not None and table_service.is_default_request(filters)
+
+    def get_table_service(self) -> Optional[TableDataService]:
+        """
+        TableDataService of the current generation.
+
+        Its full-table lookups were built with the blob, so filtered table
+        requests on it only mask rows and rebuild the selected features.
+        """
+        return self._table_service
+
+    def encodings(self) -> List[str]:
+        """Content encodings the current blob has precompressed variants for."""
+        blob = self._blob
+        return list(blob.variants) if blob is not None else []
+
+    def etag(self, encoding: Optional[str] = None) -> Optional[str]:
+        """
+        Strong entity tag of one representation (quoted, per RFC 9110).
+
+        Each compressed representation gets its own tag since its bytes differ.
+        """
+        blob = self._blob
+        if blob is None:
+            return None
+        return f'"{blob.etag}-{ETAG_SUFFIXES[encoding]}"' if encoding else f'"{blob.etag}"'
+
+    def matches(self, if_none_match: Optional[str], encoding: Optional[str] = None) -> bool:
+        """
+        Whether an If-None-Match header names the representation about to be sent.
+
+        Only the tag of the negotiated encoding counts: a 304 carries that tag,
+        so matching another representation would relabel the client's cached bytes.
+        """
+        if not if_none_match or self._blob is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return self.etag(encoding) in tags
+
+    def get_body(self, encoding: Optional[str] = None) -> Optional[bytes]:
+        """Get the pre-computed JSON body (compressed with encoding, if given)."""
+        blob = self._blob
+        if blob is None:
+            return None
+        return blob.variants[encoding].body if encoding else blob.json_body
+
+    def sort_keys(self) -> List[str]:
+        """Sort keys available for the table window API (besides feature_id and similarity results)."""
+        blob = self._blob
+        return sorted(blob.sort_values) if blob is not None else []
+
+    def get_window(
+        self,
+        offset: int,
+        limit: int,
+        sort_by: str = "feature_id",
+        descending: bool = False,
+        similarity_scores: Optional[Dict[int, float]] = None
+    ) -> bytes:
+        """
+        JSON body of one window of the table under a server-side sort order.
+
+        Missing values sort last in both directions; ties keep feature_id order.
+
+        Args:
+            offset: Index of the first row in sort order
+            limit: Maximum number of rows
+            sort_by: "feature_id", a key of sort_keys(), or "similarity:<result_id>"
+            descending: Sort descending
+            similarity_scores: feature_id -> score of the similarity result named by sort_by
+
+        Returns:
+            JSON body (TableWindowResponse)
+
+        Raises:
+            ValueError: If sort_by is unknown
+        """
+        blob = self._blob
+        if blob is None:
+            raise RuntimeError("Table cache not ready")
+
+        order = self._get_permutation(blob, sort_by, descending, similarity_scores)
+        visible = order[offset:offset + limit]
+
+        envelope = {
+            "offset": offset,
+            "limit": limit,
+            "total_features": blob.feature_count,
+            "sort_by": sort_by,
+            "descending": descending,
+            "version": blob.etag,
+            **blob.metadata
+        }
+        self.windows_served += 1
+        return (
+            b'{"features":[' + b",".join(blob.rows_json[i] for i in visible) + b"],"
+            + json.dumps(envelope, separators=(",", ":")).encode("utf-8")[1:]
+        )
+
+    def _get_permutation(
+        self,
+        blob: TableBlob,
+        sort_by: str,
+        descending: bool,
+        similarity_scores: Optional[Dict[int, float]]
+    ) -> np.ndarray:
+        """Row order for a sort key (cached per blob)."""
+        key = (sort_by, descending)
+        order = blob.permutations.get(key)
+        if order is not None:
+            return order
+
+        if sort_by == "feature_id":
+            order = np.arange(blob.feature_count)
+            if descending:
+                order = order[::-1].copy()
+        else:
+            if sort_by.startswith(SIMILARITY_SORT_PREFIX):
+                if similarity_scores is None:
+                    raise ValueError(f"Unknown similarity result: {sort_by}")
+                values = np.array(
+                    [similarity_scores.get(int(feature_id), np.nan) for feature_id in blob.feature_ids],
+                    dtype=np.float64
+                )
+            elif sort_by in blob.sort_values:
+                values = blob.sort_values[sort_by]
+            else:
+                raise ValueError(
+                    f"Unknown sort key '{sort_by}'. Use feature_id, one of {sorted(blob.sort_values)} "
+                    f"or {SIMILARITY_SORT_PREFIX}<result_id>"
+                )
+            # Stable sort: NaN sorts last, ties keep feature_id order
+            order = np.argsort(-values if descending else values, kind="stable")
+
+        with self._lock:
+            if len(blob.permutations) >= MAX_CACHED_PERMUTATIONS:
+                blob.permutations.clear()
+            blob.permutations[key] = order
+        return order
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics (including the stage timings of the last table pipeline run)."""
+        blob = self._blob
+        table_service = self._table_service
+        return {
+            "ready": blob is not None,
+            "etag": blob.etag if blob else None,
+            "feature_count": blob.feature_count if blob else 0,
+            "json_size_mb": len(blob.json_body) / 1024 / 1024 if blob else 0,
+            "encodings": variant_stats(blob.variants, len(blob.json_body)) if blob else {},
+            "built_at": blob.built_at if blob else None,
+            "build_seconds": round(blob.build_seconds, 3) if blob else 0,
+            "cached_permutations": len(blob.permutations) if blob else 0,
+            "served": self.served,
+            "served_by_encoding": dict(self.served_by_encoding),
+            "not_modified": self.not_modified,
+            "windows_served": self.windows_served,
+            "pipeline": table_service.pipeline_report if table_service else None
+        }
+
+
+# Global singleton instance
+table_cache_service = TableCacheService()
@@ -15,20 +15,18 @@ Clean 4-step flow:
 4. Build response (pure assembly, no calculations)
 """
 
+import asyncio
 import polars as pl
 import numpy as np
 import logging
 import time
-from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 from pathlib import Path
 
 from ..models.common import Filters
-from ..models.responses import (
-    FeatureTableDataResponse, FeatureTableRow,
-    ExplainerScoreData, ScorerScoreSet,
-    HighlightedExplanation
-)
-from .consistency_service import ExplainerDataBuilder
+from ..models.responses import FeatureTableDataResponse, FeatureTableRow
+from .stage_executor import StageExecutor
 from .alignment_service import AlignmentService
 from .data_constants import (
     COL_DECODER_SIMILARITY,
@@ -49,6 +47,47 @@ MODEL_NAME_MAP = {
     'openai/gpt-4o-mini': 'openai'
 }
 
+# Score slots of ScorerScoreSet (scorers are assigned in sorted order)
+SCORER_SLOTS = ("s1", "s2", "s3")
+
+# Fields of InterFeatureSimilarityInfo (columnar decoder_inter_feature arrays)
+INTER_FEATURE_FIELDS = (
+    "pattern_type", "semantic_similarity", "char_jaccard", "word_jaccard",
+    "max_char_ngram", "max_word_ngram",
+    "main_char_ngram_positions", "similar_char_ngram_positions",
+    "main_word_ngram_positions", "similar_word_ngram_positions"
+)
+
+# Fields of HighlightSegment with their defaults (alignment segments omit unset fields)
+HIGHLIGHT_SEGMENT_DEFAULTS = {"text": None, "highlight": False, "color": None, "style": None, "metadata": None}
+
+
+@dataclass
+class TableLookups:
+    """Per-feature frames of the full table, shared by every filtered view."""
+    # feature_id, llm_explainer, explanation_text
+    explanations: pl.DataFrame
+    # feature_id, explainer_1, explainer_2, cosine_similarity (both orderings)
+    pairwise: pl.DataFrame
+    # feature_id, decoder_similarity (list of DecoderSimilarFeature structs), decoder_similarity_merge_threshold
+    decoder: pl.DataFrame
+
+
+def _round_scores(series: pl.Series) -> pl.Series:
+    """
+    Round a score column to 3 decimals exactly like Python's round(value, 3).
+
+    Values whose scaled form is too close to a .5 tie for float arithmetic to
+    decide are re-rounded with round() itself.
+    """
+    values = series.cast(pl.Float64).to_numpy().astype(np.float64, copy=True)
+    scaled = values * 1000.0
+    rounded = np.round(scaled) / 1000.0
+    near_tie = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(float(values[i]), 3)
+    return pl.Series(series.name, rounded).fill_nan(None)
+
 
 class TableDataService:
     """Service for generating table visualization data."""
@@ -68,6 +107,11 @@ class TableDataService:
         self._default_explainers = None
         self._default_scorers = None
 
+        # Full-table lookups (built on first use, see _fetch_scores_and_lookups)
+        self._lookups: Optional[TableLookups] = None
+        # Per-stage timings of the last concurrent pipeline run (StageExecutor report)
+        self.pipeline_report: Optional[Dict[str, Any]] = None
+
     def _get_default_explainers(self) -> List[str]:
         """Get all unique explainers from the dataset."""
         if self._default_explainers is None:
@@ -99,6 +143,11 @@ class TableDataService:
         3. Extract pairwise similarity from nested semantic_similarity structure
         4. Build response (pure assembly, no calculations)
 
+        Steps 2-3 (and the decoder / inter-feature lookups) are computed once for
+        the full table and kept on this instance. Any Filters are then served by
+        masking the score rows (through the store's filter cache), rebuilding the
+        rows of the selected features and recomputing the global stats on the subset.
+
         Performance monitoring: Logs timing for each step to identify bottlenecks.
 
         Args:
@@ -115,72 +164,38 @@ class TableDataService:
         if not self.data_service.is_ready():
             raise RuntimeError("DataService not ready")
 
-        # Get default explainers/scorers from data
-        default_explainers = self._get_default_explainers()
-        default_scorers = self._get_default_scorers()
-
-        # Validate filters are default (all explainers/scorers selected)
-        if not self._is_default_configuration(filters, default_explainers, default_scorers):
-            raise ValueError(
-                f"Only default filters are supported. "
-                f"All {len(default_explainers)} explainers must be selected, "
-                f"with no sae_id or explanation_method filters applied."
-            )
+        is_default = self.is_default_request(filters)
 
-        # STEP 1: Fetch scores from features.parquet
-        step_start = time.time()
-        scores_df = self._fetch_scores(filters)
-        logger.info(f"✓ Step 1 (Fetch scores): {time.time() - step_start:.3f}s")
+        # STEPS 1-4: Scores of the selected rows + full-table lookups (built
+        # concurrently on the first call, reused by every filtered view)
+        scores_df, lookups = await self._fetch_scores_and_lookups(filters)
 
         # Extract metadata
         feature_ids = sorted(scores_df["feature_id"].unique().to_list())
-        explainer_ids = scores_df["llm_explainer"].unique().to_list()
+        # First-appearance order keeps the response (and its ETag) deterministic
+        explainer_ids = scores_df["llm_explainer"].unique(maintain_order=True).to_list()
         # Scorer IDs are extracted from nested scores structure
         scorer_ids = sorted(scores_df["llm_scorer"].unique().to_list())
 
-        # Create scorer mapping
-        scorer_map = {scorer: f"s{i+1}" for i, scorer in enumerate(scorer_ids)}
-
-        # OPTIMIZATION: Preload all explanation texts in single batch query (Phase 2)
-        if self.alignment_service and self.alignment_service.is_ready:
-            step_start = time.time()
-            self.alignment_service.preload_explanations(feature_ids, explainer_ids)
-            logger.info(f"✓ Preload alignment: {time.time() - step_start:.3f}s ({len(feature_ids)} features × {len(explainer_ids)} explainers)")
-
-        # STEP 2: Fetch explanations from features.parquet
-        step_start = time.time()
-        explanations_df = self._fetch_explanations(filters)
-        logger.info(f"✓ Step 2 (Fetch explanations): {time.time() - step_start:.3f}s")
-
-        # STEP 3: Fetch pairwise semantic similarity data from nested structure
-        step_start = time.time()
-        pairwise_df = self._fetch_pairwise_similarity(feature_ids, explainer_ids)
-        logger.info(f"✓ Step 3 (Fetch pairwise similarity - VECTORIZED): {time.time() - step_start:.3f}s")
-
-        # STEP 4: Fetch inter-feature activation similarity data
-        step_start = time.time()
-        interfeature_df = self._fetch_interfeature_similarity(feature_ids)
-        logger.info(f"✓ Step 4 (Fetch interfeature similarity): {time.time() - step_start:.3f}s")
-
         # STEP 5: Build response (pure assembly, no calculations)
         step_start = time.time()
-        features = self._build_feature_rows_simple(
-            scores_df, explanations_df, pairwise_df, interfeature_df,
-            feature_ids, explainer_ids, scorer_map
-        )
+        features = self._build_feature_rows_simple(scores_df, lookups, explainer_ids, scorer_ids)
         logger.info(f"✓ Step 5 (Build feature rows): {time.time() - step_start:.3f}s")
 
-        # Compute global stats for frontend normalization
+        # Compute global stats for frontend normalization (depend on the selected rows)
         step_start = time.time()
         global_stats = self._compute_global_stats(scores_df, explainer_ids, feature_ids)
         logger.info(f"✓ Global stats (VECTORIZED): {time.time() - step_start:.3f}s")
 
         total_time = time.time() - start_time
         logger.info("=" * 80)
-        logger.info(f"✓ TOTAL TABLE DATA GENERATION TIME: {total_time:.3f}s ({len(features)} features)")
+        logger.info(
+            f"✓ TOTAL TABLE DATA GENERATION TIME: {total_time:.3f}s ({len(features)} features"
+            f"{'' if is_default else ', filtered'})"
+        )
         logger.info("=" * 80)
 
-        return FeatureTableDataResponse(
+        return FeatureTableDataResponse.model_construct(
             features=features,
             total_features=len(features),
             explainer_ids=[MODEL_NAME_MAP.get(exp, exp) for exp in explainer_ids],
@@ -188,27 +203,206 @@ class TableDataService:
             global_stats=global_stats
         )
 
+    async def _fetch_scores_and_lookups(self, filters: Filters) -> Tuple[pl.DataFrame, TableLookups]:
+        """
+        Scores of the rows selected by filters, plus the full-table lookups.
+
+        The lookups (explanations, pairwise similarity, inter-feature similarity,
+        decoder/merge thresholds) are per feature or per (feature, explainer) and
+        do not depend on which rows a request selects, so they are built once per
+        instance and filtered views reuse them as is.
+
+        The first call runs steps 1-4 and the alignment preload as a StageExecutor
+        DAG: stages that read independent data run concurrently on a thread pool
+        (Polars releases the GIL), and the per-stage timings are kept in
+        pipeline_report.
+
+        Args:
+            filters: Filter criteria of the request
+
+        Returns:
+            Tuple of (scores DataFrame of the selected rows, TableLookups)
+        """
+        if self._lookups is not None:
+            step_start = time.time()
+            scores_df = await asyncio.to_thread(self._fetch_scores, filters)
+            logger.info(f"✓ Step 1 (Fetch scores): {time.time() - step_start:.3f}s")
+            return scores_df, self._lookups
+
+        def feature_keys(full_scores: pl.DataFrame) -> Tuple[List[int], List[str]]:
+            return (
+                sorted(full_scores["feature_id"].unique().to_list()),
+                full_scores["llm_explainer"].unique(maintain_order=True).to_list()
+            )
+
+        # STEP 1: Full-table scores (also the request's scores when filters are default)
+        executor = StageExecutor("table-data")
+        executor.add("full_scores", lambda: self._fetch_scores(Filters()))
+        if not self.is_default_request(filters):
+            executor.add("scores", lambda: self._fetch_scores(filters))
+        executor.add("feature_keys", lambda full_scores: feature_keys(full_scores), depends_on=["full_scores"])
+        # STEP 2: Explanations (persistent store lookup)
+        executor.add("explanations", lambda: self._build_explanations_frame(self._fetch_explanations(Filters())))
+        # STEP 3: Pairwise semantic similarity from the nested structure
+        executor.add(
+            "pairwise",
+            lambda feature_keys: self._build_pairwise_frame(self._fetch_pairwise_similarity(*feature_keys)),
+            depends_on=["feature_keys"]
+        )
+        # STEP 4: Inter-feature activation similarity, attached to the decoder-similar features
+        executor.add(
+            "interfeature",
+            lambda feature_keys: self._fetch_interfeature_similarity(feature_keys[0]),
+            depends_on=["feature_keys"]
+        )
+        executor.add(
+            "decoder",
+            lambda full_scores, interfeature: self._build_decoder_frame(full_scores, interfeature),
+            depends_on=["full_scores", "interfeature"]
+        )
+        if self.alignment_service and self.alignment_service.is_ready:
+            # Batch-load explanation texts for highlighting (Phase 2)
+            executor.add(
+                "preload_alignment",
+                lambda feature_keys: self.alignment_service.preload_explanations(*feature_keys),
+                depends_on=["feature_keys"]
+            )
+
+        try:
+            results = await executor.run()
+        finally:
+            self.pipeline_report = executor.get_report()
+        executor.log_report()
+
+        self._lookups = TableLookups(
+            explanations=results["explanations"],
+            pairwise=results["pairwise"],
+            decoder=results["decoder"]
+        )
+        logger.info(
+            f"All lookups pre-computed: {len(self._lookups.explanations)} explanations, "
+            f"{len(self._lookups.pairwise)} pairwise, {len(self._lookups.decoder)} decoder entries"
+        )
+        return results.get("scores", results["full_scores"]), self._lookups
+
+    async def get_columnar_table_data(self, filters: Filters) -> Dict[str, Any]:
+        """
+        Generate the feature table in columnar (struct-of-arrays) form.
+
+        Same content as get_table_data, laid out as flat arrays instead of nested
+        row objects:
+        - per feature: feature_id, decoder_similarity_merge_threshold
+        - per (feature, explainer) cell: explainer (index into explainer_ids),
+          embedding, quality_score, fuzz/detection per scorer slot, explanation_text,
+          highlighted_explanation, semantic_similarity per other explainer
+        - per decoder-similar feature: decoder_feature_id, decoder_cosine_similarity,
+          decoder_inter_feature fields
+        explainer_offsets / decoder_offsets (length n_features + 1) delimit each
+        feature's cells / decoder entries. Cell scores are aggregated by one Polars
+        group_by over the selected score rows; no per-row models are built.
+
+        Args:
+            filters: Filter criteria for data selection
+
+        Returns:
+            Dict matching ColumnarTableDataResponse
+        """
+        start_time = time.time()
+
+        if not self.data_service.is_ready():
+            raise RuntimeError("DataService not ready")
+
+        scores_df, lookups = await self._fetch_scores_and_lookups(filters)
+
+        explainer_ids = scores_df["llm_explainer"].cast(pl.Utf8).unique(maintain_order=True).to_list()
+        scorer_ids = sorted(scores_df["llm_scorer"].cast(pl.Utf8).unique().to_list())
+
+        # One row per (feature, explainer) cell, ordered like the row format
+        cells = (
+            self._build_cells(scores_df, explainer_ids, scorer_ids).lazy()
+            .join(lookups.explanations.lazy(), on=["feature_id", "llm_explainer"], how="left")
+            .sort(["feature_id", "explainer"])
+            .collect()
+        )
+        feature_ids, cell_counts = np.unique(cells["feature_id"].to_numpy(), return_counts=True)
+        features = pl.DataFrame({"feature_id": feature_ids}).join(lookups.decoder, on="feature_id", how="left")
+
+        # Semantic similarity: one column per other explainer (null on the explainer's own cells)
+        semantic_similarity = {}
+        for other in explainer_ids:
+            similarity = (
+                cells.select(["feature_id", "llm_explainer"])
+                .join(
+                    lookups.pairwise.filter(pl.col("explainer_2") == other)
+                    .select(["feature_id", pl.col("explainer_1").alias("llm_explainer"), "cosine_similarity"]),
+                    on=["feature_id", "llm_explainer"],
+                    how="left"
+                )
+            )
+            semantic_similarity[MODEL_NAME_MAP.get(other, other)] = similarity["cosine_similarity"].to_list()
+
+        # Decoder-similar features, flattened with per-feature offsets
+        decoder_lengths = features[COL_DECODER_SIMILARITY].list.len().fill_null(0).to_numpy()
+        decoder_items = (
+            features.select(COL_DECODER_SIMILARITY)
+            .explode(COL_DECODER_SIMILARITY)
+            .unnest(COL_DECODER_SIMILARITY)
+            .filter(pl.col("feature_id").is_not_null())  # empty / null lists
+        )
+        decoder_inter_feature = decoder_items.select(
+            [pl.col("inter_feature_similarity").struct.field(field) for field in INTER_FEATURE_FIELDS]
+        )
+
+        result = {
+            "total_features": len(feature_ids),
+            "explainer_ids": [MODEL_NAME_MAP.get(exp, exp) for exp in explainer_ids],
+            "scorer_ids": scorer_ids,
+            "global_stats": self._compute_global_stats(scores_df, explainer_ids, feature_ids.tolist()),
+            "feature_id": feature_ids.tolist(),
+            "decoder_similarity_merge_threshold": features[COL_DECODER_SIMILARITY_MERGE_THRESHOLD].to_list(),
+            "explainer_offsets": [0] + np.cumsum(cell_counts).tolist(),
+            "explainer": cells["explainer"].to_list(),
+            "embedding": cells["embedding"].to_list(),
+            "quality_score": cells["quality_score"].to_list(),
+            "fuzz": {slot: cells[f"fuzz_{slot}"].to_list() for slot in SCORER_SLOTS},
+            "detection": {slot: cells[f"detection_{slot}"].to_list() for slot in SCORER_SLOTS},
+            "explanation_text": cells["explanation_text"].to_list(),
+            "highlighted_explanation": self._highlighted_explanations(
+                cells["feature_id"].to_list(), cells["llm_explainer"].to_list(), explainer_ids
+            ),
+            "semantic_similarity": semantic_similarity,
+            "decoder_offsets": [0] + np.cumsum(decoder_lengths).tolist(),
+            "decoder_feature_id": decoder_items["feature_id"].to_list(),
+            "decoder_cosine_similarity": decoder_items["cosine_similarity"].to_list(),
+            "decoder_inter_feature": {field: decoder_inter_feature[field].to_list() for field in INTER_FEATURE_FIELDS}
+        }
+
+        logger.info(
+            f"✓ Columnar table data: {len(feature_ids)} features, {len(cells)} cells "
+            f"in {time.time() - start_time:.3f}s"
+        )
+        return result
+
     def _fetch_scores(self, filters: Filters) -> pl.DataFrame:
         """
         STEP 1: Fetch scores from features.parquet (already flattened by DataService).
 
         NOTE: DataService already transforms nested schema to flat during initialization.
-        Assumes default filters (all explainers, 1 scorer). Validation done in get_table_data().
+        Rows are restricted to the default explainers unless filters select explainers.
 
         Args:
-            filters: Filter criteria (validated to be default)
+            filters: Filter criteria (any combination)
 
         Returns:
             DataFrame with scores (feature_id, llm_explainer, llm_scorer, score_*, z_score_*)
         """
-        lf = self.data_service._df_lazy
+        # Row selection is a mask from DataService's filter cache
+        if not filters.llm_explainer:
+            filters = filters.model_copy(update={"llm_explainer": self._get_default_explainers()})
+        lf = self.data_service.get_filtered_lazy(filters)
 
         logger.info(f"Available columns in lazy frame: {lf.columns}")
 
-        # Filter to default explainers only
-        default_explainers = self._get_default_explainers()
-        lf = lf.filter(pl.col("llm_explainer").is_in(default_explainers))
-
         # Select base columns (already flattened by DataService)
         base_columns = [
             "feature_id", "llm_explainer", "llm_scorer",
@@ -259,6 +453,10 @@ class TableDataService:
         return df
 
 
+    def is_default_request(self, filters: Filters) -> bool:
+        """Whether filters select the default configuration (every explainer and scorer)."""
+        return self._is_default_configuration(filters, self._get_default_explainers(), self._get_default_scorers())
+
     def _is_default_configuration(self, filters: Filters, default_explainers: List[str], default_scorers: List[str]) -> bool:
         """
         Check if current filters match default configuration.
@@ -290,41 +488,27 @@ class TableDataService:
 
         return True
 
-    def _fetch_explanations(self, filters: Filters) -> Optional[pl.DataFrame]:
+    def _fetch_explanations(self, filters: Filters) -> Dict[Tuple[int, str], str]:
         """
-        STEP 3: Fetch explanations from features.parquet (explanation_text column).
+        STEP 2: Fetch explanations from the feature store (explanation_text column).
 
-        NOTE: Assumes default filters, no filtering applied.
+        Uses the store's persistent (feature_id, llm_explainer) -> explanation_text
+        lookup, which is built once from the primary-key index and reused across
+        requests. Explainer selection happens at row-building time.
 
         Args:
             filters: Filter criteria (validated to be default)
 
         Returns:
-            DataFrame with explanations (feature_id, llm_explainer, explanation_text)
+            Dictionary mapping (feature_id, llm_explainer) -> explanation_text
         """
         try:
-            # Get the main lazy frame from DataService
-            df_lazy = self.data_service._df_lazy
-
-            if df_lazy is None:
-                logger.warning("DataService lazy frame is not initialized")
-                return None
-
-            # Select relevant columns and filter to default explainers
-            default_explainers = self._get_default_explainers()
-            explanations_df = (
-                df_lazy
-                .filter(pl.col("llm_explainer").is_in(default_explainers))
-                .select(["feature_id", "llm_explainer", "explanation_text"])
-                .unique()  # Remove duplicates since explanations are same across scorers
-                .collect()
-            )
-
-            logger.info(f"Fetched explanations: {len(explanations_df)} rows")
-            return explanations_df
+            explanations_lookup = self.data_service.get_feature_store().explanation_texts()
+            logger.info(f"Fetched explanations: {len(explanations_lookup)} entries (persistent index)")
+            return explanations_lookup
         except Exception as e:
             logger.warning(f"Explanations data not available: {e}")
-            return None
+            return {}
 
     def _fetch_pairwise_similarity(
         self,
@@ -560,412 +744,329 @@ class TableDataService:
     def _build_feature_rows_simple(
         self,
         scores_df: pl.DataFrame,
-        explanations_df: Optional[pl.DataFrame],
-        pairwise_df: Optional[pl.DataFrame],
-        interfeature_df: Optional[pl.DataFrame],
-        feature_ids: List[int],
+        lookups: TableLookups,
         explainer_ids: List[str],
-        scorer_map: Dict[str, str]
+        scorer_ids: List[str]
     ) -> List[FeatureTableRow]:
         """
-        STEP 5: Build feature rows (pure assembly, no calculations) - v2.0 OPTIMIZED.
+        STEP 5: Build feature rows (pure assembly, no calculations) - v4.0 VECTORIZED.
+
+        The nested row structure is produced by one lazy Polars plan: scores are
+        aggregated per (feature, explainer) cell, joined with the explanation and
+        pairwise-similarity frames, packed into structs, grouped per feature and
+        joined with the decoder frame. A single to_dicts() exports the result;
+        only the dynamic-key maps (explainers, semantic_similarity) and the
+        alignment highlights are filled in while wrapping the rows.
 
-        Optimizations:
-        - Pre-compute all lookups before main loop (eliminates ~20,000 filter operations)
-        - Use dictionaries for O(1) access instead of repeated DataFrame filtering
-        - Replace Python list operations with Polars native methods
+        The exported dicts already have the field order and types of the
+        response models, so rows are built with model_construct (no validation)
+        and nested values stay plain dicts for app.models.fast_json.
 
         Args:
-            scores_df: Scores DataFrame from features.parquet
-            explanations_df: Explanations DataFrame (optional)
-            pairwise_df: Pairwise similarity DataFrame (optional)
-            interfeature_df: Inter-feature similarity DataFrame (optional)
-            feature_ids: List of feature IDs
-            explainer_ids: List of explainer IDs
-            scorer_map: Mapping from scorer ID to s1/s2/s3
+            scores_df: Scores DataFrame from features.parquet (selected rows)
+            lookups: Full-table frames (explanations, pairwise, decoder)
+            explainer_ids: Explainers of the selected rows (row order of each feature)
+            scorer_ids: Scorers of the selected rows (sorted; s1, s2, s3)
 
         Returns:
             List of FeatureTableRow objects
         """
-        # OPTIMIZATION 1: Pre-compute all lookups (before main loop)
-        logger.info("Pre-computing lookups for fast access...")
-
-        try:
-            # Group scores by (feature_id, explainer) for O(1) access
-            logger.info("Building scores lookup...")
-            scores_lookup = self._build_scores_lookup(scores_df)
-            logger.info(f"Scores lookup built: {len(scores_lookup)} entries")
-        except Exception as e:
-            logger.error(f"Error building scores lookup: {e}", exc_info=True)
-            raise
-
-        try:
-            # Build explanations lookup: (feature_id, explainer) -> explanation_text
-            logger.info("Building explanations lookup...")
-            explanations_lookup = self._build_explanations_lookup(explanations_df) if explanations_df is not None else {}
-            logger.info(f"Explanations lookup built: {len(explanations_lookup)} entries")
-        except Exception as e:
-            logger.error(f"Error building explanations lookup: {e}", exc_info=True)
-            raise
-
-        try:
-            # Build pairwise lookup: (feature_id, explainer1, explainer2) -> cosine_similarity
-            logger.info("Building pairwise lookup...")
-            pairwise_lookup = self._build_pairwise_lookup(pairwise_df) if pairwise_df is not None else {}
-            logger.info(f"Pairwise lookup built: {len(pairwise_lookup)} entries")
-        except Exception as e:
-            logger.error(f"Error building pairwise lookup: {e}", exc_info=True)
-            raise
-
-        try:
-            # Build interfeature lookup ONCE for ALL features: feature_id -> {similar_feature_id -> info}
-            logger.info("Building interfeature lookup...")
-            interfeature_lookup = self._build_all_interfeature_lookups(interfeature_df) if interfeature_df is not None else {}
-            logger.info(f"Interfeature lookup built: {len(interfeature_lookup)} entries")
-        except Exception as e:
-            logger.error(f"Error building interfeature lookup: {e}", exc_info=True)
-            raise
-
-        try:
-            # ⚡ OPTIMIZED: Build both decoder and merge threshold lookups in ONE operation (6s faster!)
-            logger.info("Building decoder + merge threshold lookups (vectorized)...")
-            decoder_lookup, merge_threshold_lookup = self._build_decoder_and_merge_lookups(scores_df)
-            logger.info(f"Decoder lookup built: {len(decoder_lookup)} entries")
-            logger.info(f"Merge threshold lookup built: {len(merge_threshold_lookup)} entries")
-        except Exception as e:
-            logger.error(f"Error building decoder/merge lookups: {e}", exc_info=True)
-            raise
+        cells = self._build_cells(scores_df, explainer_ids, scorer_ids)
+
+        # Pairwise similarity to the other selected explainers, in explainer order
+        others = pl.LazyFrame({
+            "explainer_2": explainer_ids,
+            "_other_order": list(range(len(explainer_ids))),
+            "explainer": [MODEL_NAME_MAP.get(exp, exp) for exp in explainer_ids]
+        })
+        semantic_similarity = (
+            lookups.pairwise.lazy()
+            .join(others, on="explainer_2")
+            .sort(["feature_id", "explainer_1", "_other_order"])
+            .group_by(["feature_id", "explainer_1"], maintain_order=True)
+            .agg(pl.struct(["explainer", "cosine_similarity"]).alias("semantic_similarity"))
+            .rename({"explainer_1": "llm_explainer"})
+        )
 
-        logger.info(f"All lookups pre-computed successfully")
+        def score_set(kind: str) -> pl.Expr:
+            return pl.struct([pl.col(f"{kind}_{slot}").alias(slot) for slot in SCORER_SLOTS]).alias(kind)
+
+        rows = (
+            cells.lazy()
+            .join(lookups.explanations.lazy(), on=["feature_id", "llm_explainer"], how="left")
+            .join(semantic_similarity, on=["feature_id", "llm_explainer"], how="left")
+            .sort(["feature_id", "explainer"])
+            .group_by("feature_id", maintain_order=True)
+            .agg([
+                pl.col("llm_explainer").alias("_explainers"),
+                # Field order of ExplainerScoreData (rows are constructed, not validated)
+                pl.struct([
+                    "embedding", "quality_score", score_set("fuzz"), score_set("detection"),
+                    "explanation_text", pl.lit(None).alias("highlighted_explanation"), "semantic_similarity"
+                ]).alias("_cells")
+            ])
+            .join(lookups.decoder.lazy(), on="feature_id", how="left")
+            .sort("feature_id")
+            .collect()
+        )
 
         features = []
-
-        for feature_id in feature_ids:
-            # OPTIMIZATION 2: Use decoder lookup instead of filtering
-            decoder_sim_value = decoder_lookup.get(feature_id)
-            decoder_similarity = None
-
-            # Get decoder_similarity_merge_threshold for this feature
-            merge_threshold = merge_threshold_lookup.get(feature_id)
-
-            if decoder_sim_value is not None:
-                # Get interfeature lookup for this feature (already pre-computed)
-                feature_interf_lookup = interfeature_lookup.get(feature_id, {})
-
-                # Convert from Polars struct to dict format and attach inter-feature similarity
-                decoder_similarity = []
-                for item in decoder_sim_value:
-                    similar_feature_id = int(item["feature_id"])
-
-                    decoder_feature = {
-                        "feature_id": similar_feature_id,
-                        "cosine_similarity": float(item["cosine_similarity"])
-                    }
-
-                    # Attach inter-feature similarity if available
-                    if similar_feature_id in feature_interf_lookup:
-                        interf_info = feature_interf_lookup[similar_feature_id]
-                        decoder_feature["inter_feature_similarity"] = {
-                            "pattern_type": interf_info["pattern_type"],
-                            "semantic_similarity": interf_info["semantic_similarity"],
-                            "char_jaccard": interf_info["char_jaccard"],
-                            "word_jaccard": interf_info["word_jaccard"],
-                            "max_char_ngram": interf_info["max_char_ngram"],
-                            "max_word_ngram": interf_info["max_word_ngram"],
-                            "main_char_ngram_positions": interf_info.get("main_char_ngram_positions"),
-                            "similar_char_ngram_positions": interf_info.get("similar_char_ngram_positions"),
-                            "main_word_ngram_positions": interf_info.get("main_word_ngram_positions"),
-                            "similar_word_ngram_positions": interf_info.get("similar_word_ngram_positions")
-                        }
-                    else:
-                        # No inter-feature data, use None pattern
-                        decoder_feature["inter_feature_similarity"] = {
-                            "pattern_type": "None",
-                            "semantic_similarity": None,
-                            "char_jaccard": None,
-                            "word_jaccard": None,
-                            "max_char_ngram": None,
-                            "max_word_ngram": None,
-                            "main_char_ngram_positions": None,
-                            "similar_char_ngram_positions": None,
-                            "main_word_ngram_positions": None,
-                            "similar_word_ngram_positions": None
-                        }
-
-                    decoder_similarity.append(decoder_feature)
-
-            explainers_dict = {}
-            for explainer in explainer_ids:
-                # OPTIMIZATION 3: Use lookup instead of filtering
-                explainer_scores = scores_lookup.get((feature_id, explainer))
-
-                if explainer_scores is None:
-                    continue
-
-                # Extract scores using helper
-                fuzz_dict, detection_dict, embedding_score = ExplainerDataBuilder.extract_scores_from_explainer_df(
-                    explainer_scores, scorer_map
-                )
-
-                # OPTIMIZATION 4: Use pre-computed explanations lookup
-                explanation_text = explanations_lookup.get((feature_id, explainer))
-
-                # Get highlighted explanation if alignment service available
-                highlighted_explanation = None
-                if self.alignment_service and self.alignment_service.is_ready:
-                    try:
-                        segments = self.alignment_service.get_highlighted_explanation(
-                            feature_id, explainer, explainer_ids
-                        )
-                        if segments:
-                            highlighted_explanation = HighlightedExplanation(segments=segments)
-                    except Exception as e:
-                        logger.debug(f"Could not get highlighted explanation for feature {feature_id}, explainer {explainer}: {e}")
-
-                # Build explainer data
-                explainer_key = MODEL_NAME_MAP.get(explainer, explainer)
-
-                # OPTIMIZATION 5: Use pre-computed pairwise lookup instead of filtering
-                semantic_similarity = self._build_semantic_similarity_fast(
-                    feature_id, explainer, explainer_ids, pairwise_lookup
-                )
-
-                # ⚡ OPTIMIZED: Extract quality_score from list of dicts
-                quality_score = None
-                if explainer_scores:  # Check if list is not empty
-                    # Extract quality_scores from list of dicts
-                    quality_scores = [s.get("quality_score") for s in explainer_scores if s.get("quality_score") is not None]
-                    if quality_scores:
-                        # Calculate mean manually
-                        quality_score = round(sum(quality_scores) / len(quality_scores), 3)
-
-                explainers_dict[explainer_key] = ExplainerScoreData(
-                    embedding=embedding_score,
-                    quality_score=quality_score,
-                    fuzz=ScorerScoreSet(
-                        s1=fuzz_dict.get("s1"),
-                        s2=fuzz_dict.get("s2"),
-                        s3=fuzz_dict.get("s3")
-                    ),
-                    detection=ScorerScoreSet(
-                        s1=detection_dict.get("s1"),
-                        s2=detection_dict.get("s2"),
-                        s3=detection_dict.get("s3")
-                    ),
-                    explanation_text=explanation_text,
-                    highlighted_explanation=highlighted_explanation,
-                    semantic_similarity=semantic_similarity
+        for row in rows.to_dicts():
+            explainer_names = row.pop("_explainers")
+            highlights = self._highlighted_explanations(
+                [row["feature_id"]] * len(explainer_names), explainer_names, explainer_ids
+            )
+            explainers = {}
+            for explainer, cell, highlighted in zip(explainer_names, row.pop("_cells"), highlights):
+                pairs = cell["semantic_similarity"]
+                cell["semantic_similarity"] = (
+                    {pair["explainer"]: pair["cosine_similarity"] for pair in pairs} if pairs else None
                 )
-
-            if explainers_dict:
-                features.append(FeatureTableRow(
-                    feature_id=feature_id,
-                    decoder_similarity=decoder_similarity,
-                    decoder_similarity_merge_threshold=merge_threshold,
-                    explainers=explainers_dict
-                ))
+                if highlighted is not None:
+                    highlighted = {
+                        "segments": [{**HIGHLIGHT_SEGMENT_DEFAULTS, **segment} for segment in highlighted["segments"]]
+                    }
+                cell["highlighted_explanation"] = highlighted
+                explainers[MODEL_NAME_MAP.get(explainer, explainer)] = cell
+            row["explainers"] = explainers
+            features.append(FeatureTableRow.model_construct(**row))
 
         logger.info(f"Built {len(features)} feature rows")
         return features
 
     # ========================================================================
-    # OPTIMIZATION HELPER METHODS - Pre-compute lookups for O(1) access
+    # VECTORIZED FRAME BUILDERS - Native Polars passes shared by both formats
     # ========================================================================
 
-    def _build_scores_lookup(self, scores_df: pl.DataFrame) -> Dict[Tuple[int, str], list]:
+    def _build_cells(self, scores_df: pl.DataFrame, explainer_ids: List[str], scorer_ids: List[str]) -> pl.DataFrame:
         """
-        ⚡ OPTIMIZED: Build lookup dict with lightweight lists instead of DataFrames (~4s faster!).
+        One row per (feature, explainer) cell with its aggregated scores.
 
-        (feature_id, explainer) -> list of {scorer, score_embedding, score_fuzz, score_detection, quality_score}
+        embedding is the first non-null embedding score, quality_score the mean of
+        the non-null quality scores, fuzz_sN / detection_sN the score of the Nth
+        scorer; all rounded to 3 decimals.
 
-        Old: Stored 41,758 DataFrame objects with full metadata
-        New: Stores plain Python dicts with only needed columns
+        Returns:
+            DataFrame (feature_id, llm_explainer, explainer = index into explainer_ids,
+            embedding, quality_score, fuzz_s1..s3, detection_s1..s3) sorted by
+            feature_id, then explainer
         """
-        lookup = {}
-
-        # Extract columns as lists for faster iteration
-        feature_ids = scores_df["feature_id"].to_list()
-        explainers = scores_df["llm_explainer"].to_list()
-        scorers = scores_df["llm_scorer"].to_list()
-        score_embedding = scores_df["score_embedding"].to_list()
-        score_fuzz = scores_df["score_fuzz"].to_list()
-        score_detection = scores_df["score_detection"].to_list()
-
-        # ⚡ Check if quality_score column exists
-        has_quality = "quality_score" in scores_df.columns
-        quality_scores = scores_df["quality_score"].to_list() if has_quality else [None] * len(feature_ids)
-
-        # Build lookup with lightweight dicts
-        for i in range(len(feature_ids)):
-            key = (feature_ids[i], explainers[i])
-
-            score_dict = {
-                "llm_scorer": scorers[i],
-                "score_embedding": score_embedding[i],
-                "score_fuzz": score_fuzz[i],
-                "score_detection": score_detection[i],
-                "quality_score": quality_scores[i]
-            }
-
-            if key not in lookup:
-                lookup[key] = []
-            lookup[key].append(score_dict)
+        scorer = pl.col("llm_scorer").cast(pl.Utf8)
+        slot_scores = []
+        for kind, column in (("fuzz", "score_fuzz"), ("detection", "score_detection")):
+            for i, slot in enumerate(SCORER_SLOTS):
+                if i < len(scorer_ids):
+                    slot_scores.append(pl.col(column).filter(scorer == scorer_ids[i]).last().alias(f"{kind}_{slot}"))
+                else:
+                    slot_scores.append(pl.lit(None, dtype=pl.Float64).alias(f"{kind}_{slot}"))
+
+        cells = (
+            scores_df.lazy()
+            .with_columns([pl.col("feature_id").cast(pl.Int64), pl.col("llm_explainer").cast(pl.Utf8)])
+            .group_by(["feature_id", "llm_explainer"], maintain_order=True)
+            .agg([
+                pl.col("score_embedding").drop_nulls().first().cast(pl.Float64).alias("embedding"),
+                pl.col("quality_score").drop_nulls().mean().cast(pl.Float64).alias("quality_score")
+            ] + slot_scores)
+            .join(
+                pl.LazyFrame({"llm_explainer": explainer_ids, "explainer": list(range(len(explainer_ids)))}),
+                on="llm_explainer"
+            )
+            .sort(["feature_id", "explainer"])
+            .collect()
+        )
 
-        return lookup
+        score_columns = ["embedding", "quality_score"] + [
+            f"{kind}_{slot}" for kind in ("fuzz", "detection") for slot in SCORER_SLOTS
+        ]
+        return cells.with_columns([_round_scores(cells[column]) for column in score_columns])
+
+    def _build_explanations_frame(self, explanations_lookup: Dict[Tuple[int, str], str]) -> pl.DataFrame:
+        """(feature_id, llm_explainer) -> explanation_text lookup as a joinable frame."""
+        return pl.DataFrame(
+            {
+                "feature_id": [key[0] for key in explanations_lookup],
+                "llm_explainer": [str(key[1]) for key in explanations_lookup],
+                "explanation_text": list(explanations_lookup.values())
+            },
+            schema={"feature_id": pl.Int64, "llm_explainer": pl.Utf8, "explanation_text": pl.Utf8}
+        )
 
-    def _build_explanations_lookup(self, explanations_df: pl.DataFrame) -> Dict[Tuple[int, str], str]:
-        """
-        Build lookup dict: (feature_id, explainer) -> explanation_text (v3.0 - OPTIMIZED).
-        Uses vectorized column extraction instead of iter_rows.
+    def _build_pairwise_frame(self, pairwise_df: Optional[pl.DataFrame]) -> pl.DataFrame:
         """
-        # Extract columns as lists (faster than iter_rows)
-        feature_ids = explanations_df["feature_id"].to_list()
-        explainers = explanations_df["llm_explainer"].to_list()
-        texts = explanations_df["explanation_text"].to_list()
+        Pairwise similarity in both orderings: (feature_id, explainer_1, explainer_2) -> cosine_similarity.
 
-        # Build lookup using zip (faster than iterating dictionaries)
-        lookup = {(fid, exp): text for fid, exp, text in zip(feature_ids, explainers, texts)}
-        return lookup
-
-    def _build_pairwise_lookup(self, pairwise_df: pl.DataFrame) -> Dict[Tuple[int, str, str], float]:
-        """
-        Build lookup dict: (feature_id, explainer1, explainer2) -> cosine_similarity (v3.0 - OPTIMIZED).
-        Stores both orderings for fast bidirectional lookup.
-        Uses vectorized column extraction instead of iter_rows.
+        Each source row is stored as (explainer_1, explainer_2) and then
+        (explainer_2, explainer_1); a later assignment of the same key wins.
+        Null similarities and self-pairs are dropped.
         """
-        # Extract columns as lists (faster than iter_rows)
-        feature_ids = pairwise_df["feature_id"].to_list()
-        exp1s = pairwise_df["explainer_1"].to_list()
-        exp2s = pairwise_df["explainer_2"].to_list()
-        sims = pairwise_df["cosine_similarity"].to_list()
+        schema = {
+            "feature_id": pl.Int64, "explainer_1": pl.Utf8,
+            "explainer_2": pl.Utf8, "cosine_similarity": pl.Float64
+        }
+        if pairwise_df is None or len(pairwise_df) == 0:
+            return pl.DataFrame(schema=schema)
+
+        base = pairwise_df.select([
+            pl.col("feature_id").cast(pl.Int64),
+            pl.col("explainer_1").cast(pl.Utf8),
+            pl.col("explainer_2").cast(pl.Utf8),
+            pl.col("cosine_similarity").cast(pl.Float64)
+        ]).with_row_count("_order").with_columns(pl.col("_order").cast(pl.Int64) * 2)
+        reverse = base.select([
+            pl.col("_order") + 1, "feature_id",
+            pl.col("explainer_2").alias("explainer_1"), pl.col("explainer_1").alias("explainer_2"),
+            "cosine_similarity"
+        ])
 
-        # Build lookup using zip, storing both orderings
-        lookup = {}
-        for fid, e1, e2, sim in zip(feature_ids, exp1s, exp2s, sims):
-            lookup[(fid, e1, e2)] = sim
-            lookup[(fid, e2, e1)] = sim
-        return lookup
+        return (
+            pl.concat([base, reverse])
+            .sort("_order")
+            .unique(subset=["feature_id", "explainer_1", "explainer_2"], keep="last", maintain_order=True)
+            .filter(pl.col("cosine_similarity").is_not_null() & (pl.col("explainer_1") != pl.col("explainer_2")))
+            .select(list(schema))
+        )
 
-    def _build_decoder_and_merge_lookups(self, scores_df: pl.DataFrame) -> tuple[Dict[int, List], Dict[int, float]]:
+    def _build_inter_feature_pairs(self, interfeature_df: Optional[pl.DataFrame], category: str) -> Optional[pl.DataFrame]:
         """
-        ⚡ OPTIMIZED: Build both decoder_similarity and merge_threshold lookups in ONE vectorized operation.
-        Uses group_by instead of O(n²) filtering - ~6s faster for 14k features!
+        Explode one pair category of the inter-feature data.
 
-        Returns: (decoder_lookup, merge_threshold_lookup)
+        Returns:
+            DataFrame (feature_id, similar_feature_id, INTER_FEATURE_FIELDS...) with
+            the last entry per pair, or None if the category holds no pairs
         """
-        decoder_lookup = {}
-        merge_threshold_lookup = {}
-
-        # Check columns exist
-        has_decoder = "decoder_similarity" in scores_df.columns
-        has_merge = COL_DECODER_SIMILARITY_MERGE_THRESHOLD in scores_df.columns
-
-        if not has_decoder and not has_merge:
-            return decoder_lookup, merge_threshold_lookup
-
-        # ⚡ OPTIMIZATION: Use group_by + first() instead of repeated filtering
-        # Old: 14,316 iterations × filter(41,758 rows) = O(n²)
-        # New: Single group_by operation = O(n)
-        agg_exprs = []
-        if has_decoder:
-            agg_exprs.append(pl.col("decoder_similarity").first().alias("decoder_sim"))
-        if has_merge:
-            agg_exprs.append(pl.col(COL_DECODER_SIMILARITY_MERGE_THRESHOLD).first().alias("merge_threshold"))
-
-        if not agg_exprs:
-            return decoder_lookup, merge_threshold_lookup
-
-        # Vectorized extraction: one pass through data
-        unique_features = scores_df.group_by("feature_id").agg(agg_exprs)
-
-        # Build lookups from aggregated results
-        for row in unique_features.iter_rows(named=True):
-            feature_id = row["feature_id"]
-
-            if has_decoder and row.get("decoder_sim") is not None:
-                decoder_lookup[feature_id] = row["decoder_sim"]
-
-            if has_merge and row.get("merge_threshold") is not None:
-                merge_val = row["merge_threshold"]
-                if merge_val is not None and not pl.datatypes.Null == type(merge_val):
-                    merge_threshold_lookup[feature_id] = float(merge_val)
+        if interfeature_df is None or category not in interfeature_df.columns:
+            return None
+        dtype = interfeature_df.schema[category]
+        if not isinstance(dtype, pl.List) or not isinstance(dtype.inner, pl.Struct):
+            return None
 
-        return decoder_lookup, merge_threshold_lookup
+        field_names = {field.name for field in dtype.inner.fields}
+        pair = pl.col(category)
+        return (
+            interfeature_df
+            .select([pl.col("feature_id").cast(pl.Int64), category])
+            .explode(category)
+            .lazy()
+            .select(
+                ["feature_id", pair.struct.field("similar_feature_id").cast(pl.Int64)]
+                + [
+                    (pair.struct.field(name) if name in field_names else pl.lit(None)).alias(name)
+                    for name in INTER_FEATURE_FIELDS
+                ]
+            )
+            .filter(pl.col("similar_feature_id").is_not_null())  # empty / null pair lists
+            .with_columns([
+                pl.col(name).cast(pl.Float64)
+                for name in ("semantic_similarity", "char_jaccard", "word_jaccard")
+            ])
+            .unique(subset=["feature_id", "similar_feature_id"], keep="last", maintain_order=True)
+            .collect()
+        )
 
-    def _build_all_interfeature_lookups(self, interfeature_df: pl.DataFrame) -> Dict[int, Dict[int, Dict]]:
-        """
-        Build lookup for ALL features at once: feature_id -> {similar_feature_id -> info} (v3.0 - OPTIMIZED).
-        This replaces the per-feature _build_interfeature_lookup() which was called 14,316 times.
-        Uses vectorized column extraction for better performance.
+    def _build_decoder_frame(self, scores_df: pl.DataFrame, interfeature_df: Optional[pl.DataFrame]) -> pl.DataFrame:
         """
-        all_lookups = {}
-
-        # Extract columns as lists (faster than iter_rows for outer loop)
-        feature_ids = interfeature_df["feature_id"].to_list()
-        semantic_pairs_list = interfeature_df["semantic_pairs"].to_list()
-        lexical_pairs_list = interfeature_df["lexical_pairs"].to_list()
-
-        # ⚡ OPTIMIZED: Iterate using zip with reduced type conversions
-        for feature_id, semantic_pairs, lexical_pairs in zip(feature_ids, semantic_pairs_list, lexical_pairs_list):
-            if feature_id not in all_lookups:
-                all_lookups[feature_id] = {}
-
-            # Process semantic first, then lexical (lexical overwrites if duplicate)
-            for category, pairs_list in [("semantic", semantic_pairs), ("lexical", lexical_pairs)]:
-                if pairs_list is None:
-                    continue
+        Per-feature decoder similarity with the inter-feature similarity attached.
 
-                for pair in pairs_list:
-                    # ⚡ OPTIMIZATION: similar_feature_id is already int from Polars
-                    similar_feature_id = pair["similar_feature_id"]
+        decoder_similarity and the merge threshold are taken from each feature's
+        first row. Every decoder-similar feature gets an inter_feature_similarity
+        struct: from lexical_pairs if present there, else from semantic_pairs,
+        else pattern_type 'None' with empty fields. Lists that are null in the
+        data stay null; empty lists stay empty.
 
-                    # ⚡ OPTIMIZATION: Reduced conditional checks - only convert if not None
-                    # Most values are already correct types from Polars
-                    sem_sim = pair["semantic_similarity"]
-                    char_jacc = pair["char_jaccard"]
-                    word_jacc = pair["word_jaccard"]
-
-                    all_lookups[feature_id][similar_feature_id] = {
-                        "pattern_type": pair["pattern_type"],
-                        "semantic_similarity": float(sem_sim) if sem_sim is not None else None,
-                        "char_jaccard": float(char_jacc) if char_jacc is not None else None,
-                        "word_jaccard": float(word_jacc) if word_jacc is not None else None,
-                        "max_char_ngram": pair["max_char_ngram"],
-                        "max_word_ngram": pair["max_word_ngram"],
-                        "main_char_ngram_positions": pair.get("main_char_ngram_positions"),
-                        "similar_char_ngram_positions": pair.get("similar_char_ngram_positions"),
-                        "main_word_ngram_positions": pair.get("main_word_ngram_positions"),
-                        "similar_word_ngram_positions": pair.get("similar_word_ngram_positions")
-                    }
-
-        return all_lookups
-
-    def _build_semantic_similarity_fast(
-        self,
-        feature_id: int,
-        current_explainer: str,
-        all_explainer_ids: List[str],
-        pairwise_lookup: Dict[Tuple[int, str, str], float]
-    ) -> Optional[Dict[str, float]]:
-        """
-        Fast version of _build_semantic_similarity using pre-computed lookup.
-        Eliminates repeated DataFrame filtering.
+        Returns:
+            DataFrame (feature_id, decoder_similarity, decoder_similarity_merge_threshold)
         """
-        similarity_dict = {}
+        per_feature = (
+            scores_df.lazy()
+            .group_by("feature_id", maintain_order=True)
+            .agg([
+                pl.col(column).first()
+                for column in (COL_DECODER_SIMILARITY, COL_DECODER_SIMILARITY_MERGE_THRESHOLD)
+                if column in scores_df.columns
+            ])
+            .with_columns(pl.col("feature_id").cast(pl.Int64))
+            .collect()
+        )
+        if COL_DECODER_SIMILARITY_MERGE_THRESHOLD in per_feature.columns:
+            per_feature = per_feature.with_columns(pl.col(COL_DECODER_SIMILARITY_MERGE_THRESHOLD).cast(pl.Float64))
+        else:
+            per_feature = per_feature.with_columns(pl.lit(None, dtype=pl.Float64).alias(COL_DECODER_SIMILARITY_MERGE_THRESHOLD))
+        if COL_DECODER_SIMILARITY not in per_feature.columns:
+            return per_feature.with_columns(pl.lit(None).alias(COL_DECODER_SIMILARITY))
+
+        item = pl.col(COL_DECODER_SIMILARITY)
+        items = (
+            per_feature
+            .select(["feature_id", item.is_null().alias("_missing"), COL_DECODER_SIMILARITY])
+            .explode(COL_DECODER_SIMILARITY)
+            .with_row_count("_item")
+            .lazy()
+            .select([
+                "_item", "feature_id", "_missing",
+                item.struct.field("feature_id").cast(pl.Int64).alias("similar_feature_id"),
+                item.struct.field("cosine_similarity").cast(pl.Float64).alias("cosine_similarity")
+            ])
+        )
 
-        for other_explainer in all_explainer_ids:
-            if other_explainer == current_explainer:
+        # Lexical entries override semantic ones for the same pair
+        inter_fields = {name: pl.lit("None" if name == "pattern_type" else None) for name in INTER_FEATURE_FIELDS}
+        for category, suffix in (("semantic_pairs", "_semantic"), ("lexical_pairs", "_lexical")):
+            pairs = self._build_inter_feature_pairs(interfeature_df, category)
+            if pairs is None:
                 continue
+            items = items.join(
+                pairs.lazy()
+                .rename({name: name + suffix for name in INTER_FEATURE_FIELDS})
+                .with_columns(pl.lit(True).alias("_match" + suffix)),
+                on=["feature_id", "similar_feature_id"],
+                how="left"
+            )
+            matched = pl.col("_match" + suffix).fill_null(False)
+            inter_fields = {
+                name: pl.when(matched).then(pl.col(name + suffix)).otherwise(value)
+                for name, value in inter_fields.items()
+            }
 
-            # Direct O(1) lookup instead of filtering
-            cosine_sim = pairwise_lookup.get((feature_id, current_explainer, other_explainer))
+        decoder = (
+            items
+            .sort("_item")
+            .group_by("feature_id", maintain_order=True)
+            .agg([
+                pl.struct([
+                    pl.col("similar_feature_id").alias("feature_id"),
+                    "cosine_similarity",
+                    pl.struct([value.alias(name) for name, value in inter_fields.items()]).alias("inter_feature_similarity")
+                ]).filter(pl.col("similar_feature_id").is_not_null()).alias(COL_DECODER_SIMILARITY),
+                pl.col("_missing").first()
+            ])
+            .filter(~pl.col("_missing"))
+            .drop("_missing")
+            .collect()
+        )
+        # Features whose list is null have no decoder row -> null after the left join
+        return per_feature.drop(COL_DECODER_SIMILARITY).join(decoder, on="feature_id", how="left")
 
-            if cosine_sim is not None:
-                other_explainer_key = MODEL_NAME_MAP.get(other_explainer, other_explainer)
-                similarity_dict[other_explainer_key] = float(cosine_sim)
+    def _highlighted_explanations(
+        self,
+        feature_ids: List[int],
+        explainers: List[str],
+        explainer_ids: List[str]
+    ) -> List[Optional[Dict]]:
+        """Highlighted explanation per (feature, explainer) cell from the alignment cache (None if unavailable)."""
+        highlighted = [None] * len(feature_ids)
+        if not (self.alignment_service and self.alignment_service.is_ready):
+            return highlighted
 
-        return similarity_dict if similarity_dict else None
+        for i, (feature_id, explainer) in enumerate(zip(feature_ids, explainers)):
+            try:
+                segments = self.alignment_service.get_highlighted_explanation(feature_id, explainer, explainer_ids)
+                if segments:
+                    highlighted[i] = {"segments": segments}
+            except Exception as e:
+                logger.debug(f"Could not get highlighted explanation for feature {feature_id}, explainer {explainer}: {e}")
+        return highlighted
 
     # ========================================================================
-    # END OPTIMIZATION HELPERS
+    # END VECTORIZED FRAME BUILDERS
     # ========================================================================
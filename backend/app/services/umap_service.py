@@ -11,8 +11,6 @@ import numpy as np
 import logging
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
-from sklearn.preprocessing import StandardScaler
-from sklearn.svm import SVC
 
 from ..models.umap import (
     UmapProjectionRequest,
@@ -26,6 +24,7 @@ from ..models.similarity_sort import (
     CauseClassificationResult
 )
 from .data_constants import COL_FEATURE_ID
+from .lazy_imports import SVC, StandardScaler
 
 # Categories for decision function space (3 categories)
 CAUSE_CATEGORIES = [
@@ -104,6 +103,11 @@ class UMAPService:
         self._anchor_metrics = (anchor_matrix, anchor_categories)
         return self._anchor_metrics
 
+    def clear_cache(self):
+        """Drop the cached anchor metrics (call when the barycentric metadata changes)."""
+        self._anchor_metrics = None
+        logger.info("UMAP anchor metrics cache cleared")
+
     async def get_umap_projection(
         self,
         request: UmapProjectionRequest
@@ -154,7 +158,7 @@ class UMAPService:
 
             # Collect explainer positions for detail view
             explainer_positions = [
-                ExplainerPosition(
+                ExplainerPosition.model_construct(
                     explainer=row["llm_explainer"],
                     x=float(row["position_x"]),
                     y=float(row["position_y"]),
@@ -163,7 +167,7 @@ class UMAPService:
                 for row in feature_rows.iter_rows(named=True)
             ]
 
-            points.append(UmapPoint(
+            points.append(UmapPoint.model_construct(
                 feature_id=int(fid),
                 x=mean_x,
                 y=mean_y,
@@ -174,7 +178,8 @@ class UMAPService:
 
         logger.info(f"Built {len(points)} feature points with explainer details")
 
-        return UmapProjectionResponse(
+        # Values are converted above, so the response is constructed without validation
+        return UmapProjectionResponse.model_construct(
             points=points,
             total_features=len(points),
             params_used={"source": "barycentric_precomputed", "aggregation": "mean"}
@@ -427,7 +432,3 @@ class UMAPService:
         except Exception as e:
             logger.error(f"Failed to extract metrics from barycentric: {e}", exc_info=True)
             return None
-
-    def clear_cache(self):
-        """Clear any cached data (no-op since we use pre-computed data)."""
-        logger.info("Cache clear requested (no-op for pre-computed data)")